@@ -0,0 +1,354 @@
+"""
+Local stand-in for the Binance endpoints the API proxies, for offline load
+testing: REST klines / trades / 24h ticker, data.binance.vision archive zips
+and the @kline_ / @trade WebSocket streams, all built from deterministic
+synthetic data. Point the API at it through Settings:
+
+    python -m benchmarks.fake_binance --port 9100 --trade-rate 50
+    BINANCE_API_URL=http://127.0.0.1:9100 BINANCE_WS_URL=ws://127.0.0.1:9100 \\
+    BINANCE_MARKET_URL=http://127.0.0.1:9100 uvicorn quant_api.apps.v1:app
+"""
+
+import argparse
+import asyncio
+import datetime
+import functools
+import json
+import re
+import time
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
+from websockets.exceptions import ConnectionClosed
+
+from quant_api.utils.synthetic import (
+    archive_zip,
+    symbol_rng,
+    synthetic_klines,
+    synthetic_trades,
+)
+
+INTERVAL_UNITS_MS = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+    "M": 2_592_000_000,
+    "mo": 2_592_000_000,
+}
+DAY_MS = 86_400_000
+
+# listed symbols served by the 24h ticker, padded with X<i>USDT up to `listed`
+LISTED = [
+    *(f"{base}USDT" for base in (
+        "BTC", "ETH", "BNB", "SOL", "XRP", "DOGE", "ADA", "TRX", "AVAX", "LINK",
+        "DOT", "LTC", "BCH", "UNI", "ATOM", "XLM", "ETC", "FIL", "APT", "ARB",
+    )),
+    "ETHBTC", "BNBBTC", "SOLBTC", "BTCFDUSD",
+]
+
+ARCHIVE_NAME = re.compile(r"^(?P<symbol>[A-Z0-9]+)-(?P<kind>\w+)-(?P<date>\d{4}-\d{2}-\d{2})\.zip$")
+
+
+def interval_ms(interval: str) -> int:
+    match = re.fullmatch(r"(\d+)(s|m|h|d|w|M|mo)", interval)
+    if match is None:
+        raise HTTPException(status_code=400, detail=f"Invalid interval: {interval}")
+    return int(match.group(1)) * INTERVAL_UNITS_MS[match.group(2)]
+
+
+def _decimal(x: float) -> str:
+    return f"{x:.8f}"
+
+
+def kline_rows(klines) -> list:
+    """Archive-layout frame -> /api/v3/klines rows."""
+    return [
+        [
+            int(row.open),
+            _decimal(row.openPrice),
+            _decimal(row.high),
+            _decimal(row.low),
+            _decimal(row.last),
+            _decimal(row.volume),
+            int(row.close),
+            _decimal(row.quoteVolume),
+            int(row.count),
+            _decimal(row.takerBaseVolume),
+            _decimal(row.takerQuoteVolume),
+            "0",
+        ]
+        for row in klines.itertuples(index=False)
+    ]
+
+
+def trade_rows(trades) -> list:
+    """Archive-layout frame -> /api/v3/trades objects."""
+    return [
+        {
+            "id": int(row.id),
+            "price": _decimal(row.price),
+            "qty": _decimal(row.quantity),
+            "quoteQty": _decimal(row.quoteQty),
+            "time": int(row.time),
+            "isBuyerMaker": bool(row.isBuyerMaker),
+            "isBestMatch": True,
+        }
+        for row in trades.itertuples(index=False)
+    ]
+
+
+def ticker_rows(symbols: list, seed: int, now: int) -> list:
+    """/api/v3/ticker/24hr MINI objects, USD volumes spread from 1e4 to 1e9."""
+    rows = []
+    for symbol in symbols:
+        rng = symbol_rng(symbol, seed, "ticker")
+        last = float(np.exp(rng.uniform(np.log(0.1), np.log(50_000))))
+        open_ = last * float(np.exp(rng.normal(0, 0.03)))
+        volume = float(np.exp(rng.uniform(np.log(1e4), np.log(1e9)))) / last
+        rows.append(
+            {
+                "symbol": symbol,
+                "openPrice": _decimal(open_),
+                "highPrice": _decimal(max(open_, last) * 1.01),
+                "lowPrice": _decimal(min(open_, last) * 0.99),
+                "lastPrice": _decimal(last),
+                "volume": _decimal(volume),
+                "quoteVolume": _decimal(volume * last),
+                "openTime": now - DAY_MS,
+                "closeTime": now,
+                "firstId": 0,
+                "lastId": int(rng.integers(1_000, 1_000_000)),
+                "count": int(rng.integers(1_000, 1_000_000)),
+            }
+        )
+    return rows
+
+
+def create_app(
+    kline_rate: float = 1.0,
+    trade_rate: float = 10.0,
+    latency: float = 0.0,
+    archive_trades: int = 100_000,
+    seed: int = 0,
+    listed: int = len(LISTED),
+) -> FastAPI:
+    """
+    kline_rate / trade_rate: WebSocket messages per second per connection.
+    latency: seconds added to every REST and archive response.
+    archive_trades: trades in one daily trades archive.
+    listed: symbols in the unfiltered 24h ticker.
+    """
+    app = FastAPI()
+
+    # responses are cached so the fake stays cheap next to the proxy under test
+    @functools.lru_cache(maxsize=1024)
+    def klines_body(symbol: str, step: int, start: int, limit: int) -> bytes:
+        klines = synthetic_klines(symbol, limit, seed, step, start)
+        return json.dumps(kline_rows(klines)).encode()
+
+    @functools.lru_cache(maxsize=1024)
+    def trades_body(symbol: str, end: int, limit: int) -> bytes:
+        trades = synthetic_trades(symbol, limit, seed, end - 60_000, end)
+        return json.dumps(trade_rows(trades)).encode()
+
+    @functools.lru_cache(maxsize=64)
+    def archive_body(file_name: str) -> bytes:
+        match = ARCHIVE_NAME.match(file_name)
+        if match is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        symbol, kind = match.group("symbol"), match.group("kind")
+        day = datetime.datetime.strptime(match.group("date"), "%Y-%m-%d")
+        start = int(day.replace(tzinfo=datetime.timezone.utc).timestamp() * 1000)
+        if kind == "trades":
+            frame = synthetic_trades(symbol, archive_trades, seed, start, start + DAY_MS)
+        else:
+            step = interval_ms(kind)
+            frame = synthetic_klines(symbol, max(DAY_MS // step, 1), seed, step, start)
+        return archive_zip(frame, file_name.replace(".zip", ".csv"))
+
+    @app.get("/api/v3/ping")
+    async def ping():
+        return {}
+
+    @app.get("/api/v3/klines")
+    async def klines(
+        symbol: str,
+        interval: str,
+        startTime: int = None,
+        endTime: int = None,
+        timeZone: str = "0",
+        limit: int = 500,
+    ):
+        step = interval_ms(interval)
+        limit = min(max(limit, 1), 1000)
+        if startTime is not None:
+            start = startTime - startTime % step
+        else:
+            end = endTime if endTime is not None else int(time.time() * 1000)
+            start = end - end % step - (limit - 1) * step
+        if latency:
+            await asyncio.sleep(latency)
+        body = klines_body(symbol.upper(), step, start, limit)
+        return Response(body, media_type="application/json")
+
+    listed_symbols = LISTED[:listed] + [
+        f"X{i:04d}USDT" for i in range(max(listed - len(LISTED), 0))
+    ]
+
+    @app.get("/api/v3/ticker/24hr")
+    async def ticker_24hr(symbol: str = None, symbols: str = None, type: str = "FULL"):
+        now = int(time.time() * 1000)
+        if latency:
+            await asyncio.sleep(latency)
+        if symbol is not None:
+            return ticker_rows([symbol.upper()], seed, now)[0]
+        if symbols is not None:
+            try:
+                requested = json.loads(symbols)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid symbols")
+            return ticker_rows([sb.upper() for sb in requested], seed, now)
+        return ticker_rows(listed_symbols, seed, now)
+
+    @app.get("/api/v3/trades")
+    async def trades(symbol: str, limit: int = 500):
+        limit = min(max(limit, 1), 1000)
+        now = int(time.time() * 1000)
+        if latency:
+            await asyncio.sleep(latency)
+        body = trades_body(symbol.upper(), now - now % 1000, limit)
+        return Response(body, media_type="application/json")
+
+    @app.get("/data/{path:path}")
+    async def archive(path: str):
+        if latency:
+            await asyncio.sleep(latency)
+        body = await asyncio.to_thread(archive_body, path.rsplit("/", 1)[-1])
+        return Response(body, media_type="application/zip")
+
+    @app.websocket("/ws/{stream}")
+    async def ws_stream(websocket: WebSocket, stream: str):
+        symbol, _, channel = stream.partition("@")
+        if channel == "trade":
+            rate, messages = trade_rate, trade_messages(symbol.upper(), seed)
+        elif channel.startswith("kline_"):
+            interval = channel[len("kline_"):]
+            rate = kline_rate
+            messages = kline_messages(symbol.upper(), interval, interval_ms(interval), seed)
+        else:
+            await websocket.close(code=1008)
+            return
+
+        await websocket.accept()
+        loop = asyncio.get_running_loop()
+        period = 1.0 / rate
+        next_at = loop.time()
+        try:
+            while True:
+                await websocket.send_text(json.dumps(next(messages)))
+                next_at += period
+                delay = next_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -1.0:  # fell behind: skip ahead instead of bursting
+                    next_at = loop.time()
+        except (WebSocketDisconnect, ConnectionClosed, RuntimeError):
+            pass
+
+    return app
+
+
+def trade_messages(symbol: str, seed: int):
+    rng = symbol_rng(symbol, seed, "trade_stream")
+    price = float(np.exp(rng.uniform(np.log(0.1), np.log(50_000))))
+    trade_id = 0
+    while True:
+        price *= float(np.exp(rng.normal(0, 0.0005)))
+        now = int(time.time() * 1000)
+        trade_id += 1
+        yield {
+            "e": "trade",
+            "E": now,
+            "s": symbol,
+            "t": trade_id,
+            "p": _decimal(price),
+            "q": _decimal(float(rng.lognormal(-2, 1.2))),
+            "T": now,
+            "m": bool(rng.random() < 0.5),
+            "M": True,
+        }
+
+
+def kline_messages(symbol: str, interval: str, step: int, seed: int):
+    rng = symbol_rng(symbol, seed, "kline_stream")
+    price = float(np.exp(rng.uniform(np.log(0.1), np.log(50_000))))
+    start = open_ = high = low = None
+    volume = taker = 0.0
+    count = 0
+    while True:
+        now = int(time.time() * 1000)
+        if start != now - now % step:
+            start = now - now % step
+            open_ = high = low = price
+            volume = taker = 0.0
+            count = 0
+        price *= float(np.exp(rng.normal(0, 0.0005)))
+        high, low = max(high, price), min(low, price)
+        qty = float(rng.lognormal(-2, 1.2))
+        volume += qty
+        taker += qty * float(rng.random())
+        count += 1
+        yield {
+            "e": "kline",
+            "E": now,
+            "s": symbol,
+            "k": {
+                "t": start,
+                "T": start + step - 1,
+                "s": symbol,
+                "i": interval,
+                "f": 0,
+                "L": count - 1,
+                "o": _decimal(open_),
+                "c": _decimal(price),
+                "h": _decimal(high),
+                "l": _decimal(low),
+                "v": _decimal(volume),
+                "n": count,
+                "x": False,
+                "q": _decimal(volume * price),
+                "V": _decimal(taker),
+                "Q": _decimal(taker * price),
+                "B": "0",
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--kline-rate", type=float, default=1.0)
+    parser.add_argument("--trade-rate", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--archive-trades", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--listed", type=int, default=len(LISTED))
+    args = parser.parse_args()
+
+    app = create_app(
+        kline_rate=args.kline_rate,
+        trade_rate=args.trade_rate,
+        latency=args.latency,
+        archive_trades=args.archive_trades,
+        seed=args.seed,
+        listed=args.listed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
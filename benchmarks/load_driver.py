@@ -0,0 +1,252 @@
+"""
+Load driver for the proxy endpoints (klines / trades REST and WebSocket) and
+BinanceMarket archive downloads, reporting throughput and p50 / p99 latency
+as JSON. Meant to run against benchmarks.fake_binance; --spawn starts the
+fake and the API (pointed at it through Settings) as subprocesses:
+
+    python -m benchmarks.load_driver --spawn --requests 1000 --concurrency 50
+    python -m benchmarks.load_driver --base-url http://127.0.0.1:8000 --scenario klines trades
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+import websockets
+
+from quant_api.configs import settings
+from quant_api.utils.binance_market import BinanceMarket
+
+SCENARIOS = ["klines", "trades", "archive", "klines_ws", "trades_ws"]
+
+
+def summarize(scenario: str, latencies: list, errors: int, elapsed: float) -> dict:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "scenario": scenario,
+        "count": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)) if len(ms) else None,
+        "p99_ms": float(np.percentile(ms, 99)) if len(ms) else None,
+        "mean_ms": float(ms.mean()) if len(ms) else None,
+        "max_ms": float(ms.max()) if len(ms) else None,
+    }
+
+
+async def run_calls(scenario: str, call, n_requests: int, concurrency: int) -> dict:
+    """`call(i)` n_requests times from `concurrency` workers; per-call latency."""
+    latencies, errors = [], 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < n_requests:
+            st = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - st)
+
+    st = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(scenario, latencies, errors, time.perf_counter() - st)
+
+
+async def run_streams(scenario: str, uri, connections: int, messages: int) -> dict:
+    """
+    `connections` concurrent subscriptions reading `messages` each; latency is
+    event time ("E") to receipt.
+    """
+    latencies, errors = [], 0
+
+    async def consume(i):
+        nonlocal errors
+        try:
+            async with websockets.connect(uri(i)) as ws:
+                for _ in range(messages):
+                    event = json.loads(await ws.recv())
+                    latencies.append(max(time.time() - event["E"] / 1000, 0.0))
+        except Exception:
+            errors += 1
+
+    st = time.perf_counter()
+    await asyncio.gather(*(consume(i) for i in range(connections)))
+    return summarize(scenario, latencies, errors, time.perf_counter() - st)
+
+
+async def run(args) -> list:
+    symbols = args.symbols
+    http_url = args.base_url.rstrip("/")
+    ws_url = http_url.replace("http", "ws", 1)
+    date_str = (datetime.datetime.now() - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+
+        def get(path):
+            async def call(i):
+                response = await client.get(f"{http_url}{path(symbols[i % len(symbols)])}")
+                response.raise_for_status()
+
+            return call
+
+        async def archive(i):
+            await BinanceMarket.aget_data(
+                "klines", date_str, "spot", "daily", symbols[i % len(symbols)], "1m"
+            )
+
+        scenarios = {
+            "klines": lambda: run_calls(
+                "klines",
+                get(lambda sym: f"/v1/klines/get/{sym}/1m"),
+                args.requests,
+                args.concurrency,
+            ),
+            "trades": lambda: run_calls(
+                "trades",
+                get(lambda sym: f"/v1/trades/get/{sym}"),
+                args.requests,
+                args.concurrency,
+            ),
+            "archive": lambda: run_calls(
+                "archive", archive, args.archive_requests, args.concurrency
+            ),
+            "klines_ws": lambda: run_streams(
+                "klines_ws",
+                lambda i: f"{ws_url}/v1/klines/ws/{symbols[i % len(symbols)]}@kline_1m",
+                args.connections,
+                args.messages,
+            ),
+            "trades_ws": lambda: run_streams(
+                "trades_ws",
+                lambda i: f"{ws_url}/v1/trades/ws/{symbols[i % len(symbols)]}@trade",
+                args.connections,
+                args.messages,
+            ),
+        }
+
+        results = []
+        for name in args.scenario:
+            result = await scenarios[name]()
+            results.append(result)
+            print(
+                f"{name:<10} {result['count']:>7} ok {result['errors']:>5} err "
+                f"{result['throughput']:>9.1f}/s  p50 {result['p50_ms'] or 0:>8.2f} ms"
+                f"  p99 {result['p99_ms'] or 0:>8.2f} ms",
+                file=sys.stderr,
+            )
+        return results
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not come up in {timeout}s")
+        time.sleep(0.2)
+
+
+@contextlib.contextmanager
+def spawned(args):
+    """Fake Binance plus the API configured to use it, as subprocesses."""
+    fake = f"127.0.0.1:{args.fake_port}"
+    env = {
+        **os.environ,
+        "BINANCE_API_URL": f"http://{fake}",
+        "BINANCE_WS_URL": f"ws://{fake}",
+        "BINANCE_MARKET_URL": f"http://{fake}",
+    }
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.fake_binance",
+                "--port", str(args.fake_port),
+                "--kline-rate", str(args.kline_rate),
+                "--trade-rate", str(args.trade_rate),
+                "--latency", str(args.latency),
+            ]
+        ),
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "quant_api.apps.v1:app",
+                "--port", str(args.api_port), "--log-level", "warning",
+            ],
+            env=env,
+        ),
+    ]
+    try:
+        wait_ready(f"http://{fake}/api/v3/ping", processes[0])
+        wait_ready(f"http://127.0.0.1:{args.api_port}/metrics", processes[1])
+        # archive downloads run in this process
+        settings.BINANCE_MARKET_URL = env["BINANCE_MARKET_URL"]
+        yield f"http://127.0.0.1:{args.api_port}"
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--symbols", nargs="+", default=["BTCUSDT", "ETHUSDT", "BNBUSDT"])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--archive-requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    spawn = parser.add_argument_group("--spawn: start fake Binance and the API locally")
+    spawn.add_argument("--spawn", action="store_true")
+    spawn.add_argument("--fake-port", type=int, default=9100)
+    spawn.add_argument("--api-port", type=int, default=8100)
+    spawn.add_argument("--kline-rate", type=float, default=10.0)
+    spawn.add_argument("--trade-rate", type=float, default=100.0)
+    spawn.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with spawned(args) if args.spawn else contextlib.nullcontext(args.base_url) as base_url:
+        args.base_url = base_url
+        results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "binance_market_url": settings.BINANCE_MARKET_URL,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Per-symbol loop vs. panel mode, scaling the number of symbols.
+
+    python -m benchmarks.panel_benchmark --bars 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant import MultiAssetCryptoStrategy
+
+SYMBOL_COUNTS = [2, 10, 50, 100, 200, 500]
+
+
+def make_klines(n_bars: int, rng: np.random.Generator) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = rng.uniform(0, 0.005, (2, n_bars))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread[0]),
+            "low": np.minimum(open_, close) * (1 - spread[1]),
+            "close": close,
+            "volume": rng.lognormal(3, 0.5, n_bars),
+        }
+    )
+
+
+def time_indicators(strategy, klines_data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        strategy._panel_cache = None
+        st = time.perf_counter()
+        strategy.calculate_volatility_metrics(klines_data)
+        strategy.calculate_momentum_signals(klines_data)
+        best = min(best, time.perf_counter() - st)
+    return best
+
+
+def main(n_bars: int, repeat: int):
+    rng = np.random.default_rng(0)
+    print(f"{'symbols':>8} {'loop (s)':>10} {'panel (s)':>10} {'speedup':>8}")
+    for n_symbols in SYMBOL_COUNTS:
+        symbols = [f"SYM{i}USDT" for i in range(n_symbols)]
+        klines_data = {sym: make_klines(n_bars, rng) for sym in symbols}
+
+        loop = time_indicators(
+            MultiAssetCryptoStrategy(symbols=symbols, metric_cache_size=0),
+            klines_data,
+            repeat,
+        )
+        panel = time_indicators(
+            MultiAssetCryptoStrategy(
+                symbols=symbols, panel_mode=True, metric_cache_size=0
+            ),
+            klines_data,
+            repeat,
+        )
+        print(f"{n_symbols:>8} {loop:>10.4f} {panel:>10.4f} {loop / panel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.bars, args.repeat)
@@ -0,0 +1,274 @@
+"""
+Benchmark suite: every MultiAssetCryptoStrategy method, archive decoding and
+JSON encoding over a grid of symbols x bars x trades, on deterministic
+synthetic data. Results are written as JSON; pass a previous run to
+--compare to flag regressions (non-zero exit status).
+
+    python -m benchmarks.strategy_benchmark --output baseline.json
+    python -m benchmarks.strategy_benchmark --compare baseline.json --threshold 1.25
+    python -m benchmarks.strategy_benchmark --compact --panel --compare baseline.json
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.utils.binance_market import extract_zip_content
+from quant_api.utils.encoder import EnhancedJSONEncoder
+from quant_api.utils.frames import compact_frames
+from quant_api.utils.synthetic import archive_zip, synthetic_market
+
+GRIDS = {
+    "quick": {"symbols": [2, 10], "bars": [500, 2000], "trades": [1000, 10000]},
+    "full": {"symbols": [2, 10, 50], "bars": [1000, 10000], "trades": [10000, 100000]},
+}
+
+
+def strategy_frames(klines: pd.DataFrame) -> pd.DataFrame:
+    """Archive klines as the strategy reads them: prices in open/close, time index."""
+    return klines.assign(open=klines["openPrice"], close=klines["last"]).set_index(
+        pd.to_datetime(klines["open"], unit="ms").rename(None)
+    )
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up
+    durations = []
+    for _ in range(repeat):
+        st = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - st)
+    return {
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+        "repeat": repeat,
+    }
+
+
+def cases(
+    n_symbols: int,
+    n_bars: int,
+    n_trades: int,
+    seed: int,
+    compact: bool = False,
+    panel_mode: bool = False,
+) -> dict:
+    """name -> zero-argument callable, for one grid point."""
+    symbols = [f"SYM{i}USDT" for i in range(n_symbols)]
+    raw_klines, trades_data = synthetic_market(symbols, n_bars, n_trades, seed)
+    if compact:
+        raw_klines, trades_data = compact_frames(raw_klines, trades_data)
+    klines_data = {sym: strategy_frames(df) for sym, df in raw_klines.items()}
+
+    def new_strategy():
+        # no metric cache: every call measures the computation
+        strategy = MultiAssetCryptoStrategy(
+            symbols=symbols,
+            metric_cache_size=0,
+            panel_mode=panel_mode,
+            compact=compact,
+        )
+        entry = klines_data[symbols[0]].index[n_bars // 2].to_pydatetime()
+        strategy.update_positions(
+            [
+                {
+                    "symbol": sym,
+                    "side": "BUY",
+                    "size": 1.0,
+                    "price": klines_data[sym]["close"].iloc[n_bars // 2],
+                    "trade_id": f"bench-{sym}",
+                    "time": entry,
+                }
+                for sym in symbols
+            ]
+        )
+        return strategy
+
+    strategy = new_strategy()
+    vol_metrics = strategy.calculate_volatility_metrics(klines_data)
+    correlation = strategy.calculate_correlation_matrix(klines_data)
+    volume_profiles = strategy.calculate_volume_profile(trades_data, klines_data)
+    orders = [
+        Order(sym, "BUY", 50 * trades_data[sym]["quantity"].mean(), "MARKET")
+        for sym in symbols
+    ]
+    # many parents per symbol, as a scheduler sees them
+    parents = [
+        Order(o.symbol, "BUY" if i % 2 else "SELL", o.size / (1 + i % 7), "MARKET")
+        for i in range(1000 // n_symbols)
+        for o in orders
+    ]
+    fills = [
+        {"symbol": o.symbol, "side": o.side, "size": o.size, "price": 1.0, "trade_id": "f"}
+        for o in orders
+    ]
+    iteration = strategy.run_iteration(klines_data, trades_data)
+    klines_zip = archive_zip(raw_klines[symbols[0]], "klines.csv")
+    trades_zip = archive_zip(trades_data[symbols[0]], "trades.csv")
+    records = raw_klines[symbols[0]].to_dict(orient="records")
+
+    return {
+        "calculate_volume_profile": lambda: strategy.calculate_volume_profile(
+            trades_data, klines_data
+        ),
+        "calculate_volatility_metrics": lambda: strategy.calculate_volatility_metrics(
+            klines_data
+        ),
+        "calculate_correlation_matrix": lambda: strategy.calculate_correlation_matrix(
+            klines_data
+        ),
+        "calculate_momentum_signals": lambda: strategy.calculate_momentum_signals(
+            klines_data
+        ),
+        "calculate_position_sizes": lambda: strategy.calculate_position_sizes(
+            vol_metrics, correlation, volume_profiles
+        ),
+        "generate_signals": lambda: strategy.generate_signals(klines_data, trades_data),
+        "calculate_risk_metrics": lambda: strategy.calculate_risk_metrics(klines_data),
+        "execute_risk_management": lambda: strategy.execute_risk_management(
+            klines_data
+        ),
+        "calculate_market_impact": lambda: [
+            strategy.calculate_market_impact(order, trades_data, klines_data)
+            for order in orders
+        ],
+        "optimize_order_execution": lambda: strategy.optimize_order_execution(
+            orders, trades_data, klines_data
+        ),
+        "schedule_order_execution": lambda: strategy.schedule_order_execution(
+            parents, trades_data, klines_data
+        ),
+        "update_positions": lambda: new_strategy().update_positions(fills),
+        "run_iteration": lambda: strategy.run_iteration(klines_data, trades_data),
+        "extract_zip_content[klines]": lambda: extract_zip_content(klines_zip),
+        "extract_zip_content[trades]": lambda: extract_zip_content(trades_zip),
+        "json_encode[orders]": lambda: json.dumps(iteration, cls=EnhancedJSONEncoder),
+        "json_encode[klines]": lambda: json.dumps(records, cls=EnhancedJSONEncoder),
+    }
+
+
+def run(
+    grid: dict,
+    repeat: int,
+    seed: int,
+    only: list = None,
+    compact: bool = False,
+    panel_mode: bool = False,
+) -> list:
+    results = []
+    for n_symbols, n_bars, n_trades in itertools.product(
+        grid["symbols"], grid["bars"], grid["trades"]
+    ):
+        grid_cases = cases(n_symbols, n_bars, n_trades, seed, compact, panel_mode)
+        for name, fn in grid_cases.items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            stats = measure(fn, repeat)
+            results.append(
+                {
+                    "benchmark": name,
+                    "symbols": n_symbols,
+                    "bars": n_bars,
+                    "trades": n_trades,
+                    **stats,
+                }
+            )
+            print(
+                f"{name:<32} {n_symbols:>4} sym {n_bars:>6} bars {n_trades:>7} trades"
+                f"  median {stats['median'] * 1000:>10.3f} ms",
+                file=sys.stderr,
+            )
+    return results
+
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "grid": args.grid,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "compact": args.compact,
+        "panel": args.panel,
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Benchmarks whose median slowed down by more than `threshold` x."""
+    key = lambda r: (r["benchmark"], r["symbols"], r["bars"], r["trades"])
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None or before["median"] <= 0:
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > threshold:
+            regressions.append({**result, "baseline_median": before["median"], "ratio": ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="quick")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="run benchmarks matching these names")
+    parser.add_argument("--compact", action="store_true", help="float32 frames and panels")
+    parser.add_argument("--panel", action="store_true", help="strategy panel_mode")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    report = {
+        "meta": metadata(args),
+        "results": run(
+            GRIDS[args.grid], args.repeat, args.seed, args.only, args.compact, args.panel
+        ),
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            report["regressions"] = compare(report["results"], json.load(f), args.threshold)
+        for r in report["regressions"]:
+            print(
+                f"REGRESSION {r['benchmark']} ({r['symbols']} sym, {r['bars']} bars, "
+                f"{r['trades']} trades): {r['ratio']:.2f}x slower",
+                file=sys.stderr,
+            )
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
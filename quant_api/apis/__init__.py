@@ -5,9 +5,10 @@ __all__ = ["v1"]
 from fastapi import APIRouter, WebSocket
 from fastapi.responses import JSONResponse
 from fastapi import HTTPException, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 import asyncio
 from quant_api.static.ws_test_html import html
+from quant_api.utils.metrics import metrics
 
 
 router = APIRouter()
@@ -19,6 +20,14 @@ async def index():
     return {"status": "healthy"}
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Pipeline stage timings and counters in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @router.get("/chat", response_class=JSONResponse)
 async def chat():
     """chat Page of the API."""
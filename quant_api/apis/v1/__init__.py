@@ -1,3 +1,3 @@
-from quant_api.apis.v1 import index, klines, klines_ws, trades, trades_ws, quant
+from quant_api.apis.v1 import index, klines, klines_ws, ticker, trades, trades_ws, quant, jobs
 
-__all__ = ["index", "klines", "klines_ws", "trades", "trades_ws", "quant"]
+__all__ = ["index", "klines", "klines_ws", "ticker", "trades", "trades_ws", "quant", "jobs"]
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+
+from quant_api.apis.v1.quant import run_backtest, run_past
+from quant_api.assemble.jobs import SUCCEEDED, JobNotFound, job_manager
+from quant_api.configs import settings
+from quant_api.schemas import market, quant
+
+router = APIRouter(prefix="/quant/jobs", tags=["Quant Jobs"])
+
+
+@job_manager.runner("past")
+async def past_job(params: dict, progress):
+    return await run_past(
+        market.MarketDataForQuant(**params["target"]),
+        quant.MultiAssetCryptoStrategy(**params["quant_params"]),
+        timeout=settings.JOB_TIMEOUT,
+        progress=progress,
+    )
+
+
+@job_manager.runner("backtest")
+async def backtest_job(params: dict, progress):
+    return await run_backtest(
+        market.MarketDataForQuant(**params["target"]),
+        quant.MultiAssetCryptoStrategy(**params["quant_params"]),
+        quant.BacktestParams(**params["backtest_params"]),
+        timeout=settings.JOB_TIMEOUT,
+        progress=progress,
+    )
+
+
+async def _get_job(job_id: str):
+    try:
+        return await job_manager.get(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail=f"unknown job : {job_id}")
+
+
+@router.post("/past", response_class=JSONResponse, status_code=202)
+async def submit_past_job(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+):
+    """Queue a `/multi_asset_crypto/past` run; poll it with the returned job_id."""
+    return await job_manager.submit(
+        "past",
+        {"target": target.model_dump(), "quant_params": quant_params.model_dump()},
+    )
+
+
+@router.post("/backtest", response_class=JSONResponse, status_code=202)
+async def submit_backtest_job(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    backtest_params: quant.BacktestParams,
+):
+    """Queue a `/multi_asset_crypto/backtest` run."""
+    return await job_manager.submit(
+        "backtest",
+        {
+            "target": target.model_dump(),
+            "quant_params": quant_params.model_dump(),
+            "backtest_params": backtest_params.model_dump(),
+        },
+    )
+
+
+@router.get("/{job_id}", response_class=JSONResponse)
+async def get_job(job_id: str):
+    """Status, phase (download / decode / compute / done) and progress of a job."""
+    return (await _get_job(job_id)).to_dict()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await _get_job(job_id)
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"job is {job.status}")
+    return Response(content=job.result, media_type="application/json")
+
+
+@router.delete("/{job_id}", response_class=JSONResponse)
+async def cancel_job(job_id: str):
+    await _get_job(job_id)
+    return await job_manager.cancel(job_id)
+
+
+@router.websocket("/{job_id}/ws")
+async def ws_job_progress(websocket: WebSocket, job_id: str):
+    """Push the job state on every progress change until the job finishes."""
+    await websocket.accept()
+    try:
+        async for state in job_manager.subscribe(job_id):
+            await websocket.send_json(state)
+    except JobNotFound:
+        await websocket.send_json({"job_id": job_id, "detail": "unknown job"})
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
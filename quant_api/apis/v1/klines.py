@@ -7,6 +7,7 @@ import httpx
 import websockets
 import json
 from quant_api.configs import settings
+from quant_api.utils.metrics import metrics
 from quant_api.schemas import market
 from quant_api.utils.binance_market import BinanceMarket
 from typing import Optional
@@ -37,9 +38,10 @@ async def get_klines(
         params["endTime"] = startTime
 
     async with httpx.AsyncClient() as client:
-        response = await client.get(
-            url=f"{settings.BINANCE_API_URL}/api/v3/klines", params=params
-        )
+        with metrics.upstream("klines"):
+            response = await client.get(
+                url=f"{settings.BINANCE_API_URL}/api/v3/klines", params=params
+            )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -1,77 +1,200 @@
 from fastapi import FastAPI
 from fastapi import APIRouter, WebSocket
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi import HTTPException, WebSocketDisconnect
-from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.assemble.executor import executor, host_executor
+from quant_api.assemble.tenants import tenant_manager
+from quant_api.quant import tasks, universe
+from quant_api.quant.host import strategy_host
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.sweep import (
+    ParameterSweep,
+    SharedMarketData,
+    grid_candidates,
+    random_candidates,
+    set_param,
+)
 from quant_api.apis.v1.klines import get_klines
+from quant_api.apis.v1.ticker import get_ticker_24hr
 from quant_api.apis.v1.trades import get_trades
+import numpy as np
 import pandas as pd
 import json
 from quant_api.configs import settings
 from quant_api.schemas import quant, market
 from quant_api.utils.encoder import EnhancedJSONEncoder
+from quant_api.utils.frames import klines_frame, taker_trades, trades_frame
+from quant_api.utils.metrics import metrics
 from quant_api.utils.binance_market import BinanceMarket
 import datetime
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
 import logging
 import asyncio
 import time
 
 router = APIRouter(prefix="/quant", tags=["Quant Forward"])
 logger = logging.getLogger("uvicorn")
+# one tenants run per (interval, limit) market at a time
+_market_locks: Dict[Tuple[str, int], asyncio.Lock] = defaultdict(asyncio.Lock)
 
 
 @router.get("/multi_asset_crypto", response_class=JSONResponse)
-async def get_multi_asset_result(symbols: list, interval: str = "1m", limit: int = 500):
+async def get_multi_asset_result(
+    symbols: list, interval: str = "1m", limit: int = 500, timeout: Optional[float] = None
+):
     klines_data = {}
     trades_data = {}
 
     init_params = quant.MultiAssetCryptoStrategy(symbols=symbols).model_dump()
-    multi_asset_crypto_strategy = MultiAssetCryptoStrategy(**init_params)
 
     for symbol in symbols:
         kline_df = pd.DataFrame(
             await get_klines(symbol=symbol, interval=interval, limit=limit)
         )
-        kline_df.columns = settings.KLINES_COLUMNS
-        kline_df = kline_df.astype(
-            {
-                "open": "float",
-                "close": "float",
-                "openPrice": "float",
-                "high": "float",
-                "low": "float",
-                "last": "float",
-                "volume": "float",
-                "quoteVolume": "float",
-            }
-        )
-
         trade_df = pd.DataFrame(await get_trades(symbol=symbol, limit=limit))
         trade_df = trade_df.rename(columns={"qty": "quantity"})
-        trade_df = trade_df.astype(
-            {"price": "float", "quantity": "float", "quoteQty": "float"}
-        )
-        trade_df["side"] = trade_df.apply(
-            lambda row: "BUY" if row["isBuyerMaker"] else "SELL", axis=1
-        )
 
-        klines_data[symbol] = kline_df
-        trades_data[symbol] = trade_df
+        klines_data[symbol] = klines_frame([kline_df])
+        trades_data[symbol] = trades_frame([trade_df])
 
-    result = multi_asset_crypto_strategy.run_iteration(
-        klines_data=klines_data, trades_data=trades_data
+    result = await executor.submit(
+        tasks.run_iteration,
+        init_params,
+        MarketData.from_klines(klines_data).frames,
+        trades_data,
+        timeout=timeout,
     )
 
-    return json.dumps(result, cls=EnhancedJSONEncoder)
+    with metrics.stage("serialize"):
+        return json.dumps(result, cls=EnhancedJSONEncoder)
 
 
+@router.post("/multi_asset_crypto/tenants/run", response_class=JSONResponse)
+async def run_tenants(
+    interval: str = "1m", limit: int = 500, timeout: Optional[float] = None
+):
+    """
+    Fetch the union of the tenants' symbols once, then run one iteration of
+    every tenant of the (interval, limit) market over the same frames.
+    Runs of the same market are serialized.
+    """
+    market_key = (interval, limit)
+    if market_key not in strategy_host.snapshots:
+        raise HTTPException(
+            status_code=404, detail=f"no tenant on {interval} / {limit}"
+        )
 
-@router.post("/multi_asset_crypto/past", response_class=JSONResponse)
-async def multi_asset_crypto_past(
-    target: market.MarketDataForQuant,
-    quant_params: quant.MultiAssetCryptoStrategy
+    async with _market_locks[market_key]:
+        symbols = strategy_host.symbols(market_key)
+        with_trades = strategy_host.needs_trades(market_key)
+
+        async def fetch(symbol: str):
+            kline_df = pd.DataFrame(
+                await get_klines(symbol=symbol, interval=interval, limit=limit)
+            )
+            if not with_trades:
+                return klines_frame([kline_df]), None
+            trade_df = pd.DataFrame(await get_trades(symbol=symbol, limit=limit))
+            return klines_frame([kline_df]), trades_frame(
+                [trade_df.rename(columns={"qty": "quantity"})]
+            )
+
+        frames = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        klines_data = {symbol: klines for symbol, (klines, _) in zip(symbols, frames)}
+        trades_data = (
+            {symbol: trades for symbol, (_, trades) in zip(symbols, frames)}
+            if with_trades
+            else None
+        )
+
+        # in-process tenants: a thread worker, same capacity / deadline rules
+        results = await host_executor.submit(
+            strategy_host.run,
+            market_key,
+            MarketData.from_klines(klines_data).frames,
+            trades_data,
+            timeout=timeout,
+        )
+        tenant_manager.save(results)
+
+    with metrics.stage("serialize"):
+        return json.dumps(results, cls=EnhancedJSONEncoder)
+
+
+# after /tenants/run, which would match {tenant_id}
+@router.post("/multi_asset_crypto/tenants/{tenant_id}", response_class=JSONResponse)
+async def register_tenant(
+    tenant_id: str,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    interval: str = "1m",
+    limit: int = 500,
 ):
+    """
+    Run `quant_params` on the shared (interval, limit) market snapshot,
+    from the state last saved under `tenant_id` if any.
+    """
+    await tenant_manager.register(
+        tenant_id, quant_params.model_dump(), interval, limit
+    )
+    return strategy_host.stats()
+
+
+@router.delete("/multi_asset_crypto/tenants/{tenant_id}", response_class=JSONResponse)
+async def unregister_tenant(tenant_id: str):
+    if tenant_id not in strategy_host.tenants:
+        raise HTTPException(status_code=404, detail=f"unknown tenant : {tenant_id}")
+    await tenant_manager.unregister(tenant_id)
+    return strategy_host.stats()
+
+
+
+async def select_symbols(symbols: list, min_trade_volume: float) -> list:
+    """
+    Upper-cased `symbols` whose 24h USD volume reaches `min_trade_volume`, from
+    one batched 24h ticker call, so heavy data is only loaded for those.
+    Patterns such as "*USDT" expand to every listed pair (one unbatched call).
+    """
+    symbols = [sb.upper() for sb in symbols]
+    patterns = any(universe.is_pattern(sb) for sb in symbols)
+    if not patterns and min_trade_volume <= 0:
+        return symbols
+
+    with metrics.stage("universe"):
+        if patterns:
+            tickers = await get_ticker_24hr(symbols=None)
+        else:
+            tickers = await get_ticker_24hr(
+                symbols=symbols + universe.conversion_symbols(symbols)
+            )
+        selected = universe.select(
+            symbols, universe.usd_volumes(tickers), min_trade_volume
+        )
+    logger.debug(f"universe : {len(selected)} symbols above {min_trade_volume}")
+    if not selected:
+        raise HTTPException(
+            status_code=422,
+            detail=f"No symbol has a 24h volume of at least {min_trade_volume} USD",
+        )
+    return selected
 
+
+async def load_past_data(
+    target: market.MarketDataForQuant,
+    symbols: list,
+    progress=None,
+    compact=False,
+    trades=True,
+) -> tuple[dict, Optional[dict]]:
+    """
+    Download and concatenate daily klines and trades archives for every symbol.
+
+    `progress`, if given, is awaited as progress(phase, fraction) with the
+    "download" phase (one step per archive) then the "decode" phase. With
+    `compact` the frames use the compact dtypes of `quant_api.utils.frames`.
+    Without `trades` only the klines are downloaded and trades_data is None.
+    """
     # calc date range
     if target.start_date == target.end_date:
         dates = [target.start_date]
@@ -82,21 +205,27 @@ async def multi_asset_crypto_past(
         dates = [(start_dt + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in
                  range((end_dt - start_dt).days + 1)]
 
-    # symbol to upper case
-    symbols = [sb.upper() for sb in quant_params.symbols]
+    total = (2 if trades else 1) * len(symbols) * len(dates)
+    done = 0
+
+    async def fetch(**kwargs):
+        nonlocal done
+        data = await BinanceMarket.aget_data(**kwargs)
+        done += 1
+        if progress is not None:
+            await progress("download", done / total)
+        return list(data.values())[0]
 
     # data dict init
     klines_data = {}
-    trades_data = {}
+    trades_data = {} if trades else None
 
     # get klines data
     logger.debug("getting klines data...")
     for symbol in symbols:
-        klines_data[symbol.upper()] = pd.DataFrame(columns=settings.KLINES_COLUMNS)
-
         # async tasks
         tasks_klines = [
-            BinanceMarket.aget_data(
+            fetch(
                 market_data_type="klines",
                 date_str=date_str,
                 trading_type=target.trading_type,
@@ -107,33 +236,14 @@ async def multi_asset_crypto_past(
             for date_str in dates
         ]
 
-        klines_market = await asyncio.gather(*tasks_klines)
-
-        # sum data
-        for klines in klines_market:
-            klines_data[symbol.upper()] = pd.concat([klines_data[symbol.upper()], list(klines.values())[0]])
-
-        klines_data[symbol.upper()] = klines_data[symbol.upper()].astype(
-            {
-                "open": "float",
-                "close": "float",
-                "openPrice": "float",
-                "high": "float",
-                "low": "float",
-                "last": "float",
-                "volume": "float",
-                "quoteVolume": "float",
-            }
-        )
+        klines_data[symbol.upper()] = await asyncio.gather(*tasks_klines)
 
     # get trades data
     logger.debug("getting trades data...")
-    for symbol in symbols:
-        trades_data[symbol.upper()] = pd.DataFrame(columns=settings.TRADES_COLUMNS)
-
+    for symbol in symbols if trades else []:
         # async tasks
         tasks_trades = [
-            BinanceMarket.aget_data(
+            fetch(
                 market_data_type="trades",
                 date_str=date_str,
                 trading_type=target.trading_type,
@@ -144,32 +254,233 @@ async def multi_asset_crypto_past(
             for date_str in dates
         ]
 
-        # gather tasks
-        trades_market = await asyncio.gather(*tasks_trades)
+        trades_data[symbol.upper()] = await asyncio.gather(*tasks_trades)
 
-        # sum data
-        for trades in trades_market:
-            trades_data[symbol.upper()] = pd.concat([trades_data[symbol.upper()], list(trades.values())[0]])
+    # sum data and post process
+    logger.debug("decoding market data...")
+    for i, symbol in enumerate(symbols):
+        with metrics.stage("dtype_conversion"):
+            klines_data[symbol.upper()] = klines_frame(
+                klines_data[symbol.upper()], compact=compact
+            )
+            if trades:
+                trades_data[symbol.upper()] = trades_frame(
+                    trades_data[symbol.upper()], compact=compact
+                )
+        metrics.count_rows("dtype_conversion", len(klines_data[symbol.upper()]))
+        if trades:
+            metrics.count_rows("dtype_conversion", len(trades_data[symbol.upper()]))
 
-        # df post process
-        trades_data[symbol.upper()] = trades_data[symbol.upper()].astype(
-            {"price": "float", "quantity": "float", "quoteQty": "float"}
-        )
-        trades_data[symbol.upper()]["side"] = trades_data[symbol.upper()].apply(
-            lambda row: "BUY" if row["isBuyerMaker"] else "SELL", axis=1
-        )
+        if progress is not None:
+            await progress("decode", (i + 1) / len(symbols))
+
+    return klines_data, trades_data
+
+
+async def run_past(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    timeout: Optional[float] = None,
+    progress=None,
+) -> list:
+    """
+    One strategy iteration over the archived date range (see `load_past_data`
+    for `progress`; the final phase is "compute"), on the symbols that pass
+    `select_symbols`.
+    """
+    symbols = await select_symbols(quant_params.symbols, quant_params.min_trade_volume)
+    quant_params.symbols = symbols
+
+    klines_data, trades_data = await load_past_data(
+        target,
+        symbols,
+        progress,
+        compact=quant_params.compact,
+        trades=quant_params.volume_source == "trades",
+    )
 
     # Quant
     logger.debug("operating quant func...")
-    print("Quant...")
+    if progress is not None:
+        await progress("compute", 0.0)
+    st = time.time()
+    result = await executor.submit(
+        tasks.run_iteration,
+        quant_params.model_dump(),
+        MarketData.from_klines(klines_data, symbols).frames,
+        trades_data,
+        timeout=timeout,
+    )
+    logger.debug(f"quant time : {time.time() - st}")
+
+    return result
+
+
+@router.post("/multi_asset_crypto/past", response_class=JSONResponse)
+async def multi_asset_crypto_past(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    timeout: Optional[float] = None,
+):
+    result = await run_past(target, quant_params, timeout)
+
+    with metrics.stage("serialize"):
+        return json.dumps(result, cls=EnhancedJSONEncoder)
+
+
+def replay_klines(klines_data: dict, symbols: list) -> tuple[dict, np.ndarray]:
+    """
+    Klines frames for a bar replay, aligned on the union of the bar open
+    times (see `MarketData.align`), and those times (epoch ms).
+    """
+    market = MarketData.from_klines(klines_data, symbols)
+    return market.align(), market.axis
+
+
+async def run_backtest(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    backtest_params: quant.BacktestParams,
+    timeout: Optional[float] = None,
+    progress=None,
+) -> dict:
+    """
+    Replay the strategy bar by bar over the archived date range.
+    """
+    symbols = await select_symbols(quant_params.symbols, quant_params.min_trade_volume)
+    quant_params.symbols = symbols
+
+    klines_data, trades_data = await load_past_data(
+        target,
+        symbols,
+        progress,
+        compact=quant_params.compact,
+        trades=quant_params.volume_source == "trades",
+    )
+    klines_data, timestamps = replay_klines(klines_data, symbols)
+
+    logger.debug("running backtest...")
+    if progress is not None:
+        await progress("compute", 0.0)
     st = time.time()
-    multi_asset_crypto_strategy = MultiAssetCryptoStrategy(**quant_params.model_dump())
-    result = multi_asset_crypto_strategy.run_iteration(
-        klines_data=klines_data, trades_data=trades_data
+    result = await executor.submit(
+        tasks.run_backtest,
+        quant_params.model_dump(),
+        klines_data,
+        trades_data,
+        timestamps,
+        backtest_params.model_dump(),
+        timeout=timeout,
     )
-    print("quant time :", time.time() - st)
+    logger.debug(f"backtest time : {time.time() - st}")
+
+    return {
+        "stats": result.stats,
+        "equity_curve": result.equity_curve.to_dict(orient="list"),
+        "fills": result.fills.to_dict(orient="records"),
+    }
+
+
+@router.post("/multi_asset_crypto/backtest", response_class=JSONResponse)
+async def multi_asset_crypto_backtest(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    backtest_params: quant.BacktestParams,
+    timeout: Optional[float] = None,
+):
+    result = await run_backtest(target, quant_params, backtest_params, timeout)
+
+    with metrics.stage("serialize"):
+        return json.dumps(result, cls=EnhancedJSONEncoder)
+
 
-    return json.dumps(result, cls=EnhancedJSONEncoder)
+@router.post("/multi_asset_crypto/sweep")
+async def multi_asset_crypto_sweep(
+    target: market.MarketDataForQuant,
+    quant_params: quant.MultiAssetCryptoStrategy,
+    backtest_params: quant.BacktestParams,
+    sweep_params: quant.SweepParams,
+):
+    """
+    Backtest parameter combinations over the archived date range in parallel.
+
+    Results stream back as newline-delimited JSON, in completion order.
+    """
+    if bool(sweep_params.grid) == bool(sweep_params.random):
+        raise HTTPException(
+            status_code=422, detail="Provide exactly one of grid or random"
+        )
+
+    symbols = await select_symbols(quant_params.symbols, quant_params.min_trade_volume)
+    quant_params.symbols = symbols
+    base_params = quant_params.model_dump()
+
+    if sweep_params.grid:
+        candidates = list(grid_candidates(sweep_params.grid))
+    else:
+        candidates = list(
+            random_candidates(
+                sweep_params.random, sweep_params.n_samples, sweep_params.seed
+            )
+        )
+    # reject invalid combinations before any data is downloaded
+    for overrides in candidates:
+        params = base_params
+        for key, value in overrides.items():
+            params = set_param(params, key, value)
+        try:
+            quant.MultiAssetCryptoStrategy(**params)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    klines_data, trades_data = await load_past_data(
+        target,
+        symbols,
+        compact=quant_params.compact,
+        trades=quant_params.volume_source == "trades",
+    )
+    klines_data, timestamps = replay_klines(klines_data, symbols)
+    backtest_kwargs = backtest_params.model_dump()
+    if trades_data is None:
+        # the workers only get the panel: ship the taker volume as trades
+        # and the average trade size the klines give
+        trades_data = {
+            symbol: taker_trades(klines, timestamps)
+            for symbol, klines in klines_data.items()
+        }
+        backtest_kwargs["avg_trade_sizes"] = {
+            symbol: klines["volume"].sum() / klines["count"].sum()
+            for symbol, klines in klines_data.items()
+        }
+    shared = SharedMarketData.create(klines_data, trades_data, symbols, timestamps)
+    del klines_data, trades_data
+
+    try:
+        sweep = ParameterSweep(
+            shared,
+            base_params,
+            backtest_kwargs,
+            metric=sweep_params.metric,
+            maximize=sweep_params.maximize,
+            patience=sweep_params.patience,
+            max_workers=sweep_params.max_workers,
+        )
+    except BaseException:
+        shared.unlink()
+        raise
+
+    def stream():
+        # sync generator: starlette iterates it in a worker thread
+        for result in sweep.run(candidates):
+            yield json.dumps(result, cls=EnhancedJSONEncoder) + "\n"
+
+    # released once the response is over, streamed to the end or not (the
+    # generator is never resumed when the client disconnects early)
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(shared.unlink),
+    )
 
 
 async def unit_test(symbols: list, interval: str = "1m", limit: int = 500):
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+import httpx
+import json
+from quant_api.configs import settings
+from quant_api.utils.metrics import metrics
+from typing import List, Optional
+
+import asyncio
+
+router = APIRouter(prefix="/ticker")
+
+
+@router.get("/24hr", response_class=JSONResponse)
+async def get_ticker_24hr(
+    symbols: Optional[List[str]] = Query(None), type: Optional[str] = "MINI"
+):
+    """
+    24h rolling window statistics of `symbols` in one call, or of every
+    listed symbol without `symbols`.
+    """
+    params = {"type": type}
+    if symbols:
+        params["symbols"] = json.dumps(
+            [symbol.replace("-", "") for symbol in symbols], separators=(",", ":")
+        )
+
+    async with httpx.AsyncClient() as client:
+        with metrics.upstream("ticker"):
+            response = await client.get(
+                url=f"{settings.BINANCE_API_URL}/api/v3/ticker/24hr", params=params
+            )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code, detail="Binance API Error"
+            )
+
+    return response.json()
+
+
+async def unit_test(symbols: list):
+    result = await get_ticker_24hr(symbols=symbols)
+    print(result)
+    return result
+
+
+if __name__ == "__main__":
+    result = asyncio.run(unit_test(symbols=["BTCUSDT", "ETHUSDT"]))
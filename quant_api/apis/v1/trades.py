@@ -7,6 +7,7 @@ import httpx
 import websockets
 import json
 from quant_api.configs import settings
+from quant_api.utils.metrics import metrics
 from typing import Optional
 
 import asyncio
@@ -22,9 +23,10 @@ async def get_trades(symbol: str, limit: Optional[int] = 500):
     }
 
     async with httpx.AsyncClient() as client:
-        response = await client.get(
-            url=f"{settings.BINANCE_API_URL}/api/v3/trades", params=params
-        )
+        with metrics.upstream("trades"):
+            response = await client.get(
+                url=f"{settings.BINANCE_API_URL}/api/v3/trades", params=params
+            )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -8,13 +8,15 @@ from starlette.staticfiles import StaticFiles
 from quant_api import apis
 from quant_api.assemble import event
 from quant_api.assemble import exception
-from quant_api.assemble.middleware import cors_middleware
+from quant_api.assemble.executor import ExecutorOverloaded, ExecutorTimeout
+from quant_api.assemble.middleware import cors_middleware, server_timing_middleware
 
 
 app = FastAPI(
     docs_url="/docs",
     middleware=[
         cors_middleware,
+        server_timing_middleware,
     ],
 )
 
@@ -27,6 +29,7 @@ app.mount("/static", static_files, name="static")
 # add events
 app.add_event_handler("startup", event.startup_event_1)
 app.add_event_handler("startup", event.startup_event_2)
+app.add_event_handler("startup", event.startup_event_3)
 app.add_event_handler("shutdown", event.shutdown_event)
 
 # add exception handlers
@@ -35,12 +38,16 @@ app.add_exception_handler(HTTPException, exception.http_exception_handler)
 app.add_exception_handler(
     RequestValidationError, exception.validation_exception_handler
 )
+app.add_exception_handler(ExecutorOverloaded, exception.executor_overloaded_handler)
+app.add_exception_handler(ExecutorTimeout, exception.executor_timeout_handler)
 
 # add routers
 app.include_router(apis.router, tags=["test"])
 app.include_router(apis.v1.index.router, prefix="/v1")
 app.include_router(apis.v1.klines.router, prefix="/v1")
 app.include_router(apis.v1.klines_ws.router, prefix="/v1")
+app.include_router(apis.v1.ticker.router, prefix="/v1")
 app.include_router(apis.v1.trades.router, prefix="/v1")
 app.include_router(apis.v1.trades_ws.router, prefix="/v1")
 app.include_router(apis.v1.quant.router, prefix="/v1")
+app.include_router(apis.v1.jobs.router, prefix="/v1")
@@ -2,6 +2,11 @@ import logging.config
 
 from quant_api import database
 from quant_api import models
+from quant_api.assemble.executor import executor, host_executor
+from quant_api.assemble.jobs import job_manager
+from quant_api.assemble.snapshots import snapshot_manager
+from quant_api.assemble.store import state_store
+from quant_api.assemble.tenants import tenant_manager
 from quant_api.configs import settings as default_settings
 
 logger = logging.getLogger(__name__)
@@ -17,8 +22,22 @@ async def startup_event_2():
     logger.info("Synchronizing databases..")
     async with database.engine.begin() as conn:
         await conn.run_sync(models.Base.metadata.create_all)
+    state_store.start()
+
+
+async def startup_event_3():
+    logger.info("Resuming quant jobs..")
+    await job_manager.recover()
+    logger.info("Recovering strategy tenants..")
+    await tenant_manager.recover()
+    snapshot_manager.start()
 
 
 async def shutdown_event():
     logger.info("shutting down..")
+    await job_manager.shutdown()
+    await snapshot_manager.close()
+    await state_store.close()
+    executor.shutdown(wait=False)
+    host_executor.shutdown(wait=False)
     await database.engine.dispose()
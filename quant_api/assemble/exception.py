@@ -6,6 +6,8 @@ from fastapi.exceptions import RequestValidationError
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from quant_api.assemble.executor import ExecutorOverloaded, ExecutorTimeout
+
 
 logger = logging.getLogger("default")
 
@@ -34,3 +36,15 @@ async def validation_exception_handler(_: Request, e: RequestValidationError):
     friendly_message = "Check parameter: " + ", ".join(messages)
     content = dict(detail=friendly_message)
     return JSONResponse(status_code=422, content=content)
+
+
+async def executor_overloaded_handler(_: Request, e: ExecutorOverloaded):
+    logger.warning(f"Overloaded => {str(e)}")
+    content = dict(detail="Server is busy, retry later")
+    return JSONResponse(status_code=503, content=content, headers={"Retry-After": "1"})
+
+
+async def executor_timeout_handler(_: Request, e: ExecutorTimeout):
+    logger.warning(f"Timeout => {str(e)}")
+    content = dict(detail=str(e))
+    return JSONResponse(status_code=504, content=content)
@@ -0,0 +1,147 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from quant_api.configs import settings as default_settings
+from quant_api.utils.metrics import collect_timings, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorOverloaded(Exception):
+    """Raised when the worker pool and its queue are full."""
+
+
+class ExecutorTimeout(Exception):
+    """Raised when a job misses its deadline (queue time included)."""
+
+
+def _run_timed(fn: Callable, args: tuple, kwargs: dict):
+    """Run `fn` in the worker and hand its stage timings back to the caller."""
+
+    def run():
+        timings = collect_timings()
+        return fn(*args, **kwargs), timings
+
+    return contextvars.Context().run(run)
+
+
+class StrategyExecutor:
+    """
+    Runs CPU-bound strategy work off the event loop.
+
+    At most `max_workers + max_queue` jobs are accepted at once; beyond that
+    `submit` fails fast with `ExecutorOverloaded` instead of queueing without
+    bound. A job that misses its deadline raises `ExecutorTimeout`; if it had
+    not started yet it is cancelled, otherwise its slot is released when the
+    worker finishes it.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: Optional[int] = None,
+        max_queue: int = 16,
+        timeout: Optional[float] = 60.0,
+    ):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"unknown executor kind : {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self._pool: Optional[Executor] = None
+
+    @classmethod
+    def from_settings(
+        cls, settings=default_settings, kind: Optional[str] = None
+    ) -> "StrategyExecutor":
+        return cls(
+            kind=kind or settings.EXECUTOR_KIND,
+            max_workers=settings.EXECUTOR_MAX_WORKERS or None,
+            max_queue=settings.EXECUTOR_MAX_QUEUE,
+            timeout=settings.EXECUTOR_TIMEOUT or None,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="strategy"
+                )
+        return self._pool
+
+    async def submit(
+        self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs
+    ):
+        """
+        Run `fn(*args, **kwargs)` in the pool and await its result.
+        With a process pool, `fn` and its arguments must be picklable.
+        """
+        if self.in_flight >= self.capacity:
+            raise ExecutorOverloaded(
+                f"{self.in_flight} strategy jobs in flight (capacity {self.capacity})"
+            )
+
+        loop = asyncio.get_running_loop()
+        if metrics.enabled:
+            job = self._get_pool().submit(_run_timed, fn, args, kwargs)
+        else:
+            job = self._get_pool().submit(functools.partial(fn, *args, **kwargs))
+        self.in_flight += 1
+        # released when the worker is done with it, not when the caller gives up
+        job.add_done_callback(functools.partial(self._release_soon, loop))
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+        except asyncio.TimeoutError:
+            raise ExecutorTimeout(f"strategy job exceeded its {timeout}s deadline")
+        if metrics.enabled:
+            result, timings = result
+            # a thread worker already fed this process' histograms
+            metrics.record_stages(timings, observe=self.kind == "process")
+        return result
+
+    def _release_soon(self, loop: asyncio.AbstractEventLoop, _):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:  # loop already closed
+            pass
+
+    def _release(self):
+        self.in_flight -= 1
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+        }
+
+
+executor = StrategyExecutor.from_settings()
+# host tenants live in this process: their runs go to threads
+host_executor = StrategyExecutor.from_settings(kind="thread")
@@ -0,0 +1,183 @@
+import asyncio
+import datetime
+import json
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Set
+
+from sqlalchemy import select
+
+from quant_api import database
+from quant_api.models import QuantJob
+from quant_api.utils.encoder import EnhancedJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED = (
+    "pending",
+    "running",
+    "succeeded",
+    "failed",
+    "cancelled",
+)
+TERMINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobNotFound(Exception):
+    pass
+
+
+class JobManager:
+    """
+    Background quant jobs persisted in the `quant_jobs` table.
+
+    A runner is registered per job kind and awaited as
+    `runner(params, progress)`, where `progress(phase, fraction)` records
+    progress and notifies subscribers. Cancelling a job cancels its task, so
+    the cancellation reaches whatever the runner is awaiting (downloads,
+    executor jobs). Jobs still pending or running when the process stopped
+    are restarted by `recover`.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory or database.async_session
+        self._runners: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._closing = False
+
+    def runner(self, kind: str):
+        def decorator(fn):
+            self._runners[kind] = fn
+            return fn
+
+        return decorator
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if kind not in self._runners:
+            raise ValueError(f"unknown job kind : {kind}")
+        now = datetime.datetime.now()
+        job = QuantJob(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            status=PENDING,
+            progress=0.0,
+            params=json.dumps(params, cls=EnhancedJSONEncoder),
+            created_at=now,
+            updated_at=now,
+        )
+        async with self._session_factory() as session:
+            session.add(job)
+            await session.commit()
+        self._start(job.id, kind, params)
+        return job.to_dict()
+
+    def _start(self, job_id: str, kind: str, params: Dict[str, Any]):
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id, kind, params))
+
+    async def _run(self, job_id: str, kind: str, params: Dict[str, Any]):
+        async def progress(phase: str, fraction: float):
+            await self._update(job_id, phase=phase, progress=fraction)
+
+        try:
+            await self._update(job_id, status=RUNNING, phase=None, progress=0.0)
+            result = await self._runners[kind](params, progress)
+        except asyncio.CancelledError:
+            if not self._closing:  # on shutdown the job stays resumable
+                await self._update(job_id, status=CANCELLED, finished=True)
+            raise
+        except Exception as e:
+            logger.exception(f"job {job_id} failed")
+            await self._update(
+                job_id, status=FAILED, error=f"{type(e).__name__}: {e}", finished=True
+            )
+        else:
+            await self._update(
+                job_id,
+                status=SUCCEEDED,
+                phase="done",
+                progress=1.0,
+                result=json.dumps(result, cls=EnhancedJSONEncoder),
+                finished=True,
+            )
+        finally:
+            self._tasks.pop(job_id, None)
+
+    async def _update(self, job_id: str, finished: bool = False, **values):
+        async with self._session_factory() as session:
+            job = await session.get(QuantJob, job_id)
+            for key, value in values.items():
+                setattr(job, key, value)
+            job.updated_at = datetime.datetime.now()
+            if finished:
+                job.finished_at = job.updated_at
+            await session.commit()
+        state = job.to_dict()
+        for queue in self._listeners.get(job_id, ()):
+            queue.put_nowait(state)
+        return state
+
+    async def get(self, job_id: str) -> QuantJob:
+        async with self._session_factory() as session:
+            job = await session.get(QuantJob, job_id)
+        if job is None:
+            raise JobNotFound(job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> Dict[str, Any]:
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.wait([task])
+        job = await self.get(job_id)
+        if job.status not in TERMINAL:
+            # cancelled before it started, or left over by a process that is gone
+            return await self._update(job_id, status=CANCELLED, finished=True)
+        return job.to_dict()
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job state now and on every change, until it is terminal."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners[job_id].add(queue)
+        try:
+            state = (await self.get(job_id)).to_dict()
+            while True:
+                yield state
+                if state["status"] in TERMINAL:
+                    return
+                state = await queue.get()
+        finally:
+            self._listeners[job_id].discard(queue)
+            if not self._listeners[job_id]:
+                del self._listeners[job_id]
+
+    async def recover(self):
+        """Restart the jobs a previous process left pending or running."""
+        async with self._session_factory() as session:
+            jobs = (
+                await session.scalars(
+                    select(QuantJob).where(QuantJob.status.in_((PENDING, RUNNING)))
+                )
+            ).all()
+        for job in jobs:
+            if job.id in self._tasks:
+                continue
+            if job.kind not in self._runners:
+                await self._update(
+                    job.id, status=FAILED, error="unknown job kind", finished=True
+                )
+                continue
+            logger.info(f"resuming job {job.id} ({job.kind})")
+            self._start(job.id, job.kind, json.loads(job.params))
+
+    async def shutdown(self):
+        self._closing = True
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+job_manager = JobManager()
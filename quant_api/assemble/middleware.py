@@ -1,5 +1,10 @@
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from quant_api.configs import settings
+from quant_api.utils.metrics import collect_timings, metrics, server_timing_header
 
 allow_origins = ["*"]
 allow_methods = ["*"]
@@ -12,3 +17,38 @@ cors_middleware = Middleware(
     allow_headers=allow_headers,
     allow_credentials=True,
 )
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a `Server-Timing` header with the pipeline stages timed while
+    serving the request. Opt-in per request with an `X-Server-Timing` header,
+    or for every request with `always`.
+    """
+
+    def __init__(self, app: ASGIApp, always: bool = False):
+        self.app = app
+        self.always = always
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not metrics.enabled:
+            return await self.app(scope, receive, send)
+        if not self.always and not any(
+            name == b"x-server-timing" for name, _ in scope["headers"]
+        ):
+            return await self.app(scope, receive, send)
+
+        timings = collect_timings()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start" and timings:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing_header(timings))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+server_timing_middleware = Middleware(
+    ServerTimingMiddleware, always=settings.SERVER_TIMING
+)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+
+from quant_api.configs import settings
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.snapshot import (
+    SnapshotError,
+    atomic_write,
+    dump_snapshot,
+    load_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotManager:
+    """
+    Live strategies registered by name, snapshotted to `directory` every
+    `interval` seconds and on shutdown, and restored from there on start.
+
+    The snapshot is taken on the event loop (so it sees a consistent state)
+    and written to disk in a thread.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        interval: Optional[float] = None,
+        include_cache: Optional[bool] = None,
+    ):
+        self.directory = directory or settings.SNAPSHOT_DIR
+        self.interval = settings.SNAPSHOT_INTERVAL if interval is None else interval
+        self.include_cache = (
+            settings.SNAPSHOT_CACHE if include_cache is None else include_cache
+        )
+        self._strategies: Dict[str, MultiAssetCryptoStrategy] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.snap")
+
+    def register(self, name: str, strategy: MultiAssetCryptoStrategy):
+        self._strategies[name] = strategy
+
+    def unregister(self, name: str):
+        self._strategies.pop(name, None)
+
+    def restore(
+        self,
+        name: str,
+        strategy: MultiAssetCryptoStrategy,
+        klines_data: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> Optional[int]:
+        """
+        Load the last snapshot of `name` into `strategy` (see `load_snapshot`);
+        the number of bars replayed, or None when there is no usable
+        snapshot and the strategy needs a full warm-up.
+        """
+        try:
+            with open(self.path(name), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return load_snapshot(strategy, data, klines_data)
+        except SnapshotError as e:
+            logger.warning(f"snapshot of {name} not restored : {e}")
+            return None
+
+    async def save(self, name: str) -> int:
+        data = dump_snapshot(self._strategies[name], self.include_cache)
+        return await asyncio.to_thread(self._write, self.path(name), data)
+
+    def _write(self, path: str, data: bytes) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        return atomic_write(path, data)
+
+    async def save_all(self):
+        for name in list(self._strategies):
+            try:
+                await self.save(name)
+            except Exception:
+                logger.exception(f"snapshot of {name} failed")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save_all()
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the periodic snapshots and take a last one."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.save_all()
+
+
+snapshot_manager = SnapshotManager()
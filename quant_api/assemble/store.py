@@ -0,0 +1,402 @@
+import asyncio
+import datetime
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from quant_api import database
+from quant_api.models import (
+    ClosedPositionRow,
+    StrategyFillRow,
+    StrategyOrderRow,
+    StrategyPositionRow,
+    StrategyRunRow,
+    StrategyTenantRow,
+)
+from quant_api.quant import MultiAssetCryptoStrategy, Order, Position
+from quant_api.quant.ledger import PositionLedger
+from quant_api.utils.encoder import EnhancedJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+SUBMITTED, PENDING = "submitted", "pending"
+
+
+def _db_time(value) -> Optional[datetime.datetime]:
+    """datetime (or numpy / pandas time) for a DateTime column, None for NaT."""
+    if value is None or (isinstance(value, np.datetime64) and np.isnat(value)):
+        return None
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[us]").item()
+    return value
+
+
+def _db_times(values: np.ndarray) -> list:
+    # datetime64[us] converts to datetimes, NaT to None
+    return values.astype("datetime64[us]").tolist()
+
+
+def _db_id(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _trade_id(value: Optional[str]):
+    # integer ids (fill sequences) come back as ints, any other id as stored
+    return int(value) if value is not None and value.isdigit() else value
+
+
+class StateStore:
+    """
+    Strategy state (open and closed positions, pending orders), orders, fills
+    and run results in the database, keyed by a strategy id.
+
+    Writes only queue rows: `record_*` and `save_state` return at once and a
+    background task inserts the queued rows in one transaction per flush,
+    every `flush_interval` seconds or as soon as `batch_size` rows are
+    waiting. State saves replace the previous open positions / pending
+    orders of the strategy (only the last save of a flush is written) and
+    append the positions closed since the previous save. A flush that keeps
+    failing is dropped (and logged) after `max_retries` retries.
+
+    `restore` loads a strategy back with one query per table. Host tenant
+    definitions are written at once (`save_tenant`), not queued.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        flush_interval: float = 1.0,
+        batch_size: int = 5000,
+        max_retries: int = 3,
+    ):
+        self._session_factory = session_factory or database.async_session
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._rows: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        self._states: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        # closed positions already queued, per strategy
+        self._saved_closed: Dict[str, int] = {}
+        self._queued = 0
+        # consecutive failed flushes of the rows kept for retry
+        self._failures = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def _queue(self, model, rows: Iterable[Dict[str, Any]]):
+        rows = list(rows)
+        self._rows[model].extend(rows)
+        self._queued += len(rows)
+        if self._queued >= self.batch_size:
+            self._wake.set()
+
+    def record_orders(
+        self, strategy_id: str, orders: Iterable[Order], status: str = SUBMITTED
+    ):
+        now = datetime.datetime.now()
+        self._queue(
+            StrategyOrderRow,
+            (
+                {
+                    "strategy_id": strategy_id,
+                    "status": status,
+                    "symbol": order.symbol,
+                    "side": order.side,
+                    "size": order.size,
+                    "order_type": order.order_type,
+                    "price": order.price,
+                    "time": _db_time(order.time),
+                    "created_at": now,
+                }
+                for order in orders
+            ),
+        )
+
+    def record_fills(self, strategy_id: str, fills: Iterable[Dict[str, Any]]):
+        """Fills as given to `MultiAssetCryptoStrategy.update_positions`."""
+        self._queue(
+            StrategyFillRow,
+            (
+                {
+                    "strategy_id": strategy_id,
+                    "symbol": fill["symbol"],
+                    "side": fill["side"],
+                    "size": fill["size"],
+                    "price": fill["price"],
+                    "fee": fill.get("fee"),
+                    "trade_id": _db_id(fill.get("trade_id")),
+                    "time": _db_time(fill.get("time")),
+                }
+                for fill in fills
+            ),
+        )
+
+    def record_run(self, strategy_id: str, kind: str, result: Any):
+        self._queue(
+            StrategyRunRow,
+            [
+                {
+                    "strategy_id": strategy_id,
+                    "kind": kind,
+                    "result": json.dumps(result, cls=EnhancedJSONEncoder),
+                    "created_at": datetime.datetime.now(),
+                }
+            ],
+        )
+
+    def save_state(self, strategy_id: str, strategy: MultiAssetCryptoStrategy):
+        """Queue the strategy's positions and pending orders (copied now)."""
+        positions = [
+            {
+                "strategy_id": strategy_id,
+                "symbol": position.symbol,
+                "size": position.size,
+                "entry_price": position.entry_price,
+                "entry_time": _db_time(position.entry_time),
+                "trade_id": _db_id(position.trade_id),
+            }
+            for position in strategy.positions.values()
+        ]
+        now = datetime.datetime.now()
+        pending = [
+            {
+                "strategy_id": strategy_id,
+                "status": PENDING,
+                "symbol": order.symbol,
+                "side": order.side,
+                "size": order.size,
+                "order_type": order.order_type,
+                "price": order.price,
+                "time": _db_time(order.time),
+                "created_at": now,
+            }
+            for order in strategy.pending_orders
+        ]
+        self._states[strategy_id] = {"positions": positions, "pending": pending}
+
+        ledger = strategy.historical_positions
+        start = self._saved_closed.get(strategy_id, 0)
+        if len(ledger) > start:
+            closed = ledger.to_frame(start)
+            columns = {
+                name: (
+                    _db_times(closed[name].to_numpy())
+                    if closed[name].dtype.kind == "M"
+                    else closed[name].astype(object).tolist()
+                )
+                for name in closed.columns
+            }
+            columns["trade_id"] = [_db_id(value) for value in columns["trade_id"]]
+            self._queue(
+                ClosedPositionRow,
+                (
+                    {"strategy_id": strategy_id, **dict(zip(columns, values))}
+                    for values in zip(*columns.values())
+                ),
+            )
+        self._saved_closed[strategy_id] = len(ledger)
+
+    async def flush(self):
+        """Write everything queued so far."""
+        async with self._lock:
+            rows, self._rows = self._rows, defaultdict(list)
+            states, self._states = self._states, {}
+            count, self._queued = self._queued, 0
+            if not count and not states:
+                return
+            try:
+                await self._write(rows, states)
+            except Exception:
+                self._failures += 1
+                if self._failures > self.max_retries:
+                    logger.error(
+                        f"dropping {count} rows and {len(states)} states"
+                        f" after {self._failures} failed flushes"
+                    )
+                    self._failures = 0
+                    self.rows_dropped += count
+                    raise
+                # keep the rows for the next flush, before the ones queued since
+                for model, batch in self._rows.items():
+                    rows[model].extend(batch)
+                self._rows = rows
+                self._states = {**states, **self._states}
+                self._queued += count
+                raise
+            self._failures = 0
+            self.flushes += 1
+            self.rows_written += count
+
+    async def _write(self, rows, states):
+        async with self._session_factory() as session:
+            if states:
+                ids = list(states)
+                await session.execute(
+                    delete(StrategyPositionRow).where(
+                        StrategyPositionRow.strategy_id.in_(ids)
+                    )
+                )
+                await session.execute(
+                    delete(StrategyOrderRow).where(
+                        StrategyOrderRow.strategy_id.in_(ids),
+                        StrategyOrderRow.status == PENDING,
+                    )
+                )
+            for model, key in (
+                (StrategyPositionRow, "positions"),
+                (StrategyOrderRow, "pending"),
+            ):
+                snapshot = [row for state in states.values() for row in state[key]]
+                if snapshot:
+                    await session.execute(insert(model), snapshot)
+            for model, batch in rows.items():
+                if batch:
+                    # executemany: one statement per table
+                    await session.execute(insert(model), batch)
+            await session.commit()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("state store flush failed")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the background task and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def save_tenant(
+        self, tenant_id: str, params: Dict[str, Any], interval: str, window: int
+    ):
+        async with self._session_factory() as session:
+            await session.merge(
+                StrategyTenantRow(
+                    id=tenant_id,
+                    params=json.dumps(params, cls=EnhancedJSONEncoder),
+                    interval=interval,
+                    window=window,
+                    created_at=datetime.datetime.now(),
+                )
+            )
+            await session.commit()
+
+    async def delete_tenant(self, tenant_id: str):
+        async with self._session_factory() as session:
+            await session.execute(
+                delete(StrategyTenantRow).where(StrategyTenantRow.id == tenant_id)
+            )
+            await session.commit()
+
+    async def tenants(self) -> List[Tuple[str, Dict[str, Any], str, int]]:
+        """(tenant_id, params, interval, window) of the saved tenants."""
+        async with self._session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        StrategyTenantRow.id,
+                        StrategyTenantRow.params,
+                        StrategyTenantRow.interval,
+                        StrategyTenantRow.window,
+                    ).order_by(StrategyTenantRow.created_at)
+                )
+            ).all()
+        return [
+            (tenant_id, json.loads(params), interval, window)
+            for tenant_id, params, interval, window in rows
+        ]
+
+    async def restore(
+        self, strategy_id: str, strategy: MultiAssetCryptoStrategy
+    ) -> MultiAssetCryptoStrategy:
+        """
+        Load the last saved positions, closed positions and pending orders of
+        `strategy_id` into `strategy` (replacing its own).
+        """
+        async with self._session_factory() as session:
+            positions = (
+                await session.execute(
+                    select(
+                        StrategyPositionRow.symbol,
+                        StrategyPositionRow.size,
+                        StrategyPositionRow.entry_price,
+                        StrategyPositionRow.entry_time,
+                        StrategyPositionRow.trade_id,
+                    ).where(StrategyPositionRow.strategy_id == strategy_id)
+                )
+            ).all()
+            closed = (
+                await session.execute(
+                    select(
+                        ClosedPositionRow.symbol,
+                        ClosedPositionRow.size,
+                        ClosedPositionRow.entry_price,
+                        ClosedPositionRow.entry_time,
+                        ClosedPositionRow.exit_price,
+                        ClosedPositionRow.exit_time,
+                        ClosedPositionRow.trade_id,
+                    )
+                    .where(ClosedPositionRow.strategy_id == strategy_id)
+                    .order_by(ClosedPositionRow.id)
+                )
+            ).all()
+            pending = (
+                await session.execute(
+                    select(
+                        StrategyOrderRow.symbol,
+                        StrategyOrderRow.side,
+                        StrategyOrderRow.size,
+                        StrategyOrderRow.order_type,
+                        StrategyOrderRow.price,
+                        StrategyOrderRow.time,
+                    )
+                    .where(
+                        StrategyOrderRow.strategy_id == strategy_id,
+                        StrategyOrderRow.status == PENDING,
+                    )
+                    .order_by(StrategyOrderRow.id)
+                )
+            ).all()
+
+        strategy.positions = {
+            symbol: Position(symbol, size, price, time, _trade_id(trade_id))
+            for symbol, size, price, time, trade_id in positions
+        }
+        strategy._entry_highs = {symbol: float("nan") for symbol in strategy.positions}
+        ledger = PositionLedger()
+        if closed:
+            columns = dict(zip(closed[0]._fields, zip(*closed)))
+            columns["trade_id"] = [_trade_id(value) for value in columns["trade_id"]]
+            ledger.extend(**columns)
+        strategy.historical_positions = ledger
+        strategy.pending_orders = [Order(*row) for row in pending]
+        self._saved_closed[strategy_id] = len(ledger)
+        return strategy
+
+
+state_store = StateStore()
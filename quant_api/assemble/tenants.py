@@ -0,0 +1,78 @@
+import logging
+from typing import Any, Dict, Optional
+
+from quant_api.assemble.snapshots import SnapshotManager, snapshot_manager
+from quant_api.assemble.store import StateStore, state_store
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.host import StrategyHost, strategy_host
+
+logger = logging.getLogger(__name__)
+
+
+class TenantManager:
+    """
+    Host tenants that outlive the process.
+
+    Registering a tenant saves its definition and loads back its state: the
+    indicator state from its last snapshot (replayed over the market's
+    frames), then the positions and pending orders last saved under its id.
+    Every evaluation saves the state and the orders of the tenants that ran,
+    and the snapshot manager snapshots them periodically. On start,
+    `recover` registers the saved tenants again.
+    """
+
+    def __init__(
+        self,
+        host: Optional[StrategyHost] = None,
+        store: Optional[StateStore] = None,
+        snapshots: Optional[SnapshotManager] = None,
+    ):
+        self.host = host or strategy_host
+        self.store = store or state_store
+        self.snapshots = snapshots or snapshot_manager
+
+    async def register(
+        self, tenant_id: str, params: Dict[str, Any], interval: str, window: int
+    ) -> MultiAssetCryptoStrategy:
+        strategy = self.host.register(tenant_id, params, interval, window)
+        await self.store.save_tenant(tenant_id, params, interval, window)
+        await self.restore(tenant_id, strategy)
+        return strategy
+
+    async def restore(self, tenant_id: str, strategy: MultiAssetCryptoStrategy):
+        market = self.host.tenants[tenant_id].market
+        klines_data = self.host.snapshots[market].klines_data or None
+        cache = strategy._metric_cache
+        self.snapshots.restore(tenant_id, strategy, klines_data)
+        # keep reading the host's shared cache, not a restored private one
+        strategy._metric_cache = cache
+        self.snapshots.register(tenant_id, strategy)
+        # the saves still queued (a replaced tenant) go first
+        await self.store.flush()
+        await self.store.restore(tenant_id, strategy)
+
+    async def unregister(self, tenant_id: str):
+        self.host.unregister(tenant_id)
+        self.snapshots.unregister(tenant_id)
+        await self.store.delete_tenant(tenant_id)
+
+    def save(self, results: Dict[str, Dict[str, Any]]):
+        """Queue the run, orders and state of the tenants of `evaluate` results."""
+        for tenant_id, result in results.items():
+            self.store.record_run(tenant_id, "tenant_iteration", result)
+            tenant = self.host.tenants.get(tenant_id)
+            if tenant is None or "error" in result:
+                continue
+            self.store.record_orders(tenant_id, result["orders"])
+            self.store.save_state(tenant_id, tenant.strategy)
+
+    async def recover(self):
+        for tenant_id, params, interval, window in await self.store.tenants():
+            try:
+                strategy = self.host.register(tenant_id, params, interval, window)
+                await self.restore(tenant_id, strategy)
+            except Exception:
+                logger.exception(f"tenant {tenant_id} not recovered")
+
+
+tenant_manager = TenantManager()
@@ -1,8 +1,19 @@
 import websockets
 from websockets.exceptions import ConnectionClosed
-from fastapi.websockets import WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocket, WebSocketDisconnect, WebSocketState
 import asyncio
 
+from quant_api.utils.metrics import metrics
+
+
+async def _close(client_ws: WebSocket):
+    # either side may already have closed the client connection
+    if (
+        client_ws.application_state == WebSocketState.CONNECTED
+        and client_ws.client_state == WebSocketState.CONNECTED
+    ):
+        await client_ws.close()
+
 
 async def proxy_websocket(client_ws: WebSocket, server_uri: str):
     """
@@ -19,6 +30,7 @@ async def proxy_websocket(client_ws: WebSocket, server_uri: str):
                         data = await client_ws.receive_text()
                         # 외부 서버로 메시지 전달
                         await server_ws.send(data)
+                        metrics.count_frame("client_to_server")
                 except WebSocketDisconnect:
                     print("Client disconnected")
                     await server_ws.close()
@@ -30,12 +42,13 @@ async def proxy_websocket(client_ws: WebSocket, server_uri: str):
                         data = await server_ws.recv()
                         # 클라이언트로 메시지 전달
                         await client_ws.send_text(data)
+                        metrics.count_frame("server_to_client")
                 except websockets.ConnectionClosed:
                     print("External server disconnected")
-                    await client_ws.close()
+                    await _close(client_ws)
 
             # 양방향 데이터 전달을 동시 실행
             await asyncio.gather(forward_client_to_server(), forward_server_to_client())
     except Exception as e:
         print(f"Error occurred: {e}")
-        await client_ws.close()
+        await _close(client_ws)
@@ -17,6 +17,19 @@ class Settings(BaseSettings):
     )
     BINANCE_MARKET_URL: str = 'https://data.binance.vision'
 
+    EXECUTOR_KIND: str = "process"  # "process" or "thread"
+    EXECUTOR_MAX_WORKERS: int = 0  # 0 = number of cores
+    EXECUTOR_MAX_QUEUE: int = 16  # jobs waiting beyond the busy workers
+    EXECUTOR_TIMEOUT: float = 60.0  # default per-request deadline in seconds
+    JOB_TIMEOUT: float = 3600.0  # compute deadline of background quant jobs
+
+    SNAPSHOT_DIR: str = "/tmp/quant_snapshots"  # strategy state snapshots
+    SNAPSHOT_INTERVAL: float = 60.0  # seconds between snapshots of live strategies
+    SNAPSHOT_CACHE: bool = False  # include the metric caches (larger, slower)
+
+    METRICS_ENABLED: bool = True  # stage timings and counters served at /metrics
+    SERVER_TIMING: bool = False  # Server-Timing on every response, not only on request
+
     INTERVALS: list = ["1s", "1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "6h", "8h", "12h", "1d", "3d", "1w",
                        "1mo"]
     DAILY_INTERVALS: list = ["1s", "1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "6h", "8h", "12h", "1d"]
@@ -0,0 +1,7 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from quant_api.configs import settings
+
+engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URL)
+
+async_session = async_sessionmaker(engine, expire_on_commit=False)
@@ -4,9 +4,122 @@ from typing import Sequence
 
 from pydantic import BaseModel
 from sqlalchemy import Column, select
+from sqlalchemy import DateTime
+from sqlalchemy import Float
 from sqlalchemy import Integer
 from sqlalchemy import String
+from sqlalchemy import Text
 from sqlalchemy import inspect
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+
+class QuantJob(Base):
+    __tablename__ = "quant_jobs"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False, index=True)
+    phase = Column(String(16), nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)
+    params = Column(Text, nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "finished_at": self.finished_at and self.finished_at.isoformat(),
+        }
+
+
+class StrategyPositionRow(Base):
+    """Open position of a strategy (replaced as a whole on every save)."""
+
+    __tablename__ = "strategy_positions"
+
+    strategy_id = Column(String(64), primary_key=True)
+    symbol = Column(String(32), primary_key=True)
+    size = Column(Float, nullable=False)
+    entry_price = Column(Float, nullable=False)
+    entry_time = Column(DateTime, nullable=True)
+    trade_id = Column(String(64), nullable=True)
+
+
+class ClosedPositionRow(Base):
+    __tablename__ = "strategy_closed_positions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    strategy_id = Column(String(64), nullable=False, index=True)
+    symbol = Column(String(32), nullable=False)
+    size = Column(Float, nullable=False)
+    entry_price = Column(Float, nullable=True)
+    entry_time = Column(DateTime, nullable=True)
+    exit_price = Column(Float, nullable=True)
+    exit_time = Column(DateTime, nullable=True)
+    trade_id = Column(String(64), nullable=True)
+
+
+class StrategyOrderRow(Base):
+    """Orders of a strategy; status 'pending' rows are its pending orders."""
+
+    __tablename__ = "strategy_orders"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    strategy_id = Column(String(64), nullable=False, index=True)
+    status = Column(String(16), nullable=False)
+    symbol = Column(String(32), nullable=False)
+    side = Column(String(4), nullable=False)
+    size = Column(Float, nullable=False)
+    order_type = Column(String(8), nullable=False)
+    price = Column(Float, nullable=True)
+    # release time of a scheduled child order
+    time = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+class StrategyFillRow(Base):
+    __tablename__ = "strategy_fills"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    strategy_id = Column(String(64), nullable=False, index=True)
+    symbol = Column(String(32), nullable=False)
+    side = Column(String(4), nullable=False)
+    size = Column(Float, nullable=False)
+    price = Column(Float, nullable=False)
+    fee = Column(Float, nullable=True)
+    trade_id = Column(String(64), nullable=True)
+    time = Column(DateTime, nullable=True)
+
+
+class StrategyRunRow(Base):
+    __tablename__ = "strategy_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    strategy_id = Column(String(64), nullable=False, index=True)
+    kind = Column(String(32), nullable=False)
+    result = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+class StrategyTenantRow(Base):
+    """Host tenant definition, registered again on start."""
+
+    __tablename__ = "strategy_tenants"
+
+    id = Column(String(64), primary_key=True)
+    params = Column(Text, nullable=False)
+    interval = Column(String(8), nullable=False)
+    window = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
@@ -1,26 +1,78 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
-
-@dataclass
+from quant_api.quant import panel as panel_ops
+from quant_api.quant.cache import MetricCache
+from quant_api.quant.graph import GraphContext, default_graph
+from quant_api.quant.indicators import IndicatorEngine
+from quant_api.quant.ledger import PositionLedger
+from quant_api.quant.liquidity import (
+    DEFAULT_BAR_MS,
+    HOUR_MS,
+    LiquidityStats,
+    sqrt_chunks,
+    sqrt_impact,
+)
+from quant_api.quant.market_data import TIME_INDEX, to_ms
+from quant_api.quant.panel import MarketPanel
+from quant_api.quant.risk_index import RiskIndex
+from quant_api.quant.schedule import MODES as SCHEDULE_MODES
+from quant_api.quant.schedule import ExecutionSchedule, ExecutionScheduler
+from quant_api.quant.sizing import MODES as SIZING_MODES, PortfolioSizer
+from quant_api.quant.tail_risk import TailRiskEngine
+from quant_api.utils.frames import buy_mask, taker_volumes
+from quant_api.utils.metrics import metrics
+
+
+# cached metrics kept per symbol: volume_profile, volatility, momentum,
+# risk_index, liquidity and its share of the correlation entries
+CACHED_METRICS = 6
+# position left by a fill, relative to the position, below which it is closed
+# (float residue of chunked or partial fills)
+SIZE_TOLERANCE = 1e-9
+# Monte Carlo paths are drawn from a fixed seed: same inputs, same tail risk
+TAIL_RISK_SEED = 0
+
+
+def _buy_sell_ratio(buy_volume: float, sell_volume: float) -> float:
+    return buy_volume / sell_volume if sell_volume > 0 else 1.0
+
+
+def _ewm(series: pd.Series, span: int, seed: float = None) -> pd.Series:
+    """
+    `series.ewm(span, adjust=False).mean()`, optionally continuing from `seed`,
+    the value of the row just before `series`.
+    """
+    if seed is None:
+        return series.ewm(span=span, adjust=False).mean()
+
+    values = np.concatenate([[seed], series.to_numpy(dtype=np.float64)])
+    continued = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    return pd.Series(continued[1:], index=series.index)
+
+
+@dataclass(slots=True)
 class Position:
     symbol: str
     size: float
     entry_price: float
     entry_time: datetime
-    trade_id: str
+    trade_id: Union[int, str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     symbol: str
     side: str  # 'BUY' or 'SELL'
     size: float
     order_type: str  # 'MARKET' or 'LIMIT'
     price: float = None
+    # release time of a scheduled child order (UTC, naive); None: at once
+    time: datetime = None
 
 
 class MultiAssetCryptoStrategy:
@@ -41,6 +93,17 @@ class MultiAssetCryptoStrategy:
         max_correlation: float = 0.7,
         rsi_period: int = 14,
         rsi_thresholds: Tuple[float, float] = (30, 70),
+        panel_mode: bool = False,
+        correlation_mode: str = "rolling",
+        metric_cache_size: Optional[int] = None,
+        compact: bool = False,
+        volume_source: str = "trades",
+        sizing_mode: str = "heuristic",
+        impact_model: str = "linear",
+        impact_coefficient: float = 1.0,
+        tail_risk_paths: int = 0,
+        execution_schedule: Optional[str] = None,
+        participation: float = 0.1,
     ):
         """
         Initialize the multi-asset cryptocurrency trading quant.
@@ -56,6 +119,49 @@ class MultiAssetCryptoStrategy:
             max_correlation: Maximum allowed correlation between assets
             rsi_period: Period for RSI calculation
             rsi_thresholds: Tuple of (oversold, overbought) RSI levels
+            panel_mode: Compute indicators for all symbols at once on an aligned
+                (time x symbol) panel instead of looping symbol by symbol
+            correlation_mode: 'rolling' keeps the full rolling correlation history
+                (T x N x N), 'latest' only computes the N x N matrix of the last window
+            metric_cache_size: Maximum number of metric results kept between
+                iterations (0 disables the cache). Results are kept per symbol
+                and metric: the default holds every metric of every symbol
+                twice over (CACHED_METRICS per symbol), at least 256
+            compact: With panel_mode, compute the panel indicators in
+                float32, for the compact frames of `quant_api.utils.frames`
+                (window sums still accumulate in float64). Against float64:
+                volatility within 1e-4 relative, RSI within 0.01 points, MACD
+                terms within 1e-6 of the price, momentum score within 1e-4.
+                Without panel_mode it changes nothing: the per-symbol pandas
+                path computes in float64 whatever the frames' dtype
+            volume_source: 'trades' takes the buy/sell volume from the trades,
+                'klines' from the klines taker volume (takerBaseVolume against
+                volume, needs no trades) and adds the ratio over the volume
+                lookback as 'buy_sell_ratio_rolling'
+            sizing_mode: 'heuristic' sizes each symbol from its volatility,
+                mean correlation and volume momentum; 'risk_parity' and
+                'min_variance' solve for the weights on the shrunk covariance
+                of the returns over the correlation lookback (see
+                `quant_api.quant.sizing`), capped by `position_limits`
+                relative to the largest limit
+            impact_model: 'linear' in the order size over the average trade
+                size and the 24-bar volume, or 'sqrt', the square-root law on
+                the daily volume and volatility (see
+                `quant_api.quant.liquidity`), which also sets how many chunks
+                an order is split into
+            impact_coefficient: Scale of the square-root impact, to calibrate
+                against realized execution costs
+            tail_risk_paths: Monte Carlo paths of the tail risk (VaR, CVaR)
+                `calculate_risk_metrics` adds for the open positions; 0 (the
+                default) leaves it out
+            execution_schedule: How the chunks of an order split for its
+                impact are released: None (the default) releases them all at
+                once; 'twap', 'vwap' or 'pov' schedule them one bar apart from
+                the next bar (see `ExecutionScheduler`, the chunk count is the
+                number of slices, stamped in `Order.time`)
+            participation: Share of the expected bar volume a 'pov' child
+                takes; what the chunks' bars cannot absorb goes in a last
+                child the bar after them, so an exit is never cut short
         """
         self.symbols = symbols
         self.leverage = leverage
@@ -67,171 +173,596 @@ class MultiAssetCryptoStrategy:
         self.max_correlation = max_correlation
         self.rsi_period = rsi_period
         self.rsi_thresholds = rsi_thresholds
+        self.panel_mode = panel_mode
+        if correlation_mode not in ("rolling", "latest"):
+            raise ValueError(f"unknown correlation_mode : {correlation_mode}")
+        self.correlation_mode = correlation_mode
+        self.compact = compact
+        if volume_source not in ("trades", "klines"):
+            raise ValueError(f"unknown volume_source : {volume_source}")
+        self.volume_source = volume_source
+        if sizing_mode != "heuristic" and sizing_mode not in SIZING_MODES:
+            raise ValueError(f"unknown sizing_mode : {sizing_mode}")
+        self.sizing_mode = sizing_mode
+        if impact_model not in ("linear", "sqrt"):
+            raise ValueError(f"unknown impact_model : {impact_model}")
+        self.impact_model = impact_model
+        self.impact_coefficient = impact_coefficient
+        if tail_risk_paths < 0:
+            raise ValueError(f"negative tail_risk_paths : {tail_risk_paths}")
+        self.tail_risk_paths = tail_risk_paths
+        if execution_schedule is not None and execution_schedule not in SCHEDULE_MODES:
+            raise ValueError(f"unknown execution_schedule : {execution_schedule}")
+        self.execution_schedule = execution_schedule
+        self.participation = participation
+        self._sizer = None
+        if sizing_mode != "heuristic":
+            limits = np.array([self.position_limits[s] for s in symbols], dtype=float)
+            self._sizer = PortfolioSizer(
+                symbols, sizing_mode, leverage, upper=limits / limits.max()
+            )
 
         # Strategy state
         self.positions: Dict[str, Position] = {}
-        self.historical_positions: List[Position] = []
+        self.historical_positions = PositionLedger()
         self.pending_orders: List[Order] = []
+        # Highest high since entry per open position (incremental risk checks)
+        self._entry_highs: Dict[str, float] = {}
+        # Portfolio VaR / CVaR of the last `calculate_risk_metrics`
+        self.portfolio_risk: Dict[str, float] = {}
 
         # Cache for computed metrics
-        self._metric_cache = {}
+        if metric_cache_size is None:
+            metric_cache_size = max(256, 2 * CACHED_METRICS * len(symbols))
+        self._metric_cache = MetricCache(max_entries=metric_cache_size)
+
+        # Shared intermediate series, evaluated once per iteration
+        self.indicator_graph = default_graph
+        self._graph_context: GraphContext = None
+
+        # Last panel built from klines_data (panel mode)
+        self._panel_cache = None
+
+        # Incremental indicator state for bar-by-bar (live) operation
+        self.indicator_engine = IndicatorEngine(
+            symbols,
+            vol_window=vol_window,
+            rsi_period=rsi_period,
+            lookback_periods=lookback_periods,
+        )
 
+    @metrics.timed("calculate_volume_profile")
     def calculate_volume_profile(
-        self, trades_data: Dict[str, pd.DataFrame], klines_data: Dict[str, pd.DataFrame]
+        self,
+        trades_data: Optional[Dict[str, pd.DataFrame]],
+        klines_data: Dict[str, pd.DataFrame],
     ) -> Dict[str, pd.DataFrame]:
         """
         Calculate volume profile metrics using both trades and klines data.
 
         Args:
-            trades_data: Dictionary of trades DataFrames per symbol
+            trades_data: Dictionary of trades DataFrames per symbol (unused,
+                may be None, with volume_source 'klines')
             klines_data: Dictionary of OHLCV DataFrames per symbol
 
         Returns:
             Dictionary containing volume profiles per symbol
         """
-        volume_profiles = {}
-
-        for symbol in self.symbols:
-            # Get relevant data
-            trades = trades_data[symbol]
-            klines = klines_data[symbol]
+        if self.volume_source == "klines":
+            inputs = {symbol: (klines_data[symbol],) for symbol in self.symbols}
+        else:
+            inputs = {
+                symbol: (klines_data[symbol], trades_data[symbol])
+                for symbol in self.symbols
+            }
+        return self._cached_metrics(
+            "volume_profile",
+            (self.lookback_periods["volume"], self.volume_source),
+            inputs,
+            compute=self._compute_volume_profile,
+            extend=self._extend_volume_profile,
+        )
 
-            # Calculate buy/sell volume ratio from trades
-            buy_volume = trades[trades["side"] == "BUY"]["quantity"].sum()
-            sell_volume = trades[trades["side"] == "SELL"]["quantity"].sum()
-            buy_sell_ratio = buy_volume / sell_volume if sell_volume > 0 else 1.0
+    def _compute_volume_profile(self, inputs):
+        klines_data = {symbol: frames[0] for symbol, frames in inputs.items()}
+        if self.panel_mode:
+            panel = self._get_panel(klines_data, list(inputs))
+            volume_frames = panel.to_frames(
+                panel_ops.volume_momentum(panel, self.lookback_periods["volume"]),
+                index=self._panel_index(klines_data, list(inputs)),
+            )
+            if self.volume_source == "klines":
+                for symbol, frame in volume_frames.items():
+                    frame["buy_sell_ratio_rolling"] = self._rolling_buy_sell_ratio(
+                        klines_data[symbol]
+                    ).to_numpy()
+        else:
+            volume_frames = {
+                symbol: self._volume_momentum_frame(klines)
+                for symbol, klines in klines_data.items()
+            }
 
-            # Calculate volume momentum from klines
-            volume_sma = (
-                klines["volume"].rolling(window=self.lookback_periods["volume"]).mean()
+        results = {}
+        for symbol, frames in inputs.items():
+            # Calculate buy/sell volume ratio from trades (or klines taker volume)
+            buy_volume, sell_volume = self._profile_volumes(frames)
+            volume_profile = volume_frames[symbol]
+            volume_profile.insert(
+                0, "buy_sell_ratio", _buy_sell_ratio(buy_volume, sell_volume)
             )
-            volume_momentum = klines["volume"] / volume_sma
+            results[symbol] = (
+                volume_profile,
+                {"buy_volume": buy_volume, "sell_volume": sell_volume},
+            )
+        return results
+
+    def _extend_volume_profile(self, frames, entry):
+        klines = frames[0]
+        n_klines = entry.lengths[0]
+
+        buy_volume, sell_volume = self._profile_volumes(frames, entry.lengths)
+        buy_volume += entry.state["buy_volume"]
+        sell_volume += entry.state["sell_volume"]
+
+        volume_profile = entry.value.drop(columns="buy_sell_ratio")
+        if len(klines) > n_klines:
+            start = max(n_klines - self.lookback_periods["volume"] + 1, 0)
+            tail = self._volume_momentum_frame(klines.iloc[start:])
+            volume_profile = pd.concat([volume_profile, tail.iloc[n_klines - start :]])
+        volume_profile.insert(
+            0, "buy_sell_ratio", _buy_sell_ratio(buy_volume, sell_volume)
+        )
+        return volume_profile, {"buy_volume": buy_volume, "sell_volume": sell_volume}
+
+    def _profile_volumes(self, frames, lengths=None) -> Tuple[float, float]:
+        """Buy/sell volume of the profile inputs, past `lengths` rows if given."""
+        start = lengths or (0,) * len(frames)
+        if self.volume_source == "klines":
+            buy, sell = taker_volumes(frames[0].iloc[start[0] :])
+            return float(buy.sum()), float(sell.sum())
+        return self._buy_sell_volume(frames[1].iloc[start[1] :])
+
+    def _rolling_buy_sell_ratio(self, klines: pd.DataFrame) -> pd.Series:
+        """Taker buy/sell ratio over the volume lookback (1.0 without sells)."""
+        window = self.lookback_periods["volume"]
+        buy, sell = taker_volumes(klines)
+        buy_sum = buy.rolling(window=window).sum()
+        sell_sum = sell.rolling(window=window).sum()
+        return (buy_sum / sell_sum).mask(sell_sum == 0, 1.0)
+
+    @staticmethod
+    def _buy_sell_volume(trades: pd.DataFrame) -> Tuple[float, float]:
+        is_buy = buy_mask(trades)
+        quantity = trades["quantity"].to_numpy()
+        buy_volume = np.sum(quantity[is_buy], dtype=np.float64)
+        sell_volume = np.sum(quantity[~is_buy], dtype=np.float64)
+        return buy_volume, sell_volume
+
+    def _volume_momentum_frame(self, klines: pd.DataFrame) -> pd.DataFrame:
+        # Calculate volume momentum from klines
+        volume_sma = (
+            klines["volume"].rolling(window=self.lookback_periods["volume"]).mean()
+        )
+        volume_momentum = klines["volume"] / volume_sma
 
-            volume_profiles[symbol] = pd.DataFrame(
-                {
-                    "buy_sell_ratio": buy_sell_ratio,
-                    "volume_momentum": volume_momentum,
-                    "volume_sma": volume_sma,
-                }
+        frame = pd.DataFrame(
+            {
+                "volume_momentum": volume_momentum,
+                "volume_sma": volume_sma,
+            }
+        )
+        if self.volume_source == "klines":
+            frame["buy_sell_ratio_rolling"] = self._rolling_buy_sell_ratio(klines)
+        return frame
+
+    def _get_panel(
+        self, klines_data: Dict[str, pd.DataFrame], symbols: List[str] = None
+    ) -> MarketPanel:
+        """
+        Build (or reuse) the aligned panel for the given klines frames.
+        """
+        symbols = symbols or self.symbols
+        frames = tuple(klines_data[symbol] for symbol in symbols)
+        key = (tuple(symbols), tuple((id(frame), len(frame)) for frame in frames))
+        if self._panel_cache is None or self._panel_cache[0] != key:
+            # keep the frames referenced so their ids stay unique
+            self._panel_cache = (
+                key,
+                frames,
+                MarketPanel.from_klines(
+                    klines_data,
+                    symbols,
+                    dtype=np.float32 if self.compact else np.float64,
+                ),
             )
+        return self._panel_cache[2]
 
-        return volume_profiles
+    def _panel_index(
+        self, klines_data: Dict[str, pd.DataFrame], symbols: List[str] = None
+    ) -> Dict[str, pd.Index]:
+        return {symbol: klines_data[symbol].index for symbol in symbols or self.symbols}
 
+    @metrics.timed("calculate_volatility_metrics")
     def calculate_volatility_metrics(
         self, klines_data: Dict[str, pd.DataFrame]
     ) -> Dict[str, pd.DataFrame]:
         """
         Calculate volatility metrics using OHLCV data.
         """
-        vol_metrics = {}
-
-        for symbol in self.symbols:
-            klines = klines_data[symbol]
-
-            # Calculate returns
-            log_returns = np.log(klines["close"] / klines["close"].shift(1))
-
-            # Calculate historical volatility
-            hist_vol = log_returns.rolling(window=self.vol_window).std() * np.sqrt(
-                24
-            )  # Annualized
-
-            # Calculate Parkinson volatility using high-low prices
-            parkinsons_vol = np.sqrt(
-                (np.log(klines["high"] / klines["low"]) ** 2) / (4 * np.log(2))
-            ).rolling(window=self.vol_window).mean() * np.sqrt(24)
-
-            # Garman-Klass volatility
-            gk_vol = np.sqrt(
-                0.5 * np.log(klines["high"] / klines["low"]) ** 2
-                - (2 * np.log(2) - 1) * np.log(klines["close"] / klines["open"]) ** 2
-            ).rolling(window=self.vol_window).mean() * np.sqrt(24)
+        return self._cached_metrics(
+            "volatility",
+            (self.vol_window,),
+            {symbol: (klines_data[symbol],) for symbol in self.symbols},
+            compute=self._compute_volatility_metrics,
+            extend=self._extend_volatility_metrics,
+        )
 
-            vol_metrics[symbol] = pd.DataFrame(
-                {
-                    "hist_vol": hist_vol,
-                    "parkinsons_vol": parkinsons_vol,
-                    "gk_vol": gk_vol,
-                    "composite_vol": (hist_vol + parkinsons_vol + gk_vol) / 3,
-                }
+    def _compute_volatility_metrics(self, inputs):
+        klines_data = {symbol: frames[0] for symbol, frames in inputs.items()}
+        if self.panel_mode:
+            panel = self._get_panel(klines_data, list(inputs))
+            vol_metrics = panel.to_frames(
+                panel_ops.volatility_metrics(panel, self.vol_window),
+                index=self._panel_index(klines_data, list(inputs)),
             )
+            return {symbol: (frame, {}) for symbol, frame in vol_metrics.items()}
+
+        return {
+            symbol: (self._volatility_frame(klines), {})
+            for symbol, klines in klines_data.items()
+        }
+
+    def _extend_volatility_metrics(self, frames, entry):
+        (klines,) = frames
+        (n_bars,) = entry.lengths
+        start = max(n_bars - self.vol_window, 0)
+        tail = self._volatility_frame(klines.iloc[start:]).iloc[n_bars - start :]
+        return pd.concat([entry.value, tail]), {}
+
+    def _volatility_frame(self, klines: pd.DataFrame) -> pd.DataFrame:
+        # Calculate returns
+        log_returns = self._series("log_return", klines)
+        log_hl = self._series("log_hl", klines)
+
+        # Calculate historical volatility
+        hist_vol = log_returns.rolling(window=self.vol_window).std() * np.sqrt(
+            24
+        )  # Annualized
+
+        # Calculate Parkinson volatility using high-low prices
+        parkinsons_vol = np.sqrt(
+            (log_hl**2) / (4 * np.log(2))
+        ).rolling(window=self.vol_window).mean() * np.sqrt(24)
+
+        # Garman-Klass volatility
+        gk_vol = np.sqrt(
+            0.5 * log_hl**2
+            - (2 * np.log(2) - 1) * self._series("log_co", klines) ** 2
+        ).rolling(window=self.vol_window).mean() * np.sqrt(24)
+
+        return pd.DataFrame(
+            {
+                "hist_vol": hist_vol,
+                "parkinsons_vol": parkinsons_vol,
+                "gk_vol": gk_vol,
+                "composite_vol": (hist_vol + parkinsons_vol + gk_vol) / 3,
+            }
+        )
 
-        return vol_metrics
-
+    @metrics.timed("calculate_correlation_matrix")
     def calculate_correlation_matrix(
         self, klines_data: Dict[str, pd.DataFrame]
     ) -> pd.DataFrame:
         """
         Calculate correlation matrix between assets.
+
+        In 'rolling' mode this is the rolling correlation for every timestamp
+        (MultiIndex of time x symbol). In 'latest' mode only the N x N matrix of
+        the last window is computed, using O(N^2) memory instead of O(T * N^2).
+
+        Returns are aligned on the frames' index: by bar time for time-indexed
+        frames (see `MarketData`), by row position for a RangeIndex.
         """
+        key = tuple(self.symbols)
+        return self._cached_metrics(
+            "correlation",
+            (self.correlation_mode, self.lookback_periods["correlation"]),
+            {key: tuple(klines_data[symbol] for symbol in self.symbols)},
+            compute=self._compute_correlation_matrix,
+            extend=self._extend_correlation_matrix,
+        )[key]
+
+    def _compute_correlation_matrix(self, inputs):
+        ((key, frames),) = inputs.items()
+        window = self.lookback_periods["correlation"]
+        klines_data = dict(zip(self.symbols, frames))
+        if self.correlation_mode == "latest":
+            return {key: (self._latest_correlation_matrix(klines_data, window), {})}
+
+        return {key: (self._rolling_correlation_matrix(klines_data, window), {})}
+
+    def _extend_correlation_matrix(self, frames, entry):
+        n_bars = len(frames[0])
+        cached_bars = entry.lengths[0]
+        if self.correlation_mode == "latest" or any(
+            len(frame) != n_bars for frame in frames
+        ) or any(length != cached_bars for length in entry.lengths) or any(
+            # appended rows must be the same bars for every symbol
+            frame.index[cached_bars - 1] != frames[0].index[cached_bars - 1]
+            or frame.index[-1] != frames[0].index[-1]
+            for frame in frames
+        ):
+            ((_, (value, state)),) = self._compute_correlation_matrix(
+                {None: frames}
+            ).items()
+            return value, state
+
+        # only the windows ending on the appended rows are new
+        window = self.lookback_periods["correlation"]
+        start = max(cached_bars - window, 0)
+        tail = self._rolling_correlation_matrix(
+            {symbol: frame.iloc[start:] for symbol, frame in zip(self.symbols, frames)},
+            window,
+        )
+        new_rows = (n_bars - cached_bars) * len(self.symbols)
+        return pd.concat([entry.value, tail.iloc[len(tail) - new_rows :]]), {}
+
+    def _rolling_correlation_matrix(
+        self, klines_data: Dict[str, pd.DataFrame], window: int
+    ) -> pd.DataFrame:
         returns_dict = {}
 
         for symbol in self.symbols:
-            klines = klines_data[symbol]
-            returns = np.log(klines["close"] / klines["close"].shift(1))
-            returns_dict[symbol] = returns
+            returns_dict[symbol] = self._series("log_return", klines_data[symbol])
 
         returns_df = pd.DataFrame(returns_dict)
-        correlation_matrix = returns_df.rolling(
-            window=self.lookback_periods["correlation"]
-        ).corr()
+        correlation_matrix = returns_df.rolling(window=window).corr()
 
         return correlation_matrix
 
+    def _latest_correlation_matrix(
+        self, klines_data: Dict[str, pd.DataFrame], window: int
+    ) -> pd.DataFrame:
+        """
+        Correlation of the last `window` returns only (same value as the last
+        timestamp of the rolling correlation).
+        """
+        returns_dict = {}
+        for symbol in self.symbols:
+            # aligned on the index like the rolling mode; the last window of
+            # the common axis only holds (some of) each symbol's last rows
+            closes = klines_data[symbol]["close"].iloc[-window - 1 :]
+            returns_dict[symbol] = np.log(closes / closes.shift(1))
+
+        returns_df = pd.DataFrame(returns_dict).iloc[-window:]
+        return returns_df.corr(min_periods=window)
+
+    def _returns_window(
+        self, klines_data: Dict[str, pd.DataFrame], symbols: List[str]
+    ) -> pd.DataFrame:
+        """Log returns of the last correlation window, aligned like the correlation."""
+        return pd.DataFrame(
+            {symbol: self._series("log_return", klines_data[symbol]) for symbol in symbols}
+        ).iloc[-self.lookback_periods["correlation"] :]
+
+    @metrics.timed("calculate_momentum_signals")
     def calculate_momentum_signals(
         self, klines_data: Dict[str, pd.DataFrame]
     ) -> Dict[str, pd.DataFrame]:
         """
         Calculate momentum signals using multiple indicators.
         """
-        momentum_signals = {}
-
-        for symbol in self.symbols:
-            klines = klines_data[symbol]
+        return self._cached_metrics(
+            "momentum",
+            (self.rsi_period, self.lookback_periods["momentum"]),
+            {symbol: (klines_data[symbol],) for symbol in self.symbols},
+            compute=self._compute_momentum_signals,
+            extend=self._extend_momentum_signals,
+        )
 
-            # Calculate RSI
-            delta = klines["close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-
-            # Calculate MACD
-            exp1 = klines["close"].ewm(span=12, adjust=False).mean()
-            exp2 = klines["close"].ewm(span=26, adjust=False).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=9, adjust=False).mean()
-            macd_hist = macd - signal
-
-            # Calculate momentum score
-            momentum_score = (
-                0.4 * (rsi / 100)  # RSI component
-                + 0.3 * (macd_hist / klines["close"])  # MACD component
-                + 0.3
-                * (
-                    klines["close"].pct_change(self.lookback_periods["momentum"])
-                )  # Price momentum
-            )
+    def _compute_momentum_signals(self, inputs):
+        klines_data = {symbol: frames[0] for symbol, frames in inputs.items()}
+        if not self.panel_mode:
+            return {
+                symbol: self._momentum_frame(klines)
+                for symbol, klines in klines_data.items()
+            }
 
-            momentum_signals[symbol] = pd.DataFrame(
+        panel = self._get_panel(klines_data, list(inputs))
+        signals, emas = panel_ops.momentum_signals(
+            panel, self.rsi_period, self.lookback_periods["momentum"], return_ema=True
+        )
+        frames = panel.to_frames(
+            signals, index=self._panel_index(klines_data, list(inputs))
+        )
+        return {
+            symbol: (
+                frames[symbol],
                 {
-                    "rsi": rsi,
-                    "macd": macd,
-                    "macd_hist": macd_hist,
-                    "momentum_score": momentum_score,
-                }
+                    name: values[panel.lengths[j] - 1, j]
+                    for name, values in emas.items()
+                },
             )
+            for j, symbol in enumerate(panel.symbols)
+        }
+
+    def _extend_momentum_signals(self, frames, entry):
+        (klines,) = frames
+        (n_bars,) = entry.lengths
+        start = max(n_bars - max(self.rsi_period, self.lookback_periods["momentum"]), 0)
+        tail, state = self._momentum_frame(
+            klines.iloc[start:], ema_seed=entry.state, skip=n_bars - start
+        )
+        return pd.concat([entry.value, tail]), state
+
+    def _momentum_frame(
+        self, klines: pd.DataFrame, ema_seed: Dict[str, float] = None, skip: int = 0
+    ) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """
+        Momentum signals for `klines.iloc[skip:]`.
+
+        The first `skip` rows only warm the rolling windows; `ema_seed` holds the
+        EWM values of the row before `skip` when continuing a cached result.
+        """
+        ema_seed = ema_seed or {}
+        close = klines["close"].iloc[skip:]
+
+        # Calculate RSI
+        delta = klines["close"].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
+        rs = gain / loss
+        rsi = (100 - (100 / (1 + rs))).iloc[skip:]
+
+        # Calculate MACD
+        exp1 = _ewm(close, 12, ema_seed.get("ema_fast"))
+        exp2 = _ewm(close, 26, ema_seed.get("ema_slow"))
+        macd = exp1 - exp2
+        signal = _ewm(macd, 9, ema_seed.get("macd_signal"))
+        macd_hist = macd - signal
+
+        # Calculate momentum score
+        momentum_score = (
+            0.4 * (rsi / 100)  # RSI component
+            + 0.3 * (macd_hist / close)  # MACD component
+            + 0.3
+            * (
+                klines["close"]
+                .pct_change(self.lookback_periods["momentum"])
+                .iloc[skip:]
+            )  # Price momentum
+        )
+
+        momentum_signals = pd.DataFrame(
+            {
+                "rsi": rsi,
+                "macd": macd,
+                "macd_hist": macd_hist,
+                "momentum_score": momentum_score,
+            }
+        )
+        state = (
+            {
+                "ema_fast": exp1.iloc[-1],
+                "ema_slow": exp2.iloc[-1],
+                "macd_signal": signal.iloc[-1],
+            }
+            if len(close)
+            else dict(ema_seed)
+        )
+        return momentum_signals, state
+
+    def _cached_metrics(self, name, params, inputs, compute, extend):
+        """
+        Serve a metric from `_metric_cache`, extending cached results when the
+        input frames only had rows appended and computing the rest together.
+
+        Args:
+            name: Metric name, part of the cache key
+            params: Parameters the metric depends on, part of the cache key
+            inputs: Input frames per key (usually per symbol)
+            compute: Computes `{key: (value, state)}` for the keys it is given
+            extend: Extends a cache entry to the current frames -> (value, state)
+        """
+        with self.indicator_scope():
+            results = {}
+            missing = {}
+            for key, frames in inputs.items():
+                cache_key = (name, key, params)
+                entry, is_hit = self._metric_cache.lookup(cache_key, frames)
+                if entry is None:
+                    missing[key] = frames
+                elif is_hit:
+                    results[key] = entry.value
+                else:
+                    value, state = extend(frames, entry)
+                    self._metric_cache.store(cache_key, frames, value, state)
+                    results[key] = value
+
+            if missing:
+                for key, (value, state) in compute(missing).items():
+                    self._metric_cache.store(
+                        (name, key, params), missing[key], value, state
+                    )
+                    results[key] = value
+
+            return {key: results[key] for key in inputs}
+
+    @contextmanager
+    def indicator_scope(self):
+        """
+        Share intermediate series (returns, log ranges, spreads) between every
+        metric computed inside the scope. Re-entrant; `run_iteration` opens one
+        for the whole iteration.
+        """
+        if self._graph_context is not None:
+            yield self._graph_context
+            return
+
+        self._graph_context = GraphContext(self.indicator_graph)
+        try:
+            yield self._graph_context
+        finally:
+            self._graph_context = None
+
+    def _series(self, name: str, klines: pd.DataFrame):
+        """
+        Value of an `indicator_graph` node for a klines frame.
+        """
+        if self._graph_context is None:
+            return GraphContext(self.indicator_graph).get(name, klines)
+        return self._graph_context.get(name, klines)
 
-        return momentum_signals
+    def cache_stats(self) -> Dict[str, float]:
+        """
+        Hit/extension/miss/eviction counters of the metric cache.
+        """
+        return self._metric_cache.stats()
 
+    @metrics.timed("calculate_position_sizes")
     def calculate_position_sizes(
         self,
         vol_metrics: Dict[str, pd.DataFrame],
         correlation_matrix: pd.DataFrame,
         volume_profiles: Dict[str, pd.DataFrame],
+        klines_data: Optional[Dict[str, pd.DataFrame]] = None,
     ) -> Dict[str, float]:
         """
         Calculate position sizes based on volatility, correlation, and volume metrics.
+
+        With a solver `sizing_mode` the weights come from the returns of
+        `klines_data` instead (warm-started from the previous call).
+        """
+        if self._sizer is not None:
+            if klines_data is None:
+                raise ValueError(f"sizing_mode {self.sizing_mode} needs klines_data")
+            return self._sizer.solve(
+                self._returns_window(klines_data, self.symbols).to_numpy()
+            )
+
+        return self._position_sizes_from_latest(
+            latest_vol={
+                symbol: vol_metrics[symbol]["composite_vol"].iloc[-1]
+                for symbol in self.symbols
+            },
+            latest_volume_momentum={
+                symbol: volume_profiles[symbol]["volume_momentum"].iloc[-1]
+                for symbol in self.symbols
+            },
+            corr_penalties={
+                symbol: correlation_matrix[symbol].abs().mean()
+                for symbol in self.symbols
+            },
+        )
+
+    def _position_sizes_from_latest(
+        self,
+        latest_vol: Dict[str, float],
+        latest_volume_momentum: Dict[str, float],
+        corr_penalties: Dict[str, float],
+    ) -> Dict[str, float]:
+        """
+        Size positions from the latest scalar metrics of every symbol.
         """
         position_sizes = {}
 
@@ -241,15 +772,15 @@ class MultiAssetCryptoStrategy:
 
         for symbol in self.symbols:
             # Get latest metrics
-            vol = vol_metrics[symbol]["composite_vol"].iloc[-1]
-            volume_momentum = volume_profiles[symbol]["volume_momentum"].iloc[-1]
+            vol = latest_vol[symbol]
+            volume_momentum = latest_volume_momentum[symbol]
 
             # Adjust position limit based on volatility
             vol_adjustment = np.exp(-vol / self.vol_threshold)
             vol_adjusted_limits[symbol] = self.position_limits[symbol] * vol_adjustment
 
             # Apply correlation penalty
-            corr_penalty = correlation_matrix[symbol].abs().mean()
+            corr_penalty = corr_penalties.get(symbol, 0.0)
             if corr_penalty > self.max_correlation:
                 vol_adjusted_limits[symbol] *= 1 - (corr_penalty - self.max_correlation)
 
@@ -268,8 +799,11 @@ class MultiAssetCryptoStrategy:
 
         return position_sizes
 
+    @metrics.timed("generate_signals")
     def generate_signals(
-        self, klines_data: Dict[str, pd.DataFrame], trades_data: Dict[str, pd.DataFrame]
+        self,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]],
     ) -> List[Order]:
         """
         Generate trading signals based on all available data.
@@ -282,16 +816,119 @@ class MultiAssetCryptoStrategy:
 
         # Calculate position sizes
         position_sizes = self.calculate_position_sizes(
-            vol_metrics, correlation_matrix, volume_profiles
+            vol_metrics, correlation_matrix, volume_profiles, klines_data
+        )
+
+        return self._orders_from_latest(
+            latest_momentum={
+                symbol: momentum_signals[symbol]["momentum_score"].iloc[-1]
+                for symbol in self.symbols
+            },
+            latest_rsi={
+                symbol: momentum_signals[symbol]["rsi"].iloc[-1]
+                for symbol in self.symbols
+            },
+            latest_buy_sell_ratio={
+                symbol: volume_profiles[symbol]["buy_sell_ratio"].iloc[-1]
+                for symbol in self.symbols
+            },
+            position_sizes=position_sizes,
         )
 
+    def warm_up(
+        self,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Dict[str, pd.DataFrame] = None,
+    ):
+        """
+        Warm the incremental indicator state from history.
+        """
+        self.indicator_engine.warm(klines_data, trades_data)
+        if trades_data is None and self.volume_source == "klines":
+            for symbol, klines in klines_data.items():
+                if "takerBaseVolume" in klines:
+                    buy, sell = taker_volumes(klines)
+                    self.indicator_engine.add_trades(symbol, buy.sum(), sell.sum())
+
+    def update_bar(self, symbol: str, bar: Dict[str, float]) -> Dict[str, float]:
+        """
+        Consume one closed bar for a symbol in O(1) and return its latest indicators.
+        """
+        latest = self.indicator_engine.update(symbol, bar)
+        self._update_entry_high(symbol, latest["high"])
+        return latest
+
+    def update_bars(self, bars: Dict[str, Dict[str, float]]):
+        """
+        Consume one closed bar for every symbol (steps the correlation window too).
+        """
+        self.indicator_engine.update_all(bars)
+        for symbol in bars:
+            self._update_entry_high(
+                symbol, self.indicator_engine.latest(symbol)["high"]
+            )
+
+    def _update_entry_high(self, symbol: str, high: float):
+        if symbol in self._entry_highs:
+            previous = self._entry_highs[symbol]
+            self._entry_highs[symbol] = high if not previous >= high else previous
+
+    def generate_signals_incremental(
+        self, corr_penalties: Dict[str, float] = None
+    ) -> List[Order]:
+        """
+        Generate trading signals from the incremental indicator state.
+
+        Same rules as `generate_signals`, but reads the latest values kept by
+        `indicator_engine` instead of recomputing them over the full history.
+        Correlation penalties default to the engine's rolling correlation window.
+        """
+        if corr_penalties is None:
+            corr = np.abs(self.indicator_engine.correlation.value)
+            valid = ~np.isnan(corr)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean_abs = np.where(valid, corr, 0.0).sum(axis=0) / valid.sum(axis=0)
+            corr_penalties = dict(zip(self.symbols, mean_abs.tolist()))
+
+        latest = {
+            symbol: self.indicator_engine.latest(symbol) for symbol in self.symbols
+        }
+        if self._sizer is not None:
+            position_sizes = self._sizer.solve(self.indicator_engine.correlation.returns)
+        else:
+            position_sizes = self._position_sizes_from_latest(
+                latest_vol={s: latest[s]["composite_vol"] for s in self.symbols},
+                latest_volume_momentum={
+                    s: latest[s]["volume_momentum"] for s in self.symbols
+                },
+                corr_penalties=corr_penalties,
+            )
+        return self._orders_from_latest(
+            latest_momentum={s: latest[s]["momentum_score"] for s in self.symbols},
+            latest_rsi={s: latest[s]["rsi"] for s in self.symbols},
+            latest_buy_sell_ratio={
+                s: latest[s]["buy_sell_ratio"] for s in self.symbols
+            },
+            position_sizes=position_sizes,
+        )
+
+    def _orders_from_latest(
+        self,
+        latest_momentum: Dict[str, float],
+        latest_rsi: Dict[str, float],
+        latest_buy_sell_ratio: Dict[str, float],
+        position_sizes: Dict[str, float],
+    ) -> List[Order]:
+        """
+        Apply the entry/exit rules to the latest scalar signals of every symbol.
+        """
         # Generate orders
         orders = []
 
         for symbol in self.symbols:
-            momentum = momentum_signals[symbol]["momentum_score"].iloc[-1]
-            rsi = momentum_signals[symbol]["rsi"].iloc[-1]
-            volume_profile = volume_profiles[symbol]
+            momentum = latest_momentum[symbol]
+            rsi = latest_rsi[symbol]
+            buy_sell_ratio = latest_buy_sell_ratio[symbol]
 
             # Current position
             current_position = self.positions.get(symbol)
@@ -303,7 +940,7 @@ class MultiAssetCryptoStrategy:
                 if (
                     rsi < self.rsi_thresholds[0]
                     and momentum < -0.2
-                    and volume_profile["buy_sell_ratio"].iloc[-1] > 1.1
+                    and buy_sell_ratio > 1.1
                 ):
                     orders.append(
                         Order(
@@ -316,7 +953,7 @@ class MultiAssetCryptoStrategy:
                 elif (
                     rsi > self.rsi_thresholds[1]
                     and momentum > 0.2
-                    and volume_profile["buy_sell_ratio"].iloc[-1] < 0.9
+                    and buy_sell_ratio < 0.9
                 ):
                     orders.append(
                         Order(
@@ -331,7 +968,7 @@ class MultiAssetCryptoStrategy:
                 if current_position.size > 0 and (
                     rsi > 60
                     or momentum < -0.1
-                    or volume_profile["buy_sell_ratio"].iloc[-1] < 0.95
+                    or buy_sell_ratio < 0.95
                 ):
                     orders.append(
                         Order(
@@ -344,7 +981,7 @@ class MultiAssetCryptoStrategy:
                 elif current_position.size < 0 and (
                     rsi < 40
                     or momentum > 0.1
-                    or volume_profile["buy_sell_ratio"].iloc[-1] > 1.05
+                    or buy_sell_ratio > 1.05
                 ):
                     orders.append(
                         Order(
@@ -360,50 +997,89 @@ class MultiAssetCryptoStrategy:
     def update_positions(self, fills: List[Dict]):
         """
         Update positions based on order fills.
+
+        A fill may carry its own "time" (e.g. the bar time in a backtest);
+        otherwise the position is stamped with the current time.
         """
         for fill in fills:
             symbol = fill["symbol"]
             size = fill["size"] * (1 if fill["side"] == "BUY" else -1)
             price = fill["price"]
+            fill_time = fill.get("time") or datetime.now()
 
             if symbol in self.positions:
                 # Update existing position
                 current_pos = self.positions[symbol]
                 new_size = current_pos.size + size
 
-                if new_size == 0:
+                if abs(new_size) <= SIZE_TOLERANCE * abs(current_pos.size):
                     # Position closed
-                    self.historical_positions.append(current_pos)
+                    self.historical_positions.append(
+                        symbol=symbol,
+                        size=current_pos.size,
+                        entry_price=current_pos.entry_price,
+                        entry_time=current_pos.entry_time,
+                        exit_price=price,
+                        exit_time=fill_time,
+                        trade_id=current_pos.trade_id,
+                    )
                     del self.positions[symbol]
+                    self._entry_highs.pop(symbol, None)
                 else:
                     # Position modified
                     self.positions[symbol] = Position(
                         symbol=symbol,
                         size=new_size,
                         entry_price=price,
-                        entry_time=datetime.now(),
+                        entry_time=fill_time,
                         trade_id=fill["trade_id"],
                     )
+                    self._entry_highs[symbol] = float("nan")
             else:
                 # New position
                 self.positions[symbol] = Position(
                     symbol=symbol,
                     size=size,
                     entry_price=price,
-                    entry_time=datetime.now(),
+                    entry_time=fill_time,
                     trade_id=fill["trade_id"],
                 )
+                self._entry_highs[symbol] = float("nan")
 
+    @metrics.timed("calculate_risk_metrics")
     def calculate_risk_metrics(
         self, klines_data: Dict[str, pd.DataFrame]
     ) -> Dict[str, Dict[str, float]]:
         """
         Calculate risk metrics for current positions.
+
+        The highest high since entry and the return volatility come from a
+        per-symbol `RiskIndex`, cached and extended with appended bars, so a
+        position costs O(log n) instead of a scan of its history.
+
+        With `tail_risk_paths`, each position also gets its Monte Carlo tail
+        metrics (var, cvar, component_cvar, stress_loss, see
+        `calculate_portfolio_risk`); the portfolio-level ones are kept in
+        `portfolio_risk`.
         """
         risk_metrics = {}
+        tail_risk = {"portfolio": {}, "symbols": {}}
+        if self.positions and self.tail_risk_paths:
+            tail_risk = self.calculate_portfolio_risk(
+                klines_data, n_paths=self.tail_risk_paths
+            )
+        self.portfolio_risk = tail_risk["portfolio"]
+        risk_indexes = self._cached_metrics(
+            "risk_index",
+            (),
+            {symbol: (klines_data[symbol],) for symbol in self.positions},
+            compute=self._compute_risk_index,
+            extend=self._extend_risk_index,
+        )
 
         for symbol, position in self.positions.items():
             klines = klines_data[symbol]
+            risk_index = risk_indexes[symbol]
             current_price = klines["close"].iloc[-1]
 
             # Calculate unrealized PnL
@@ -411,11 +1087,13 @@ class MultiAssetCryptoStrategy:
             unrealized_pnl_pct = (current_price / position.entry_price - 1) * 100
 
             # Calculate drawdown
-            price_high = klines["high"][klines.index >= position.entry_time].max()
+            price_high = risk_index.high_since(
+                self._entry_row(klines, position.entry_time)
+            )
             drawdown = (current_price - price_high) / price_high * 100
 
             # Calculate volatility-adjusted stop loss
-            vol = klines["close"].pct_change().std() * np.sqrt(24)
+            vol = risk_index.return_std() * np.sqrt(24)
             dynamic_stop = position.entry_price * (1 - vol * 2)  # 2 std deviations
 
             risk_metrics[symbol] = {
@@ -424,20 +1102,136 @@ class MultiAssetCryptoStrategy:
                 "drawdown": drawdown,
                 "dynamic_stop": dynamic_stop,
                 "current_price": current_price,
+                **tail_risk["symbols"].get(symbol, {}),
             }
 
         return risk_metrics
 
+    @metrics.timed("calculate_portfolio_risk")
+    def calculate_portfolio_risk(
+        self,
+        klines_data: Dict[str, pd.DataFrame],
+        confidence: float = 0.99,
+        n_paths: int = 10_000,
+        horizon: int = 1,
+        method: str = "cholesky",
+        seed: Optional[int] = TAIL_RISK_SEED,
+    ) -> Dict[str, Dict]:
+        """
+        Monte Carlo VaR / CVaR of the open positions over `horizon` bars (see
+        `TailRiskEngine`), from the log returns of the last correlation
+        lookback window. The 'cholesky' method correlates that window of the
+        position symbols directly (the last matrix of the rolling
+        correlation), whatever the correlation_mode.
+
+        Positions are marked at the last close of their symbol. The paths
+        come from `seed` (None draws new ones on every call).
+        """
+        symbols = [symbol for symbol in self.symbols if symbol in self.positions]
+        returns = self._returns_window(klines_data, symbols)
+        exposures = np.array(
+            [
+                self.positions[symbol].size * klines_data[symbol]["close"].iloc[-1]
+                for symbol in symbols
+            ],
+            dtype=np.float64,
+        )
+
+        correlation = None
+        if method == "cholesky" and symbols:
+            window = self.lookback_periods["correlation"]
+            correlation = returns.corr(min_periods=window).to_numpy(dtype=np.float64)
+
+        engine = TailRiskEngine(
+            n_paths=n_paths,
+            confidence=confidence,
+            horizon=horizon,
+            method=method,
+            seed=seed,
+        )
+        return engine.run(
+            returns.to_numpy(dtype=np.float64), exposures, symbols, correlation
+        )
+
+    @staticmethod
+    def _compute_risk_index(inputs):
+        return {symbol: (RiskIndex(klines), {}) for symbol, (klines,) in inputs.items()}
+
+    @staticmethod
+    def _extend_risk_index(frames, entry):
+        # the index only grows, extending it in place keeps appends O(m log n)
+        return entry.value.extend(frames[0].iloc[entry.lengths[0] :]), {}
+
+    @staticmethod
+    def _entry_row(klines: pd.DataFrame, entry_time: datetime) -> int:
+        """
+        First row at or after `entry_time`, by binary search on a bar time
+        index (`MarketData` epoch ms or DatetimeIndex); 0, the whole history,
+        for frames without bar times.
+        """
+        index = klines.index
+        if isinstance(index, pd.DatetimeIndex):
+            key = pd.Timestamp(entry_time)
+        elif index.name == TIME_INDEX:
+            key = to_ms(entry_time)
+        else:
+            return 0
+        return int(index.searchsorted(key, side="left"))
+
+    @metrics.timed("execute_risk_management")
     def execute_risk_management(
         self,
         klines_data: Dict[str, pd.DataFrame],
         market_impact_threshold: float = 0.02,
+        now: datetime = None,
     ) -> List[Order]:
         """
-        Execute risk management rules and generate risk-based orders.
+        Execute risk management rules and generate risk-based orders, as of
+        `now` (default the current time).
+        """
+        return self._risk_orders(
+            self.calculate_risk_metrics(klines_data), now or datetime.now()
+        )
+
+    def calculate_risk_metrics_incremental(self) -> Dict[str, Dict[str, float]]:
+        """
+        `calculate_risk_metrics` from the incremental state: the highest high
+        since entry and the return volatility are maintained bar by bar.
+        """
+        risk_metrics = {}
+
+        for symbol, position in self.positions.items():
+            latest = self.indicator_engine.latest(symbol)
+            current_price = latest["close"]
+            price_high = self._entry_highs.get(symbol, float("nan"))
+
+            vol = latest["return_std"] * np.sqrt(24)
+            risk_metrics[symbol] = {
+                "unrealized_pnl": (current_price - position.entry_price)
+                * position.size,
+                "unrealized_pnl_pct": (current_price / position.entry_price - 1) * 100,
+                "drawdown": (current_price - price_high) / price_high * 100,
+                "dynamic_stop": position.entry_price * (1 - vol * 2),
+                "current_price": current_price,
+            }
+
+        return risk_metrics
+
+    def execute_risk_management_incremental(self, now: datetime = None) -> List[Order]:
+        """
+        `execute_risk_management` from the incremental state, as of `now`.
+        """
+        return self._risk_orders(
+            self.calculate_risk_metrics_incremental(), now or datetime.now()
+        )
+
+    def _risk_orders(
+        self, risk_metrics: Dict[str, Dict[str, float]], now: datetime
+    ) -> List[Order]:
+        """
+        Apply the stop loss, drawdown and holding period rules.
         """
         risk_orders = []
-        risk_metrics = self.calculate_risk_metrics(klines_data)
 
         for symbol, metrics in risk_metrics.items():
             position = self.positions.get(symbol)
@@ -478,7 +1272,7 @@ class MultiAssetCryptoStrategy:
                 )
 
             # Check position age
-            position_age = (datetime.now() - position.entry_time).days
+            position_age = (now - position.entry_time).days
             if position_age > 5:  # 5-day maximum holding period
                 risk_orders.append(
                     Order(
@@ -499,17 +1293,87 @@ class MultiAssetCryptoStrategy:
     ) -> float:
         """
         Estimate market impact for an order.
+
+        Reads the symbol's cached `LiquidityStats` (see `liquidity_stats`).
         """
-        symbol = order.symbol
-        trades = trades_data[symbol]
-        klines = klines_data[symbol]
+        stats = self.liquidity_stats(trades_data, klines_data, [order.symbol])
+        return self._impact_from_stats(order, stats[order.symbol])
+
+    def _impact_from_stats(self, order: Order, stats: LiquidityStats) -> float:
+        if self.impact_model == "sqrt":
+            return sqrt_impact(
+                order.size,
+                stats.daily_volume,
+                stats.daily_volatility,
+                stats.half_spread,
+                self.impact_coefficient,
+            )
+        return self._market_impact(order, stats.avg_trade_size, stats.recent_volume)
 
-        # Calculate average trade size
-        avg_trade_size = trades["quantity"].mean()
+    def liquidity_stats(
+        self,
+        trades_data: Optional[Dict[str, pd.DataFrame]],
+        klines_data: Dict[str, pd.DataFrame],
+        symbols: Optional[List[str]] = None,
+        full: Optional[bool] = None,
+    ) -> Dict[str, LiquidityStats]:
+        """
+        Per-symbol liquidity statistics, cached and extended with the rows
+        appended to the klines (and trades, with volume_source 'trades').
 
-        # Calculate recent volume
-        recent_volume = klines["volume"].iloc[-24:].sum()  # 24-hour volume
+        `full` statistics (by default with the 'sqrt' impact model only) add
+        the size histogram, hourly volume curve, spread and volatility to the
+        trade size and recent volume the linear model reads.
+        """
+        if full is None:
+            full = self.impact_model == "sqrt"
+        inputs = {}
+        for symbol in symbols or self.symbols:
+            if self.volume_source == "trades" and trades_data is not None:
+                inputs[symbol] = (klines_data[symbol], trades_data[symbol])
+            else:
+                inputs[symbol] = (klines_data[symbol],)
+        return self._cached_metrics(
+            "liquidity",
+            (self.volume_source, full),
+            inputs,
+            compute=lambda missing: {
+                symbol: (LiquidityStats(*frames, full=full), {})
+                for symbol, frames in missing.items()
+            },
+            extend=self._extend_liquidity_stats,
+        )
+
+    @staticmethod
+    def _extend_liquidity_stats(frames, entry):
+        # statistics only accumulate: extend in place with the new rows
+        appended = [frame.iloc[length:] for frame, length in zip(frames, entry.lengths)]
+        return entry.value.extend(*appended), {}
+
+    def _impact_chunks(
+        self,
+        order: Order,
+        daily_volume: float,
+        daily_volatility: float,
+        half_spread: float,
+        max_market_impact: float,
+    ) -> Optional[int]:
+        """Chunks of the square-root model, None for the linear one."""
+        if self.impact_model != "sqrt":
+            return None
+        return sqrt_chunks(
+            order.size,
+            daily_volume,
+            daily_volatility,
+            max_market_impact,
+            half_spread,
+            self.impact_coefficient,
+        )
 
+    @staticmethod
+    def _market_impact(
+        order: Order, avg_trade_size: float, recent_volume: float
+    ) -> float:
         # Estimate market impact
         size_impact = order.size / avg_trade_size
         volume_impact = order.size / recent_volume
@@ -518,6 +1382,7 @@ class MultiAssetCryptoStrategy:
         market_impact = (0.7 * size_impact + 0.3 * volume_impact) * 0.01
         return market_impact
 
+    @metrics.timed("optimize_orders")
     def optimize_order_execution(
         self,
         orders: List[Order],
@@ -528,35 +1393,280 @@ class MultiAssetCryptoStrategy:
         """
         Optimize order execution to minimize market impact.
         """
-        optimized_orders = []
-
-        for order in orders:
-            market_impact = self.calculate_market_impact(
-                order, trades_data, klines_data
+        with self.indicator_scope():
+            optimized_orders = []
+            if not orders:
+                return optimized_orders
+            # one cache lookup for all the orders' symbols
+            liquidity = self.liquidity_stats(
+                trades_data, klines_data, list(dict.fromkeys(o.symbol for o in orders))
             )
 
-            if market_impact > max_market_impact:
-                # Split order into smaller chunks
-                num_chunks = int(market_impact / max_market_impact) + 1
-                chunk_size = order.size / num_chunks
+            scheduled = []  # (order, chunks)
+            for order in orders:
+                stats = liquidity[order.symbol]
+                market_impact = self._impact_from_stats(order, stats)
+                num_chunks = self._impact_chunks(
+                    order,
+                    stats.daily_volume,
+                    stats.daily_volatility,
+                    stats.half_spread,
+                    max_market_impact,
+                )
+                if self.execution_schedule is not None and (
+                    market_impact > max_market_impact
+                ):
+                    chunks = num_chunks or self._linear_chunks(
+                        market_impact, max_market_impact
+                    )
+                    scheduled.append((order, chunks))
+                    continue
+                klines = klines_data[order.symbol]
+                optimized_orders.extend(
+                    self._split_order(
+                        order,
+                        market_impact,
+                        max_market_impact,
+                        lambda i, n, order=order, klines=klines: (
+                            self._calculate_limit_price(order, klines, i, n)
+                        ),
+                        num_chunks,
+                    )
+                )
 
-                for i in range(num_chunks):
-                    optimized_orders.append(
-                        Order(
-                            symbol=order.symbol,
-                            side=order.side,
-                            size=chunk_size,
-                            order_type="LIMIT",
-                            price=self._calculate_limit_price(
-                                order, klines_data[order.symbol], i, num_chunks
-                            ),
-                        )
+            for chunks, parents in self._by_chunks(scheduled).items():
+                bar_ms = self._bar_ms(
+                    self.liquidity_stats(
+                        trades_data,
+                        klines_data,
+                        list(dict.fromkeys(o.symbol for o in parents)),
+                        full=True,
                     )
+                )
+                schedule = self.schedule_order_execution(
+                    parents,
+                    trades_data,
+                    klines_data,
+                    mode=self.execution_schedule,
+                    slices=chunks,
+                    slice_ms=bar_ms,
+                    participation=self.participation,
+                )
+                optimized_orders.extend(self._child_orders(schedule))
+
+        return optimized_orders
+
+    @staticmethod
+    def _linear_chunks(market_impact: float, max_market_impact: float) -> int:
+        return int(market_impact / max_market_impact) + 1
+
+    @staticmethod
+    def _by_chunks(scheduled: List[Tuple[Order, int]]) -> Dict[int, List[Order]]:
+        # one schedule (one slice count) per chunk count
+        groups: Dict[int, List[Order]] = {}
+        for order, chunks in scheduled:
+            groups.setdefault(chunks, []).append(order)
+        return groups
+
+    @staticmethod
+    def _bar_ms(liquidity: Dict[str, LiquidityStats]) -> int:
+        return max(
+            (stats.bar_ms for stats in liquidity.values() if stats.bar_ms),
+            default=DEFAULT_BAR_MS,
+        )
+
+    @staticmethod
+    def _child_orders(schedule: ExecutionSchedule) -> List[Order]:
+        children = schedule.children
+        return [
+            Order(symbol, side, size, "LIMIT", price, time)
+            for symbol, side, size, price, time in zip(
+                children["symbol"].tolist(),
+                children["side"].tolist(),
+                children["size"].tolist(),
+                children["price"].tolist(),
+                children["time"].to_numpy("datetime64[us]").astype(object).tolist(),
+            )
+        ]
+
+    @metrics.timed("schedule_orders")
+    def schedule_order_execution(
+        self,
+        orders: List[Order],
+        trades_data: Optional[Dict[str, pd.DataFrame]],
+        klines_data: Dict[str, pd.DataFrame],
+        mode: str = "vwap",
+        slices: int = 12,
+        slice_ms: int = 5 * 60_000,
+        participation: float = 0.1,
+        start: Optional[int] = None,
+    ) -> ExecutionSchedule:
+        """
+        Spread the orders over `slices` time slices as timestamped LIMIT child
+        orders (see `ExecutionScheduler`), from `start` (epoch ms, default the
+        open of the next bar).
+
+        The intraday volume curves come from the cached `liquidity_stats`,
+        limit prices from the last close and the mean high-low spread. In
+        'pov' mode, what the slices cannot absorb goes in a last child at the
+        end of the horizon.
+        """
+        scheduler = ExecutionScheduler(
+            mode, slices, slice_ms, participation, carry_remainder=True
+        )
+        if not orders:
+            return scheduler.schedule([], [], [], start or 0, {}, {})
+        with self.indicator_scope():
+            symbols = list(dict.fromkeys(order.symbol for order in orders))
+            liquidity = self.liquidity_stats(
+                trades_data, klines_data, symbols, full=True
+            )
+            if start is None:
+                next_bars = [
+                    stats.next_bar_time
+                    for stats in liquidity.values()
+                    if stats.next_bar_time is not None
+                ]
+                now = to_ms(pd.Timestamp.now(tz="UTC"))
+                start = max(next_bars) if next_bars else now
+            return scheduler.schedule(
+                [order.symbol for order in orders],
+                [order.side for order in orders],
+                [order.size for order in orders],
+                start,
+                curves={
+                    symbol: stats.volume_curve for symbol, stats in liquidity.items()
+                },
+                prices={
+                    symbol: klines_data[symbol]["close"].iloc[-1] for symbol in symbols
+                },
+                spreads={
+                    symbol: self._series("hl_spread_mean", klines_data[symbol])
+                    for symbol in symbols
+                },
+            )
+
+    def optimize_order_execution_incremental(
+        self,
+        orders: List[Order],
+        avg_trade_sizes: Dict[str, float],
+        max_market_impact: float = 0.02,
+        now: datetime = None,
+        bar_ms: int = DEFAULT_BAR_MS,
+    ) -> List[Order]:
+        """
+        `optimize_order_execution` from the incremental state: 24-bar volume,
+        mean spread and last close come from `indicator_engine`. Scheduled
+        chunks start at the bar after `now` (the current bar's open time) and
+        expect a flat volume curve at the 24-bar mean.
+        """
+        optimized_orders = []
+        scheduled = []  # (order, chunks)
+
+        for order in orders:
+            latest = self.indicator_engine.latest(order.symbol)
+            num_chunks = None
+            if self.impact_model == "sqrt":
+                # 24 hourly bars: the 24-bar volume is the daily volume
+                liquidity = (
+                    latest["recent_volume"],
+                    latest["return_std"] * np.sqrt(24),
+                    latest["roll_spread"] / 2,
+                )
+                market_impact = sqrt_impact(
+                    order.size, *liquidity, self.impact_coefficient
+                )
+                num_chunks = self._impact_chunks(order, *liquidity, max_market_impact)
             else:
-                optimized_orders.append(order)
+                market_impact = self._market_impact(
+                    order, avg_trade_sizes[order.symbol], latest["recent_volume"]
+                )
+            if self.execution_schedule is not None and (
+                market_impact > max_market_impact
+            ):
+                chunks = num_chunks or self._linear_chunks(
+                    market_impact, max_market_impact
+                )
+                scheduled.append((order, chunks))
+                continue
+            optimized_orders.extend(
+                self._split_order(
+                    order,
+                    market_impact,
+                    max_market_impact,
+                    lambda i, n, order=order, latest=latest: self._limit_price(
+                        order, latest["close"], latest["avg_spread"], i, n
+                    ),
+                    num_chunks,
+                )
+            )
+
+        if scheduled:
+            start = to_ms(now or pd.Timestamp.now(tz="UTC")) + bar_ms
+            latest = {
+                symbol: self.indicator_engine.latest(symbol)
+                for symbol in dict.fromkeys(order.symbol for order, _ in scheduled)
+            }
+            # flat hourly curve: each bar expects the 24-bar mean volume
+            curves = {
+                symbol: np.full(24, values["recent_volume"] / 24 * HOUR_MS / bar_ms)
+                for symbol, values in latest.items()
+            }
+            for chunks, parents in self._by_chunks(scheduled).items():
+                schedule = ExecutionScheduler(
+                    self.execution_schedule,
+                    chunks,
+                    bar_ms,
+                    self.participation,
+                    carry_remainder=True,
+                ).schedule(
+                    [order.symbol for order in parents],
+                    [order.side for order in parents],
+                    [order.size for order in parents],
+                    start,
+                    curves,
+                    prices={symbol: values["close"] for symbol, values in latest.items()},
+                    spreads={
+                        symbol: values["avg_spread"] for symbol, values in latest.items()
+                    },
+                )
+                optimized_orders.extend(self._child_orders(schedule))
 
         return optimized_orders
 
+    @staticmethod
+    def _split_order(
+        order: Order,
+        market_impact: float,
+        max_market_impact: float,
+        limit_price,
+        num_chunks: Optional[int] = None,
+    ) -> List[Order]:
+        """
+        Split an order into LIMIT chunks when its impact is above the limit,
+        into `num_chunks` or as many as the linear model needs.
+        """
+        if not market_impact > max_market_impact:
+            return [order]
+
+        # Split order into smaller chunks
+        if num_chunks is None:
+            num_chunks = MultiAssetCryptoStrategy._linear_chunks(
+                market_impact, max_market_impact
+            )
+        chunk_size = order.size / num_chunks
+
+        return [
+            Order(
+                symbol=order.symbol,
+                side=order.side,
+                size=chunk_size,
+                order_type="LIMIT",
+                price=limit_price(i, num_chunks),
+            )
+            for i in range(num_chunks)
+        ]
+
     def _calculate_limit_price(
         self, order: Order, klines: pd.DataFrame, chunk_index: int, total_chunks: int
     ) -> float:
@@ -564,8 +1674,19 @@ class MultiAssetCryptoStrategy:
         Calculate optimal limit price for order chunk.
         """
         current_price = klines["close"].iloc[-1]
-        avg_spread = (klines["high"] - klines["low"]).mean()
+        avg_spread = self._series("hl_spread_mean", klines)
+        return self._limit_price(
+            order, current_price, avg_spread, chunk_index, total_chunks
+        )
 
+    @staticmethod
+    def _limit_price(
+        order: Order,
+        current_price: float,
+        avg_spread: float,
+        chunk_index: int,
+        total_chunks: int,
+    ) -> float:
         # Calculate price adjustment based on chunk position
         adjustment = (chunk_index / total_chunks) * avg_spread
 
@@ -575,25 +1696,47 @@ class MultiAssetCryptoStrategy:
             return current_price * (1 - adjustment)
 
     def run_iteration(
-        self, klines_data: Dict[str, pd.DataFrame], trades_data: Dict[str, pd.DataFrame]
+        self,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]],
+        now: datetime = None,
     ) -> List[Order]:
         """
         Run a complete iteration of the quant.
         klines_data : Dict[str, pd.DataFrame] = {"symbol_1": klines_df_2, "symbol_2": klines_df_2}
         trades_data : Dict[str, pd.DataFrame] = {"symbol_1": trades_df_2, "symbol_2": trades_df_2}
+            (None with volume_source 'klines')
+        now : the time risk management runs as of (default the current time)
         """
-        # Generate primary trading signals
-        signal_orders = self.generate_signals(klines_data, trades_data)
+        with self.indicator_scope():
+            # Generate primary trading signals
+            signal_orders = self.generate_signals(klines_data, trades_data)
 
-        # Generate risk management orders
-        risk_orders = self.execute_risk_management(klines_data)
+            # Generate risk management orders
+            risk_orders = self.execute_risk_management(klines_data, now=now)
 
-        # Combine all orders
-        all_orders = signal_orders + risk_orders
+            # Combine all orders
+            all_orders = signal_orders + risk_orders
 
-        # Optimize order execution
-        optimized_orders = self.optimize_order_execution(
-            all_orders, trades_data, klines_data
-        )
+            # Optimize order execution
+            optimized_orders = self.optimize_order_execution(
+                all_orders, trades_data, klines_data
+            )
 
         return optimized_orders
+
+    def run_iteration_incremental(
+        self,
+        avg_trade_sizes: Dict[str, float],
+        now: datetime = None,
+        bar_ms: int = DEFAULT_BAR_MS,
+    ) -> List[Order]:
+        """
+        Run a complete iteration from the incremental state (after `update_bars`).
+        Nothing is recomputed over the history, so the cost per bar is constant.
+        """
+        signal_orders = self.generate_signals_incremental()
+        risk_orders = self.execute_risk_management_incremental(now)
+        return self.optimize_order_execution_incremental(
+            signal_orders + risk_orders, avg_trade_sizes, now=now, bar_ms=bar_ms
+        )
@@ -0,0 +1,427 @@
+import bisect
+import math
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant import SIZE_TOLERANCE, MultiAssetCryptoStrategy, Order
+from quant_api.quant.ledger import FillLedger
+from quant_api.quant.panel import MarketPanel
+from quant_api.utils.frames import buy_mask, taker_trades
+
+
+def ms_timestamps(values: Sequence) -> List[datetime]:
+    """Bar open times in epoch ms as datetimes."""
+    times = pd.to_datetime(pd.Series(np.asarray(values)), unit="ms")
+    return [ts.to_pydatetime() for ts in times]
+
+
+def trade_feed(
+    trades_data: Dict[str, pd.DataFrame],
+    symbols: Sequence[str],
+    timestamps: Sequence[datetime],
+) -> Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Cumulative buy/sell volume per symbol at the end of every bar (the start
+    of the next one), or None when the trades have no "time" column.
+    """
+    bar_ends = np.array([ts.timestamp() * 1000 for ts in timestamps[1:]] + [np.inf])
+    feed = {}
+    for symbol in symbols:
+        trades = trades_data[symbol]
+        if "time" not in trades.columns:
+            return None
+        trades = trades.sort_values("time")
+        quantity = trades["quantity"].to_numpy(dtype=np.float64)
+        is_buy = buy_mask(trades)
+        cum_buy = np.concatenate([[0.0], np.cumsum(np.where(is_buy, quantity, 0))])
+        cum_sell = np.concatenate([[0.0], np.cumsum(np.where(is_buy, 0, quantity))])
+        idx = np.searchsorted(
+            trades["time"].to_numpy(dtype=np.float64), bar_ends, side="left"
+        )
+        feed[symbol] = (cum_buy[idx], cum_sell[idx])
+    return feed
+
+
+@dataclass
+class BacktestResult:
+    equity_curve: pd.DataFrame
+    fills: pd.DataFrame
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+class Backtester:
+    """
+    Event-driven replay of a `MultiAssetCryptoStrategy` over historical bars.
+
+    The strategy is warmed on the first `warmup_bars` bars, then every bar is
+    pushed through its incremental state (`update_bars` / `run_iteration_incremental`)
+    so the cost per bar does not grow with the history. Orders generated on a
+    bar are filled against the following bars and fed back through
+    `update_positions`:
+
+    - MARKET orders fill at the next bar's open, adjusted by `slippage`.
+    - LIMIT orders fill at the first of the next `limit_ttl` bars whose range
+      crosses the limit price (at the open if it gaps through), else expire.
+    - Scheduled child orders (with a `time`, see `execution_schedule`) are
+      released on the first bar opening at or after it; their TTL counts
+      from there.
+    - Exit orders of a bar (signal, stop, drawdown, age) are merged per symbol
+      and capped at the position left after the orders still working; a
+      MARKET exit replaces the working exits of its symbol. New entries wait
+      until the working orders of their symbol filled or expired.
+
+    Sizes are base-asset quantities. When the trades frames carry a "time"
+    column (epoch ms) and bar timestamps are known, trades feed the buy/sell
+    ratio up to the end of each bar; otherwise the whole trades frames are
+    used from the start. With a strategy on volume_source 'klines' and no
+    trades, the klines taker volume feeds the ratio bar by bar instead.
+
+    `avg_trade_sizes` overrides the per-symbol average trade size of the
+    market impact estimate (by default the mean trade quantity, or volume
+    over trade count of the klines). A precomputed `trade_feed` (see
+    `trade_feed`) replaces the trades altogether.
+
+    Fills are kept in a columnar `FillLedger` (trade ids are the fill
+    sequence numbers) and positions are marked to market once, over all
+    bars, after the replay.
+    """
+
+    def __init__(
+        self,
+        strategy: MultiAssetCryptoStrategy,
+        klines_data: Union[Dict[str, pd.DataFrame], MarketPanel],
+        trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+        initial_cash: float = 100000.0,
+        fee_rate: float = 0.001,
+        slippage: float = 0.0,
+        limit_ttl: int = 1,
+        warmup_bars: Optional[int] = None,
+        timestamps: Optional[Sequence] = None,
+        bar_interval: timedelta = timedelta(minutes=1),
+        avg_trade_sizes: Optional[Dict[str, float]] = None,
+        trade_feed: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+    ):
+        self.strategy = strategy
+        self.symbols = list(strategy.symbols)
+        if isinstance(klines_data, MarketPanel):
+            # already aligned (e.g. views over shared memory), used as is
+            if list(klines_data.symbols) != self.symbols:
+                raise ValueError("panel symbols do not match the strategy symbols")
+            self.panel = klines_data
+            klines_data = {}
+        else:
+            self.panel = MarketPanel.from_klines(klines_data, self.symbols)
+        self.trades_data = trades_data
+        self.trade_feed = trade_feed
+        self.initial_cash = initial_cash
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.limit_ttl = limit_ttl
+
+        n_bars = self.panel.shape[0]
+        lookbacks = strategy.lookback_periods
+        self.warmup_bars = min(
+            warmup_bars
+            if warmup_bars is not None
+            else max(lookbacks.get("correlation", 168), strategy.vol_window, 26) + 1,
+            n_bars,
+        )
+        self.timestamps = self._timestamps(klines_data, timestamps, bar_interval)
+        steps = np.diff([ts.timestamp() for ts in self.timestamps])
+        self.bar_ms = (
+            int(np.median(steps) * 1000)
+            if len(steps)
+            else int(bar_interval.total_seconds() * 1000)
+        )
+        if (
+            trades_data is None
+            and strategy.volume_source == "klines"
+            and klines_data
+            and all("takerBaseVolume" in klines for klines in klines_data.values())
+        ):
+            bar_starts = [ts.timestamp() * 1000 for ts in self.timestamps]
+            self.trades_data = {
+                symbol: taker_trades(klines_data[symbol], bar_starts)
+                for symbol in self.symbols
+            }
+        self.avg_trade_sizes = avg_trade_sizes or self._avg_trade_sizes(
+            klines_data, trades_data
+        )
+
+    def _timestamps(self, klines_data, timestamps, bar_interval) -> List[datetime]:
+        n_bars = self.panel.shape[0]
+        if timestamps is not None:
+            return ms_timestamps(timestamps)
+        index = klines_data[self.symbols[0]].index if klines_data else None
+        if isinstance(index, pd.DatetimeIndex) and len(index) == n_bars:
+            return [ts.to_pydatetime() for ts in index]
+        start = datetime(1970, 1, 1)
+        return [start + i * bar_interval for i in range(n_bars)]
+
+    def _avg_trade_sizes(self, klines_data, trades_data) -> Dict[str, float]:
+        if self.strategy.volume_source == "klines":
+            trades_data = None  # at most one trade per side and bar, see taker_trades
+        sizes = {}
+        for symbol in self.symbols:
+            klines = klines_data.get(symbol)
+            if trades_data is not None and len(trades_data[symbol]):
+                sizes[symbol] = trades_data[symbol]["quantity"].mean()
+            elif klines is not None and "count" in klines and klines["count"].sum() > 0:
+                sizes[symbol] = klines["volume"].sum() / klines["count"].sum()
+            else:
+                sizes[symbol] = float("nan")
+        return sizes
+
+    def _trade_feed(self):
+        if self.trade_feed is not None:
+            return self.trade_feed
+        if self.trades_data is None:
+            return None
+        return trade_feed(self.trades_data, self.symbols, self.timestamps)
+
+    def run(self) -> BacktestResult:
+        strategy = self.strategy
+        panel = self.panel
+        n_bars = panel.shape[0]
+        warmup = self.warmup_bars
+        trade_feed = self._trade_feed()
+
+        history = {
+            symbol: pd.DataFrame(
+                {
+                    field_name: getattr(panel, field_name)[:warmup, j]
+                    for field_name in ("open", "high", "low", "close", "volume")
+                }
+            )
+            for j, symbol in enumerate(self.symbols)
+        }
+        strategy.warm_up(history, None if trade_feed else self.trades_data)
+        if trade_feed and warmup:
+            for symbol, (cum_buy, cum_sell) in trade_feed.items():
+                strategy.indicator_engine.add_trades(
+                    symbol, cum_buy[warmup - 1], cum_sell[warmup - 1]
+                )
+
+        opens, highs, lows = panel.open.tolist(), panel.high.tolist(), panel.low.tolist()
+        closes, volumes = panel.close.tolist(), panel.volume.tolist()
+        column = {symbol: j for j, symbol in enumerate(self.symbols)}
+
+        cash = self.initial_cash
+        total_fees = 0.0
+        pending: List[tuple] = []  # (order, last bar it may fill on)
+        fills_log = FillLedger()
+        for symbol in self.symbols:
+            fills_log.code("symbol", symbol)
+        fill_bars: List[int] = []
+        n_orders = 0
+        cash_path = np.full(n_bars, np.nan)
+
+        for t in range(warmup, n_bars):
+            now = self.timestamps[t]
+
+            # Fill orders from previous bars against this bar
+            fills = []
+            still_pending = []
+            for order, expires in pending:
+                j = column[order.symbol]
+                open_, high, low = opens[t][j], highs[t][j], lows[t][j]
+                price = None
+                if order.time is not None and order.time > now:
+                    pass  # scheduled for a later bar
+                elif open_ != open_:
+                    pass  # no bar for this symbol, keep waiting
+                elif order.order_type == "MARKET":
+                    sign = 1 if order.side == "BUY" else -1
+                    price = open_ * (1 + sign * self.slippage)
+                elif order.side == "BUY" and low <= order.price:
+                    price = min(order.price, open_)
+                elif order.side == "SELL" and high >= order.price:
+                    price = max(order.price, open_)
+
+                if price is None:
+                    if expires > t:
+                        still_pending.append((order, expires))
+                    continue
+
+                fee = abs(order.size * price) * self.fee_rate
+                signed = order.size if order.side == "BUY" else -order.size
+                cash -= signed * price + fee
+                total_fees += fee
+                fills.append(
+                    {
+                        "symbol": order.symbol,
+                        "side": order.side,
+                        "size": order.size,
+                        "price": price,
+                        "fee": fee,
+                        "order_type": order.order_type,
+                        "trade_id": len(fills_log) + len(fills),
+                        "time": now,
+                    }
+                )
+            pending = still_pending
+            if fills:
+                strategy.update_positions(fills)
+                for fill in fills:
+                    fills_log.append(**fill)
+                fill_bars.extend([t] * len(fills))
+
+            # Advance the incremental state by one bar
+            bars = {}
+            for symbol, j in column.items():
+                close = closes[t][j]
+                if close == close:
+                    bars[symbol] = {
+                        "open": opens[t][j],
+                        "high": highs[t][j],
+                        "low": lows[t][j],
+                        "close": close,
+                        "volume": volumes[t][j],
+                    }
+            strategy.update_bars(bars)
+            if trade_feed:
+                for symbol, (cum_buy, cum_sell) in trade_feed.items():
+                    strategy.indicator_engine.add_trades(
+                        symbol,
+                        cum_buy[t] - cum_buy[t - 1],
+                        cum_sell[t] - cum_sell[t - 1],
+                    )
+
+            # New orders, filled from the next bar on
+            orders: List[Order] = strategy.run_iteration_incremental(
+                self.avg_trade_sizes, now=now, bar_ms=self.bar_ms
+            )
+            n_orders += len(orders)
+            pending = self._queue(
+                [
+                    order
+                    for order in orders
+                    if order.size > 0
+                    and (order.order_type == "MARKET" or order.price > 0)
+                ],
+                pending,
+                t,
+            )
+
+            cash_path[t] = cash
+
+        value, gross = self._mark_to_market(fills_log, np.asarray(fill_bars))
+        equity = cash_path + value
+        exposure = np.where(np.isnan(cash_path), np.nan, gross)
+        equity_curve = pd.DataFrame(
+            {
+                "time": self.timestamps[warmup:],
+                "equity": equity[warmup:],
+                "exposure": exposure[warmup:],
+            }
+        )
+        fills = fills_log.to_frame()
+        return BacktestResult(
+            equity_curve=equity_curve,
+            fills=fills,
+            stats=self._stats(equity_curve, total_fees, len(fills), n_orders),
+        )
+
+    def _queue(self, orders: List[Order], pending: List[tuple], t: int) -> List[tuple]:
+        """Working orders after queuing the orders generated on bar `t`."""
+        by_symbol: Dict[str, List[Order]] = {}
+        for order in orders:
+            by_symbol.setdefault(order.symbol, []).append(order)
+
+        queued = []
+        for symbol, new in by_symbol.items():
+            position = self.strategy.positions.get(symbol)
+            held = position.size if position is not None else 0.0
+            working = [entry for entry in pending if entry[0].symbol == symbol]
+            exits = [
+                order for order in new if held and (order.side == "BUY") != (held > 0)
+            ]
+            if not exits:
+                # entries (and adds) do not stack on working orders
+                if not working:
+                    queued.extend(self._expiring(order, t) for order in new)
+                continue
+
+            market = [order for order in exits if order.order_type == "MARKET"]
+            if market:
+                # cancel / replace: one MARKET exit for the whole position
+                pending = [entry for entry in pending if entry[0].symbol != symbol]
+                working = []
+                exits = [
+                    Order(symbol, market[0].side, sum(o.size for o in market), "MARKET")
+                ]
+            remaining = held + sum(
+                order.size if order.side == "BUY" else -order.size
+                for order, _ in working
+            )
+            for order in exits:
+                size = min(order.size, abs(remaining)) if remaining * held > 0 else 0.0
+                if size <= SIZE_TOLERANCE * abs(held):
+                    continue
+                if size < order.size:
+                    order = replace(order, size=size)
+                remaining += size if order.side == "BUY" else -size
+                queued.append(self._expiring(order, t))
+        return pending + queued
+
+    def _expiring(self, order: Order, t: int) -> tuple:
+        if order.time is not None:
+            # the bar it is released on stands for the next bar of `t`
+            t = max(bisect.bisect_left(self.timestamps, order.time), t + 1) - 1
+        return order, t + (self.limit_ttl if order.order_type == "LIMIT" else 1)
+
+    def _mark_to_market(self, fills: FillLedger, fill_bars: np.ndarray):
+        """
+        Marked value and gross exposure of the positions at the end of every
+        bar: holdings (running sum of the signed fill sizes, per symbol in
+        fill order) times the last close seen since the warm-up.
+        """
+        n_bars = self.panel.shape[0]
+        holdings = np.zeros((n_bars, len(self.symbols)))
+        symbols, signed = fills.column("symbol"), fills.signed_sizes()
+        for j in range(len(self.symbols)):
+            mine = symbols == j
+            if not mine.any():
+                continue
+            running = np.concatenate([[0.0], np.cumsum(signed[mine])])
+            last_fill = np.searchsorted(fill_bars[mine], np.arange(n_bars), side="right")
+            holdings[:, j] = running[last_fill]
+
+        last_close = np.full((n_bars, len(self.symbols)), np.nan)
+        last_close[self.warmup_bars :] = (
+            pd.DataFrame(self.panel.close[self.warmup_bars :]).ffill().to_numpy()
+        )
+        marked = np.where(np.isnan(last_close), 0.0, holdings * last_close)
+        return marked.sum(axis=1), np.abs(marked).sum(axis=1)
+
+    def _stats(
+        self, equity_curve: pd.DataFrame, total_fees: float, n_fills: int, n_orders: int
+    ) -> Dict[str, float]:
+        equity = equity_curve["equity"]
+        final_equity = equity.iloc[-1] if len(equity) else self.initial_cash
+        returns = equity.pct_change().dropna()
+        running_max = equity.cummax()
+        drawdown = ((equity - running_max) / running_max).min() if len(equity) else 0.0
+
+        sharpe = float("nan")
+        if len(returns) > 1 and returns.std() > 0:
+            spacing = pd.Series(equity_curve["time"]).diff().median()
+            periods_per_year = timedelta(days=365) / spacing if spacing else math.nan
+            sharpe = returns.mean() / returns.std() * math.sqrt(periods_per_year)
+
+        return {
+            "bars": len(equity),
+            "initial_cash": float(self.initial_cash),
+            "final_equity": float(final_equity),
+            "total_return": float(final_equity / self.initial_cash - 1),
+            "pnl": float(final_equity - self.initial_cash),
+            "total_fees": float(total_fees),
+            "orders": n_orders,
+            "fills": n_fills,
+            "max_drawdown": float(drawdown),
+            "sharpe": float(sharpe),
+        }
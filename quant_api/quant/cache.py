@@ -0,0 +1,141 @@
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from quant_api.quant.market_data import TIME_INDEX
+
+# (number of rows, last timestamp, checksum of the last row)
+Fingerprint = Tuple[int, Any, int]
+
+
+def frame_fingerprint(frame: pd.DataFrame, length: int = None) -> Fingerprint:
+    """
+    Cheap fingerprint of the first `length` rows of a frame.
+
+    Only the last row is looked at, so appending rows keeps the fingerprint of
+    the old prefix valid while any change of the last row invalidates it.
+    """
+    length = len(frame) if length is None else length
+    if length == 0:
+        return (0, None, 0)
+
+    row = frame.iloc[length - 1]
+    # strategy layout (MarketData): bar times in the index, "open" is a price
+    index = frame.index
+    if isinstance(index, pd.DatetimeIndex) or index.name == TIME_INDEX:
+        timestamp = index[length - 1]
+    elif "open" in frame.columns:
+        timestamp = row["open"]
+    else:
+        timestamp = index[length - 1]
+    # repr keeps NaN stable (hash(nan) is identity based), crc32 keeps the
+    # fingerprint stable across processes (str hashes are salted), so cached
+    # entries survive a snapshot / restore
+    return (length, timestamp, zlib.crc32(repr(row.tolist()).encode()))
+
+
+@dataclass
+class CacheEntry:
+    fingerprints: Tuple[Fingerprint, ...]
+    value: Any
+    # whatever the metric needs to extend `value` with appended rows
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def lengths(self) -> Tuple[int, ...]:
+        return tuple(fp[0] for fp in self.fingerprints)
+
+
+class MetricCache:
+    """
+    Bounded LRU cache of metric results keyed by (metric, symbol, parameters).
+
+    Entries remember the fingerprints of the frames they were computed from.
+    `lookup` returns an entry when the inputs are unchanged (hit) or when rows
+    were only appended to them (extension); the caller then only computes the
+    new rows. Cached values are shared, treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.extensions = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def lookup(
+        self, key: Hashable, frames: Sequence[pd.DataFrame]
+    ) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        Returns:
+            (entry, is_hit): `(entry, True)` for unchanged inputs, `(entry, False)`
+            when every frame only grew by appended rows, `(None, False)` otherwise.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            current = tuple(frame_fingerprint(frame) for frame in frames)
+            if current == entry.fingerprints:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, True
+
+            if len(current) == len(entry.fingerprints) and all(
+                fp[0] <= len(frame) and frame_fingerprint(frame, fp[0]) == fp
+                for frame, fp in zip(frames, entry.fingerprints)
+            ):
+                self._entries.move_to_end(key)
+                self.extensions += 1
+                return entry, False
+
+            del self._entries[key]
+
+        self.misses += 1
+        return None, False
+
+    def store(
+        self,
+        key: Hashable,
+        frames: Sequence[pd.DataFrame],
+        value: Any,
+        state: Dict[str, Any] = None,
+    ) -> CacheEntry:
+        if self.max_entries <= 0:
+            # disabled: nothing will be looked up, skip the fingerprints
+            return CacheEntry(fingerprints=(), value=value, state=state or {})
+
+        entry = CacheEntry(
+            fingerprints=tuple(frame_fingerprint(frame) for frame in frames),
+            value=value,
+            state=state or {},
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.extensions + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "extensions": self.extensions,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.extensions) / lookups if lookups else 0.0,
+        }
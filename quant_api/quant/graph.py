@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    name: str
+    deps: Tuple[str, ...]
+    fn: Callable[..., Any]
+
+
+class IndicatorGraph:
+    """
+    Registry of named intermediate series derived from a klines frame.
+
+    A node is a function of the frame and of the nodes it depends on:
+
+        @default_graph.register("log_hl")
+        def log_hl(klines):
+            return np.log(klines["high"] / klines["low"])
+
+        @default_graph.register("parkinsons_term", deps=("log_hl",))
+        def parkinsons_term(klines, log_hl):
+            return np.sqrt(log_hl**2 / (4 * np.log(2)))
+
+    Values are evaluated lazily through a `GraphContext`, once per frame.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, IndicatorNode] = {}
+
+    def register(self, name: str, deps: Tuple[str, ...] = ()):
+        def decorator(fn):
+            unknown = [dep for dep in deps if dep not in self._nodes]
+            if unknown:
+                raise ValueError(f"{name} depends on unregistered nodes : {unknown}")
+            self._nodes[name] = IndicatorNode(name=name, deps=tuple(deps), fn=fn)
+            return fn
+
+        return decorator
+
+    def __contains__(self, name: str):
+        return name in self._nodes
+
+    def __getitem__(self, name: str) -> IndicatorNode:
+        try:
+            return self._nodes[name]
+        except KeyError:
+            raise KeyError(f"unknown indicator : {name}") from None
+
+    @property
+    def names(self):
+        return list(self._nodes)
+
+
+class GraphContext:
+    """
+    Memo of evaluated nodes, shared by every consumer within one iteration.
+    """
+
+    def __init__(self, graph: IndicatorGraph):
+        self.graph = graph
+        # (node, id(frame)) -> value; frames are kept alive so ids stay unique
+        self._values: Dict[Tuple[str, int], Any] = {}
+        self._frames: Dict[int, pd.DataFrame] = {}
+        self.evaluations = 0
+
+    def get(self, name: str, klines: pd.DataFrame):
+        key = (name, id(klines))
+        if key not in self._values:
+            node = self.graph[name]
+            deps = [self.get(dep, klines) for dep in node.deps]
+            self._frames[id(klines)] = klines
+            self._values[key] = node.fn(klines, *deps)
+            self.evaluations += 1
+        return self._values[key]
+
+    def __len__(self):
+        return len(self._values)
+
+
+default_graph = IndicatorGraph()
+
+
+@default_graph.register("log_return")
+def log_return(klines):
+    return np.log(klines["close"] / klines["close"].shift(1))
+
+
+@default_graph.register("simple_return")
+def simple_return(klines):
+    return klines["close"].pct_change()
+
+
+@default_graph.register("simple_return_std", deps=("simple_return",))
+def simple_return_std(klines, simple_return):
+    return simple_return.std()
+
+
+@default_graph.register("log_hl")
+def log_hl(klines):
+    return np.log(klines["high"] / klines["low"])
+
+
+@default_graph.register("log_co")
+def log_co(klines):
+    return np.log(klines["close"] / klines["open"])
+
+
+@default_graph.register("hl_spread")
+def hl_spread(klines):
+    return klines["high"] - klines["low"]
+
+
+@default_graph.register("hl_spread_mean", deps=("hl_spread",))
+def hl_spread_mean(klines, hl_spread):
+    return hl_spread.mean()
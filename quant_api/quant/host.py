@@ -0,0 +1,198 @@
+"""
+Many strategy instances ("tenants") evaluated against one shared, read-only
+market snapshot per (interval, window).
+
+Tenants of a market share:
+
+- the frames: one klines (and trades) frame per symbol, whatever the number
+  of tenants reading it, fetched once for the union of their symbols;
+- the metric cache: one `MetricCache` per market and numeric mode
+  (panel_mode, compact), so a metric with the same parameters on the same
+  symbol is computed (or extended) once per snapshot and read by every
+  tenant asking for it. Caches are not thread-safe: runs of a market are
+  serialized, runs of different markets never share a cache;
+- the intermediate series: one `GraphContext` per evaluation.
+
+Each tenant keeps its own positions and pending orders. Cached values and
+snapshot frames are shared: treat them as read-only. `run` updates and
+evaluates a market under its lock, so a run still going in a worker thread
+(after its caller gave up) never overlaps the next one.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.cache import MetricCache
+from quant_api.quant.graph import GraphContext
+
+logger = logging.getLogger(__name__)
+
+# (interval, window)
+MarketKey = Tuple[str, int]
+
+
+@dataclass
+class MarketSnapshot:
+    klines_data: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    trades_data: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    # bumped on every update
+    version: int = 0
+    updated_at: Optional[float] = None
+
+
+@dataclass
+class Tenant:
+    strategy: MultiAssetCryptoStrategy
+    market: MarketKey
+
+
+class StrategyHost:
+    """
+    Registry of tenants grouped by market. Feed each market its frames with
+    `update` (the symbols to fetch are `symbols(market)`), then `evaluate`
+    runs one iteration of every tenant of the market over them.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self.tenants: Dict[str, Tenant] = {}
+        self.snapshots: Dict[MarketKey, MarketSnapshot] = {}
+        self._caches: Dict[Tuple[MarketKey, bool, bool], MetricCache] = {}
+        self._locks: Dict[MarketKey, threading.Lock] = {}
+
+    def _cache(
+        self, strategy: MultiAssetCryptoStrategy, market: MarketKey
+    ) -> MetricCache:
+        # panel / compact computations differ numerically: separate caches
+        # (compact only changes the computation in panel mode)
+        key = (market, strategy.panel_mode, strategy.compact and strategy.panel_mode)
+        if key not in self._caches:
+            self._caches[key] = MetricCache(max_entries=self.cache_size)
+        return self._caches[key]
+
+    def register(
+        self, tenant_id: str, params: Dict[str, Any], interval: str, window: int
+    ) -> MultiAssetCryptoStrategy:
+        """Add (or replace) a tenant running `params` on the (interval, window) market."""
+        strategy = MultiAssetCryptoStrategy(**params)
+        strategy._metric_cache = self._cache(strategy, (interval, window))
+        self.tenants[tenant_id] = Tenant(strategy, (interval, window))
+        self.snapshots.setdefault((interval, window), MarketSnapshot())
+        self._locks.setdefault((interval, window), threading.Lock())
+        return strategy
+
+    def unregister(self, tenant_id: str):
+        tenant = self.tenants.pop(tenant_id)
+        if not any(t.market == tenant.market for t in self.tenants.values()):
+            del self.snapshots[tenant.market]
+            del self._locks[tenant.market]
+            for key in [key for key in self._caches if key[0] == tenant.market]:
+                del self._caches[key]
+
+    def markets(self) -> List[MarketKey]:
+        return list(self.snapshots)
+
+    def symbols(self, market: MarketKey) -> List[str]:
+        """Union of the symbols of the market's tenants."""
+        return sorted(
+            {
+                symbol
+                for tenant in self.tenants.values()
+                if tenant.market == market
+                for symbol in tenant.strategy.symbols
+            }
+        )
+
+    def needs_trades(self, market: MarketKey) -> bool:
+        return any(
+            tenant.strategy.volume_source == "trades"
+            for tenant in self.tenants.values()
+            if tenant.market == market
+        )
+
+    def update(
+        self,
+        market: MarketKey,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> MarketSnapshot:
+        """Replace the market's frames (symbols not given keep theirs)."""
+        snapshot = self.snapshots[market]
+        snapshot.klines_data = {**snapshot.klines_data, **klines_data}
+        if trades_data is not None:
+            snapshot.trades_data = {**snapshot.trades_data, **trades_data}
+        snapshot.version += 1
+        snapshot.updated_at = time.time()
+        return snapshot
+
+    def evaluate(self, market: MarketKey) -> Dict[str, Dict[str, Any]]:
+        """
+        One `run_iteration` of every tenant of the market, over its snapshot:
+        {tenant_id: {"orders": [...], "risk": {portfolio VaR / CVaR, with
+        tail_risk_paths}}}, or
+        {"error": "..."} for the tenants that failed (the others still run).
+        """
+        snapshot = self.snapshots[market]
+        klines_data = snapshot.klines_data
+        trades_data = snapshot.trades_data or None
+        # one memo per indicator graph (tenants keep the default one)
+        contexts: Dict[int, GraphContext] = {}
+        results = {}
+        # copy: tenants may (un)register while this runs in a worker thread
+        for tenant_id, tenant in list(self.tenants.items()):
+            if tenant.market != market:
+                continue
+            strategy = tenant.strategy
+            # indicator_scope reuses an open context: every tenant reads the
+            # same memo of intermediate series
+            graph = strategy.indicator_graph
+            if id(graph) not in contexts:
+                contexts[id(graph)] = GraphContext(graph)
+            strategy._graph_context = contexts[id(graph)]
+            try:
+                orders = strategy.run_iteration(klines_data, trades_data)
+                results[tenant_id] = {
+                    "orders": orders,
+                    "risk": strategy.portfolio_risk,
+                }
+            except Exception as e:
+                logger.exception(f"tenant {tenant_id} failed")
+                results[tenant_id] = {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                strategy._graph_context = None
+        return results
+
+    def run(
+        self,
+        market: MarketKey,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """`update` then `evaluate` the market, one run of it at a time."""
+        with self._locks[market]:
+            self.update(market, klines_data, trades_data)
+            return self.evaluate(market)
+
+    def stats(self) -> Dict[str, Any]:
+        caches = {}
+        for ((interval, window), panel, compact), cache in self._caches.items():
+            name = f"{interval}/{window}/panel={panel},compact={compact}"
+            caches[name] = cache.stats()
+        return {
+            "tenants": len(self.tenants),
+            "markets": {
+                f"{interval}/{window}": {
+                    "symbols": len(snapshot.klines_data),
+                    "version": snapshot.version,
+                }
+                for (interval, window), snapshot in self.snapshots.items()
+            },
+            "caches": caches,
+        }
+
+strategy_host = StrategyHost()
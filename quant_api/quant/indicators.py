@@ -0,0 +1,506 @@
+import math
+from collections import deque
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant.liquidity import RollSpread
+from quant_api.quant.market_data import TIME_INDEX, bar_times
+from quant_api.quant.risk_index import RunningMoments
+from quant_api.utils.frames import buy_mask
+
+NAN = float("nan")
+SQRT_24 = math.sqrt(24)
+LOG_2 = math.log(2)
+
+
+def _div(a: float, b: float) -> float:
+    """Divide like numpy does (inf / nan instead of ZeroDivisionError)."""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class RollingMean:
+    """
+    Rolling mean over the last ``window`` observations.
+
+    Matches ``Series.rolling(window).mean()``: NaN until ``window`` non-NaN
+    observations are inside the window.
+    """
+
+    __slots__ = ("window", "_buf", "_sum", "_count")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf = deque(maxlen=window)
+        self._sum = 0.0
+        self._count = 0
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.window:
+            old = self._buf[0]
+            if old == old:
+                self._sum -= old
+                self._count -= 1
+                if self._count == 0:
+                    self._sum = 0.0
+        self._buf.append(x)
+        if x == x:
+            self._sum += x
+            self._count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self._count < self.window:
+            return NAN
+        return self._sum / self._count
+
+
+class RollingStd:
+    """
+    Rolling sample standard deviation (ddof=1) over the last ``window`` observations.
+
+    Uses the same add/remove Welford updates as pandas' rolling variance.
+    """
+
+    __slots__ = ("window", "_buf", "_nobs", "_mean", "_ssqdm")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf = deque(maxlen=window)
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+
+    def _add(self, x: float):
+        self._nobs += 1
+        delta = x - self._mean
+        self._mean += delta / self._nobs
+        self._ssqdm += delta * (x - self._mean)
+
+    def _remove(self, x: float):
+        self._nobs -= 1
+        if self._nobs:
+            delta = x - self._mean
+            self._mean -= delta / self._nobs
+            self._ssqdm -= delta * (x - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.window:
+            old = self._buf[0]
+            if old == old:
+                self._remove(old)
+        self._buf.append(x)
+        if x == x:
+            self._add(x)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self._nobs < self.window or self._nobs < 2:
+            return NAN
+        return math.sqrt(max(self._ssqdm / (self._nobs - 1), 0.0))
+
+
+class EWMean:
+    """
+    Exponentially weighted mean, ``Series.ewm(span=span, adjust=False).mean()``.
+
+    NaN inputs are skipped (pandas ``ignore_na=True`` semantics).
+    """
+
+    __slots__ = ("alpha", "_value")
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self._value = NAN
+
+    def update(self, x: float) -> float:
+        if x == x:
+            if self._value != self._value:
+                self._value = x
+            else:
+                self._value += self.alpha * (x - self._value)
+        return self._value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class RollingSum:
+    """Sum of the last ``window`` observations (like ``Series.iloc[-window:].sum()``)."""
+
+    __slots__ = ("window", "_buf", "_sum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.window:
+            self._sum -= self._buf[0]
+        x = x if x == x else 0.0
+        self._buf.append(x)
+        self._sum += x
+        return self._sum
+
+    @property
+    def value(self) -> float:
+        return self._sum
+
+
+class Lag:
+    """Value observed ``periods`` updates ago (``Series.shift(periods)``)."""
+
+    __slots__ = ("periods", "_buf")
+
+    def __init__(self, periods: int):
+        self.periods = periods
+        self._buf = deque(maxlen=periods + 1)
+
+    def update(self, x: float) -> float:
+        self._buf.append(x)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self._buf) <= self.periods:
+            return NAN
+        return self._buf[0]
+
+
+class RollingCorrelation:
+    """
+    Rolling pairwise correlation of N return series, updated in O(N^2) per step.
+
+    Keeps the last ``window`` return vectors plus running pairwise sums, so the
+    memory is O(window * N + N^2) regardless of history length. Observations
+    are pairwise-complete and a pair needs ``window`` joint observations, like
+    ``DataFrame.rolling(window).corr()``. Running sums are rebuilt from the
+    buffer every ``window`` updates to stop floating-point drift.
+    """
+
+    def __init__(self, n: int, window: int):
+        self.n = n
+        self.window = window
+        self._buf = np.full((window, n), np.nan)
+        self._pos = 0
+        self._updates = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        n = self.n
+        self._count = np.zeros((n, n))
+        self._sum = np.zeros((n, n))  # sum of x_i over joint observations of (i, j)
+        self._sum_sq = np.zeros((n, n))  # sum of x_i^2 over joint observations
+        self._cross = np.zeros((n, n))  # sum of x_i * x_j
+
+    def _accumulate(self, x: np.ndarray, sign: float):
+        mask = ~np.isnan(x)
+        xz = np.where(mask, x, 0.0)
+        m = mask.astype(np.float64)
+        self._count += sign * np.outer(m, m)
+        self._sum += sign * np.outer(xz, m)
+        self._sum_sq += sign * np.outer(xz * xz, m)
+        self._cross += sign * np.outer(xz, xz)
+
+    def update(self, x: np.ndarray):
+        x = np.asarray(x, dtype=np.float64)
+        self._accumulate(self._buf[self._pos], -1.0)
+        self._buf[self._pos] = x
+        self._accumulate(x, 1.0)
+        self._pos = (self._pos + 1) % self.window
+        self._updates += 1
+
+        if self._updates % self.window == 0:
+            self._reset_sums()
+            for row in self._buf:
+                self._accumulate(row, 1.0)
+
+    def warm(self, returns: np.ndarray):
+        """Feed a (time x N) array of returns; only the last ``window`` rows matter."""
+        for row in np.asarray(returns, dtype=np.float64)[-self.window :]:
+            self.update(row)
+
+    @property
+    def returns(self) -> np.ndarray:
+        """The return vectors of the window, oldest first (NaN until filled)."""
+        return np.roll(self._buf, -self._pos, axis=0)
+
+    @property
+    def value(self) -> np.ndarray:
+        count = self._count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = (self._cross - self._sum * self._sum.T / count) / (count - 1)
+            var = (self._sum_sq - self._sum**2 / count) / (count - 1)
+            corr = cov / np.sqrt(np.maximum(var * var.T, 0.0))
+        corr[count < self.window] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+
+class SymbolIndicators:
+    """
+    O(1)-per-bar state for every indicator `MultiAssetCryptoStrategy` reads.
+
+    Each `update` consumes one bar and returns the latest values of the same
+    columns produced by `calculate_momentum_signals`,
+    `calculate_volatility_metrics` and `calculate_volume_profile`.
+    """
+
+    def __init__(
+        self,
+        vol_window: int = 24,
+        rsi_period: int = 14,
+        volume_window: int = 24,
+        momentum_period: int = 12,
+    ):
+        self.vol_window = vol_window
+        self.rsi_period = rsi_period
+        self.volume_window = volume_window
+        self.momentum_period = momentum_period
+
+        self._prev_close = NAN
+        self._gain = RollingMean(rsi_period)
+        self._loss = RollingMean(rsi_period)
+        self._ema_fast = EWMean(12)
+        self._ema_slow = EWMean(26)
+        self._macd_signal = EWMean(9)
+        self._close_lag = Lag(momentum_period)
+        self._hist_vol = RollingStd(vol_window)
+        self._parkinsons = RollingMean(vol_window)
+        self._gk = RollingMean(vol_window)
+        self._volume_sma = RollingMean(volume_window)
+
+        # full-history / 24-bar statistics used by risk and execution
+        self._return_moments = RunningMoments()
+        self._spread_moments = RunningMoments()
+        self._roll_spread = RollSpread()
+        self._recent_volume = RollingSum(24)
+
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.log_return = NAN
+        self.bars = 0
+        self.latest: Dict[str, float] = {}
+
+    def update(
+        self, open_: float, high: float, low: float, close: float, volume: float
+    ) -> Dict[str, float]:
+        # RSI
+        delta = close - self._prev_close
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+        rsi = 100 - _div(100, 1 + _div(gain, loss))
+
+        # MACD
+        macd = self._ema_fast.update(close) - self._ema_slow.update(close)
+        macd_hist = macd - self._macd_signal.update(macd)
+
+        # Momentum score
+        price_momentum = _div(close, self._close_lag.update(close)) - 1
+        momentum_score = (
+            0.4 * (rsi / 100) + 0.3 * _div(macd_hist, close) + 0.3 * price_momentum
+        )
+
+        # Volatility
+        log_return = (
+            math.log(close / self._prev_close)
+            if self._prev_close > 0 and close > 0
+            else NAN
+        )
+        hist_vol = self._hist_vol.update(log_return) * SQRT_24
+        log_hl = math.log(high / low) if high > 0 and low > 0 else NAN
+        log_co = math.log(close / open_) if close > 0 and open_ > 0 else NAN
+        parkinsons_vol = (
+            self._parkinsons.update(math.sqrt(log_hl**2 / (4 * LOG_2))) * SQRT_24
+        )
+        gk_var = 0.5 * log_hl**2 - (2 * LOG_2 - 1) * log_co**2
+        gk_vol = self._gk.update(math.sqrt(gk_var) if gk_var >= 0 else NAN) * SQRT_24
+
+        # Volume
+        volume_sma = self._volume_sma.update(volume)
+
+        # Risk / execution statistics
+        self._return_moments.update(_div(close, self._prev_close) - 1)
+        self._spread_moments.update(high - low)
+        self._roll_spread.update(log_return)
+        recent_volume = self._recent_volume.update(volume)
+
+        self._prev_close = close
+        self.log_return = log_return
+        self.bars += 1
+        self.latest = {
+            "rsi": rsi,
+            "macd": macd,
+            "macd_hist": macd_hist,
+            "momentum_score": momentum_score,
+            "hist_vol": hist_vol,
+            "parkinsons_vol": parkinsons_vol,
+            "gk_vol": gk_vol,
+            "composite_vol": (hist_vol + parkinsons_vol + gk_vol) / 3,
+            "volume_momentum": _div(volume, volume_sma),
+            "volume_sma": volume_sma,
+            "buy_sell_ratio": self.buy_sell_ratio,
+            "close": close,
+            "high": high,
+            "return_std": self._return_moments.std(),
+            "avg_spread": self._spread_moments.mean,
+            "roll_spread": self._roll_spread.value,
+            "recent_volume": recent_volume,
+        }
+        return self.latest
+
+    def add_trades(self, buy_volume: float, sell_volume: float):
+        """Accumulate traded volume for the buy/sell ratio."""
+        self.buy_volume += buy_volume
+        self.sell_volume += sell_volume
+        self.latest["buy_sell_ratio"] = self.buy_sell_ratio
+
+    @property
+    def buy_sell_ratio(self) -> float:
+        return self.buy_volume / self.sell_volume if self.sell_volume > 0 else 1.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether every rolling window is full (26-bar MACD included)."""
+        return self.bars >= max(
+            self.vol_window + 1,
+            self.rsi_period + 1,
+            self.volume_window,
+            self.momentum_period + 1,
+            26,
+        )
+
+    def warm(self, klines: pd.DataFrame) -> Dict[str, float]:
+        """Feed a history of klines bar by bar."""
+        bars = klines[["open", "high", "low", "close", "volume"]].to_numpy(
+            dtype=np.float64
+        )
+        for open_, high, low, close, volume in bars.tolist():
+            self.update(open_, high, low, close, volume)
+        return self.latest
+
+
+class IndicatorEngine:
+    """
+    Incremental indicators for a set of symbols.
+
+    Warm it once from history, then push one bar per symbol as it closes:
+
+        engine = IndicatorEngine(symbols, vol_window=24, rsi_period=14)
+        engine.warm(klines_data, trades_data)
+        latest = engine.update("BTCUSDT", bar)
+    """
+
+    def __init__(
+        self,
+        symbols,
+        vol_window: int = 24,
+        rsi_period: int = 14,
+        lookback_periods: Optional[Dict[str, int]] = None,
+    ):
+        lookback_periods = lookback_periods or {}
+        self.correlation = RollingCorrelation(
+            len(symbols), lookback_periods.get("correlation", 168)
+        )
+        self.states: Dict[str, SymbolIndicators] = {
+            symbol: SymbolIndicators(
+                vol_window=vol_window,
+                rsi_period=rsi_period,
+                volume_window=lookback_periods.get("volume", 24),
+                momentum_period=lookback_periods.get("momentum", 12),
+            )
+            for symbol in symbols
+        }
+        # open time (epoch ms) of the last bar consumed per symbol, None if unknown
+        self.last_times: Dict[str, Optional[int]] = dict.fromkeys(symbols)
+
+    @property
+    def symbols(self):
+        return list(self.states)
+
+    def warm(
+        self,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+    ):
+        for symbol, state in self.states.items():
+            if trades_data is not None:
+                quantity = trades_data[symbol]["quantity"].to_numpy()
+                is_buy = buy_mask(trades_data[symbol])
+                state.add_trades(
+                    np.sum(quantity[is_buy], dtype=np.float64),
+                    np.sum(quantity[~is_buy], dtype=np.float64),
+                )
+            state.warm(klines_data[symbol])
+            times = bar_times(klines_data[symbol])
+            self.last_times[symbol] = (
+                int(times[-1]) if times is not None and len(times) else None
+            )
+
+        # correlation window: last log returns, aligned by position
+        window = self.correlation.window
+        returns = pd.DataFrame(
+            {
+                symbol: np.log(closes / closes.shift(1)).reset_index(drop=True)
+                for symbol, closes in (
+                    (symbol, klines_data[symbol]["close"].iloc[-(window + 1) :])
+                    for symbol in self.states
+                )
+            }
+        )
+        self.correlation.warm(returns.to_numpy())
+
+    def update(self, symbol: str, bar: Mapping[str, float]) -> Dict[str, float]:
+        """
+        Consume one closed bar (mapping with open/high/low/close/volume, and
+        its `TIME_INDEX` open time when known).
+        """
+        time = bar.get(TIME_INDEX)
+        self.last_times[symbol] = None if time is None else int(time)
+        return self.states[symbol].update(
+            float(bar["open"]),
+            float(bar["high"]),
+            float(bar["low"]),
+            float(bar["close"]),
+            float(bar["volume"]),
+        )
+
+    def update_all(self, bars: Mapping[str, Mapping[str, float]]):
+        """
+        Consume one closed bar for every symbol and step the correlation window.
+        """
+        for symbol, bar in bars.items():
+            self.update(symbol, bar)
+        self.correlation.update(
+            [
+                self.states[symbol].log_return if symbol in bars else NAN
+                for symbol in self.states
+            ]
+        )
+
+    def add_trades(self, symbol: str, buy_volume: float, sell_volume: float):
+        self.states[symbol].add_trades(buy_volume, sell_volume)
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Latest rolling correlation matrix (N x N)."""
+        return pd.DataFrame(
+            self.correlation.value, index=self.symbols, columns=self.symbols
+        )
+
+    def latest(self, symbol: str) -> Dict[str, float]:
+        return self.states[symbol].latest
+
+    @property
+    def ready(self) -> bool:
+        return all(state.ready for state in self.states.values())
@@ -0,0 +1,293 @@
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+SIDES = ["BUY", "SELL"]
+ORDER_TYPES = ["MARKET", "LIMIT"]
+
+
+class Record:
+    """
+    View of one ledger row: fields read on access from the columns, nothing
+    is copied. Categorical fields decode to their label, times to Timestamps.
+    """
+
+    __slots__ = ("_ledger", "_row")
+
+    def __init__(self, ledger: "Ledger", row: int):
+        self._ledger = ledger
+        self._row = row
+
+    def __getattr__(self, name: str):
+        try:
+            return self._ledger.value(name, self._row)
+        except (KeyError, ValueError):
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self._ledger.dtype.names
+        )
+        return f"{type(self._ledger).__name__}.Record({fields})"
+
+
+class Ledger:
+    """
+    Append-only table of fixed-width records: a structured NumPy array grown
+    in chunks of `chunk_size` rows (no copy of the existing rows on growth).
+
+    Categorical fields (symbols, sides) hold int32 codes into a per-field
+    label table and export as `pd.Categorical`, time fields hold
+    datetime64[ns]; a record takes `dtype.itemsize` bytes instead of a Python
+    object with its attribute dict, floats, strings and datetime. ID fields
+    store non-negative integer ids as is and intern any other id (stored as
+    -1 - its code), so integer ids cost no Python object.
+    """
+
+    FIELDS: Dict[str, str] = {}
+    CATEGORICAL: Sequence[str] = ()
+    IDS: Sequence[str] = ()
+    # fixed label tables (codes stable across ledgers)
+    LABELS: Dict[str, List[str]] = {}
+
+    def __init__(self, chunk_size: int = 1 << 14):
+        self.dtype = np.dtype(
+            [
+                (
+                    name,
+                    np.int32
+                    if name in self.CATEGORICAL
+                    else np.int64
+                    if name in self.IDS
+                    else np.dtype(kind),
+                )
+                for name, kind in self.FIELDS.items()
+            ]
+        )
+        self.chunk_size = chunk_size
+        # fields left out of `append` read as NaN / NaT (0 for codes and ids)
+        self._blank = np.zeros(1, dtype=self.dtype)
+        for name in self.dtype.names:
+            if self.dtype[name].kind == "f":
+                self._blank[name] = np.nan
+            elif self.dtype[name].kind == "M":
+                self._blank[name] = np.datetime64("NaT")
+        self._chunks: List[np.ndarray] = []
+        self._n = 0
+        self.labels: Dict[str, List[str]] = {
+            name: list(self.LABELS.get(name, ()))
+            for name in (*self.CATEGORICAL, *self.IDS)
+        }
+        self._codes: Dict[str, Dict[str, int]] = {
+            name: {label: code for code, label in enumerate(labels)}
+            for name, labels in self.labels.items()
+        }
+        self._array = None  # consolidated rows, until the next append
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self) -> Iterator[Record]:
+        return (Record(self, row) for row in range(self._n))
+
+    def __getitem__(self, row: int) -> Record:
+        if row < 0:
+            row += self._n
+        if not 0 <= row < self._n:
+            raise IndexError(row)
+        return Record(self, row)
+
+    @property
+    def nbytes(self) -> int:
+        return self._n * self.dtype.itemsize
+
+    def code(self, name: str, label) -> int:
+        codes = self._codes[name]
+        if label not in codes:
+            codes[label] = len(self.labels[name])
+            self.labels[name].append(label)
+        return codes[label]
+
+    def append(self, **fields) -> int:
+        """Add one record; returns its row."""
+        row = self._n
+        if row == len(self._chunks) * self.chunk_size:
+            self._chunks.append(np.repeat(self._blank, self.chunk_size))
+        record = self._chunks[-1][row % self.chunk_size]
+        for name, value in fields.items():
+            if name in self.CATEGORICAL:
+                value = self.code(name, value)
+            elif name in self.IDS:
+                if not (isinstance(value, (int, np.integer)) and value >= 0):
+                    value = -1 - self.code(name, value)
+            elif self.dtype[name].kind == "M":
+                value = pd.Timestamp(value).to_datetime64()  # None -> NaT, aware -> UTC
+            elif value is None:
+                value = np.nan
+            record[name] = value
+        self._n += 1
+        self._array = None
+        return row
+
+    def extend(self, **columns: Sequence) -> int:
+        """
+        Add records column by column (equal-length sequences, fields left
+        out read as in `append`); returns the number of rows added.
+        """
+        n = len(next(iter(columns.values()), ()))
+        values = {}
+        for name, column in columns.items():
+            if name in self.CATEGORICAL:
+                values[name] = np.array(
+                    [self.code(name, label) for label in column], dtype=np.int32
+                )
+            elif name in self.IDS:
+                values[name] = np.array(
+                    [
+                        value
+                        if isinstance(value, (int, np.integer)) and value >= 0
+                        else -1 - self.code(name, value)
+                        for value in column
+                    ],
+                    dtype=np.int64,
+                )
+            elif self.dtype[name].kind == "M":
+                times = pd.to_datetime(pd.Series(column, dtype=object))
+                values[name] = times.to_numpy(dtype="datetime64[ns]")
+            else:
+                values[name] = np.array(
+                    [np.nan if value is None else value for value in column],
+                    dtype=self.dtype[name],
+                )
+
+        done = 0
+        while done < n:
+            row = self._n
+            if row == len(self._chunks) * self.chunk_size:
+                self._chunks.append(np.repeat(self._blank, self.chunk_size))
+            offset = row % self.chunk_size
+            take = min(n - done, self.chunk_size - offset)
+            chunk = self._chunks[-1]
+            for name, column in values.items():
+                chunk[name][offset : offset + take] = column[done : done + take]
+            self._n += take
+            done += take
+        self._array = None
+        return n
+
+    def to_array(self) -> np.ndarray:
+        """All records as one structured array (cached until the next append)."""
+        if self._array is None:
+            if not self._chunks:
+                self._array = np.zeros(0, dtype=self.dtype)
+            else:
+                self._array = np.concatenate(self._chunks)[: self._n]
+        return self._array
+
+    def column(self, name: str) -> np.ndarray:
+        return self.to_array()[name]
+
+    def value(self, name: str, row: int):
+        chunk = self._chunks[row // self.chunk_size]
+        value = chunk[name][row % self.chunk_size]
+        if name in self.CATEGORICAL:
+            return self.labels[name][value]
+        if name in self.IDS and value < 0:
+            return self.labels[name][-1 - value]
+        if self.dtype[name].kind == "M":
+            return pd.Timestamp(value).to_pydatetime() if not np.isnat(value) else None
+        return value.item()
+
+    def to_frame(self, start: int = 0) -> pd.DataFrame:
+        """DataFrame of the records from row `start`, built column by column."""
+        array = self.to_array()[start:]
+        columns = {}
+        for name in self.dtype.names:
+            if name in self.CATEGORICAL:
+                columns[name] = pd.Categorical.from_codes(
+                    array[name], categories=self.labels[name]
+                )
+            elif name in self.IDS and self.labels[name]:
+                ids = array[name].astype(object)
+                interned = array[name] < 0
+                ids[interned] = np.array(self.labels[name], dtype=object)[
+                    -1 - array[name][interned]
+                ]
+                columns[name] = ids
+            else:
+                columns[name] = array[name]
+        return pd.DataFrame(columns)
+
+    def _group_sum(self, name: str, values: np.ndarray) -> pd.Series:
+        """Sum of `values` per label of the categorical field `name`."""
+        labels = self.labels[name]
+        sums = np.bincount(self.column(name), weights=values, minlength=len(labels))
+        return pd.Series(sums, index=pd.Index(labels, name=name))
+
+
+class FillLedger(Ledger):
+    """Executed fills; `side` BUY adds to, SELL takes from the position."""
+
+    FIELDS = {
+        "symbol": "i4",
+        "side": "i4",
+        "size": "f8",
+        "price": "f8",
+        "fee": "f8",
+        "order_type": "i4",
+        "trade_id": "i8",
+        "time": "M8[ns]",
+    }
+    CATEGORICAL = ("symbol", "side", "order_type")
+    IDS = ("trade_id",)
+    LABELS = {"side": SIDES, "order_type": ORDER_TYPES}
+
+    def signed_sizes(self) -> np.ndarray:
+        sizes = self.column("size")
+        return np.where(self.column("side") == SIDES.index("BUY"), sizes, -sizes)
+
+    def net_sizes(self) -> pd.Series:
+        """Net position per symbol."""
+        return self._group_sum("symbol", self.signed_sizes())
+
+    def cash_flows(self) -> pd.Series:
+        """Cash received per symbol (sells - buys - fees)."""
+        return self._group_sum(
+            "symbol",
+            -self.signed_sizes() * self.column("price") - self.column("fee"),
+        )
+
+    def exposure(self, prices: Dict[str, float]) -> pd.Series:
+        """Absolute marked value of the net position per symbol."""
+        net = self.net_sizes()
+        return (net * net.index.map(prices).to_numpy(dtype=np.float64)).abs()
+
+    def pnl(self, prices: Dict[str, float]) -> pd.Series:
+        """Realized plus unrealized PnL (after fees) per symbol, marked at `prices`."""
+        net = self.net_sizes()
+        marks = net.index.map(prices).to_numpy(dtype=np.float64)
+        return self.cash_flows() + np.where(net.to_numpy() == 0, 0.0, net * marks)
+
+
+class PositionLedger(Ledger):
+    """Closed positions, with the price and time of the fill that closed them."""
+
+    FIELDS = {
+        "symbol": "i4",
+        "size": "f8",
+        "entry_price": "f8",
+        "entry_time": "M8[ns]",
+        "exit_price": "f8",
+        "exit_time": "M8[ns]",
+        "trade_id": "i8",
+    }
+    CATEGORICAL = ("symbol",)
+    IDS = ("trade_id",)
+
+    def realized_pnl(self) -> pd.Series:
+        """(exit - entry) * size per symbol, before fees."""
+        pnl = (self.column("exit_price") - self.column("entry_price")) * self.column(
+            "size"
+        )
+        return self._group_sum("symbol", np.nan_to_num(pnl))
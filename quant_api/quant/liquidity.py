@@ -0,0 +1,266 @@
+"""
+Per-symbol liquidity statistics, built once from the klines / trades history
+and extended with the appended rows, and the square-root market impact
+model that reads them.
+
+With the statistics at hand an impact estimate is a few arithmetic
+operations instead of a scan of the trades and klines.
+"""
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant.market_data import bar_times
+from quant_api.quant.risk_index import RunningMoments
+
+# trades sizes histogram: log10 bins of 1/8 decade from 1e-8 to 1e8
+SIZE_EDGES = np.logspace(-8, 8, 129)
+HOUR_MS = 3_600_000
+# bars of the strategy frames are hours unless their times say otherwise
+DEFAULT_BAR_MS = HOUR_MS
+
+
+class RollSpread:
+    """
+    Roll's effective spread from the bar returns, 2 * sqrt(-cov(r[t-1], r[t])):
+    bid-ask bounce makes consecutive returns negatively correlated. Running
+    sums over the consecutive pairs, so appending is O(m); 0 when the
+    autocovariance is not negative.
+    """
+
+    __slots__ = ("count", "_sum_x", "_sum_y", "_sum_xy", "_last")
+
+    def __init__(self):
+        self.count = 0
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self._last = math.nan
+
+    def update(self, x: float):
+        if x == x and self._last == self._last:
+            self.count += 1
+            self._sum_x += self._last
+            self._sum_y += x
+            self._sum_xy += self._last * x
+        self._last = x
+
+    def extend(self, values):
+        values = np.concatenate([[self._last], np.asarray(values, dtype=np.float64)])
+        x, y = values[:-1], values[1:]
+        pairs = ~(np.isnan(x) | np.isnan(y))
+        self.count += int(pairs.sum())
+        self._sum_x += x[pairs].sum()
+        self._sum_y += y[pairs].sum()
+        self._sum_xy += (x[pairs] * y[pairs]).sum()
+        self._last = values[-1]
+
+    @property
+    def value(self) -> float:
+        if self.count < 2:
+            return math.nan
+        cov = (self._sum_xy - self._sum_x * self._sum_y / self.count) / (self.count - 1)
+        return 2 * math.sqrt(-cov) if cov < 0 else 0.0
+
+
+class LiquidityStats:
+    """
+    Liquidity of one symbol over an append-only klines (strategy layout) and
+    optional trades history:
+
+    - trade size distribution: moments and a log-spaced histogram of the
+      trade quantities (or volume / count of the klines without trades);
+    - hourly volume curve: mean bar volume per UTC hour of the day (bars
+      with times only);
+    - realized spread proxy: Roll's spread of the bar returns (`RollSpread`)
+      and the mean relative bar range (high - low) / close;
+    - bar volatility: moments of the close-to-close log returns;
+    - the volume of the last `recent_bars` bars.
+
+    With `full` False only the trade size moments, the klines volume / count
+    and the recent volume are kept: what the linear impact model reads.
+    """
+
+    def __init__(
+        self,
+        klines: Optional[pd.DataFrame] = None,
+        trades: Optional[pd.DataFrame] = None,
+        recent_bars: int = 24,
+        full: bool = True,
+    ):
+        self.full = full
+        self.trade_sizes = RunningMoments()
+        self.size_histogram = np.zeros(len(SIZE_EDGES) - 1, dtype=np.int64)
+        self.bars = 0
+        self.kline_volume = 0.0
+        self.kline_count = 0.0
+        self.hourly_volume = np.zeros(24)
+        self.hourly_bars = np.zeros(24, dtype=np.int64)
+        self.bar_ms: Optional[int] = None
+        self.last_time: Optional[int] = None
+        self.spread = RollSpread()
+        self.bar_range = RunningMoments()
+        self.returns = RunningMoments()
+        self.last_close = math.nan
+        self.recent = deque(maxlen=recent_bars)
+        self.extend(klines, trades)
+
+    def extend(
+        self,
+        klines: Optional[pd.DataFrame] = None,
+        trades: Optional[pd.DataFrame] = None,
+    ) -> "LiquidityStats":
+        """Add the rows following the ones already counted."""
+        if trades is not None and len(trades):
+            sizes = trades["quantity"].to_numpy(dtype=np.float64)
+            self.trade_sizes.extend(sizes)
+            if self.full:
+                # the bins are uniform in log10: index them directly (no sort)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    bins = np.floor((np.log10(sizes) + 8) * 8)
+                inside = (bins >= 0) & (bins < len(self.size_histogram))
+                self.size_histogram += np.bincount(
+                    bins[inside].astype(np.intp), minlength=len(self.size_histogram)
+                )
+        if klines is not None:
+            self._extend_klines(klines)
+        return self
+
+    def _extend_klines(self, klines: pd.DataFrame) -> "LiquidityStats":
+        if not len(klines):
+            return self
+        volume = klines["volume"].to_numpy(dtype=np.float64)
+        self.bars += len(klines)
+        self.kline_volume += np.nansum(volume)
+        if "count" in klines:
+            self.kline_count += np.nansum(klines["count"].to_numpy(dtype=np.float64))
+        self.recent.extend(volume[-self.recent.maxlen :].tolist())
+        if not self.full:
+            return self
+
+        close = klines["close"].to_numpy(dtype=np.float64)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            high = klines["high"].to_numpy(dtype=np.float64)
+            ranges = (high - klines["low"].to_numpy(dtype=np.float64)) / close
+            closes = np.concatenate([[self.last_close], close])
+            returns = np.log(closes[1:] / closes[:-1])
+        self.returns.extend(returns)
+        # the first return of the history is NaN, as in `RollSpread` pairs
+        self.spread.extend(returns)
+        self.bar_range.extend(ranges)
+        self.last_close = close[-1]
+
+        times = bar_times(klines)
+        if times is not None:
+            if self.bar_ms is None and len(times) > 1:
+                self.bar_ms = int(np.median(np.diff(times)))
+            self.last_time = int(times[-1])
+            hours = (times // HOUR_MS) % 24
+            valid = ~np.isnan(volume)
+            self.hourly_volume += np.bincount(
+                hours[valid], weights=volume[valid], minlength=24
+            )
+            self.hourly_bars += np.bincount(hours[valid], minlength=24)
+        return self
+
+    @property
+    def avg_trade_size(self) -> float:
+        if self.trade_sizes.count:
+            return self.trade_sizes.mean
+        return self.kline_volume / self.kline_count if self.kline_count else math.nan
+
+    def trade_size_quantile(self, q: float) -> float:
+        """Quantile of the trade sizes, read from the histogram (geometric bin midpoint)."""
+        total = self.size_histogram.sum()
+        if not total:
+            return math.nan
+        i = int(np.searchsorted(np.cumsum(self.size_histogram), q * total))
+        return math.sqrt(SIZE_EDGES[i] * SIZE_EDGES[i + 1])
+
+    @property
+    def bars_per_day(self) -> float:
+        return 86_400_000 / (self.bar_ms or DEFAULT_BAR_MS)
+
+    @property
+    def next_bar_time(self) -> Optional[int]:
+        """Open time (epoch ms) of the bar after the last one, None without times."""
+        if self.last_time is None:
+            return None
+        return self.last_time + (self.bar_ms or DEFAULT_BAR_MS)
+
+    @property
+    def volume_curve(self) -> np.ndarray:
+        """Expected volume traded in each UTC hour of the day (NaN for unseen hours)."""
+        bars_per_hour = HOUR_MS / (self.bar_ms or DEFAULT_BAR_MS)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.hourly_volume / self.hourly_bars * bars_per_hour
+
+    @property
+    def daily_volume(self) -> float:
+        curve = self.volume_curve
+        if np.isnan(curve).all():
+            # no bar times: the mean bar volume over a day of bars
+            if not self.bars:
+                return math.nan
+            return self.kline_volume / self.bars * self.bars_per_day
+        return float(np.nanmean(curve) * 24)
+
+    @property
+    def daily_volatility(self) -> float:
+        return self.returns.std() * math.sqrt(self.bars_per_day)
+
+    @property
+    def half_spread(self) -> float:
+        return self.spread.value / 2
+
+    @property
+    def recent_volume(self) -> float:
+        return float(np.nansum(self.recent))
+
+
+def sqrt_impact(
+    size: float,
+    daily_volume: float,
+    daily_volatility: float,
+    half_spread: float = 0.0,
+    coefficient: float = 1.0,
+) -> float:
+    """
+    Expected relative cost of executing `size` at once: half the spread plus
+    `coefficient * daily_volatility * sqrt(size / daily_volume)`, the
+    square-root law (impact grows with the square root of the participation,
+    not linearly, so liquid pairs take large orders cheaply).
+    """
+    if not daily_volume > 0:
+        return math.inf
+    spread = half_spread if half_spread == half_spread else 0.0
+    return spread + coefficient * daily_volatility * math.sqrt(size / daily_volume)
+
+
+def sqrt_chunks(
+    size: float,
+    daily_volume: float,
+    daily_volatility: float,
+    max_impact: float,
+    half_spread: float = 0.0,
+    coefficient: float = 1.0,
+    max_chunks: int = 100,
+) -> int:
+    """
+    Fewest equal chunks whose square-root impact each stays within
+    `max_impact` (at most `max_chunks`, also when the spread alone exceeds it).
+    """
+    spread = half_spread if half_spread == half_spread else 0.0
+    budget = max_impact - spread
+    if not daily_volume > 0 or budget <= 0:
+        return max_chunks
+    scale = coefficient * daily_volatility
+    if not scale > 0:
+        return 1
+    # spread + scale * sqrt(size / (n * V)) <= max_impact
+    needed = size / daily_volume * (scale / budget) ** 2
+    return int(min(max(math.ceil(needed - 1e-12), 1), max_chunks))
@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant.panel import MarketPanel
+
+# index of the strategy frames: bar open time, epoch ms (int64)
+TIME_INDEX = "open_time"
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+# no trading in a missing bar
+ZERO_COLUMNS = [
+    "volume",
+    "quoteVolume",
+    "count",
+    "takerBaseVolume",
+    "takerQuoteVolume",
+]
+
+
+def bar_times(klines: pd.DataFrame) -> Optional[np.ndarray]:
+    """Bar open times in epoch ms (`TIME_INDEX` or DatetimeIndex), else None."""
+    index = klines.index
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8 // 1_000_000
+    if index.name == TIME_INDEX:
+        return index.to_numpy(dtype=np.int64)
+    return None
+
+
+def to_ms(when) -> int:
+    """Epoch ms of a datetime / Timestamp (naive values are taken as UTC, like the bar times)."""
+    return pd.Timestamp(when).value // 1_000_000
+
+
+class MarketData:
+    """
+    Klines of several symbols, each indexed by bar open time (epoch ms,
+    `TIME_INDEX`) in the strategy layout ("open" / "close" are prices), on a
+    shared sorted time axis (the union of the bar times).
+
+    Symbols keep their own bars in `frames`; `align` puts them on the shared
+    axis with the fill rules of missing bars. Time lookups (`slice`, `asof`)
+    are binary searches on the sorted indexes, O(log n) per symbol.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+        self.symbols = list(frames)
+        times = [frame.index.to_numpy(dtype=np.int64) for frame in frames.values()]
+        self.axis = (
+            np.unique(np.concatenate(times)) if times else np.empty(0, dtype=np.int64)
+        )
+
+    @classmethod
+    def from_klines(
+        cls, klines_data: Dict[str, pd.DataFrame], symbols: Optional[List[str]] = None
+    ) -> "MarketData":
+        """
+        From klines in the archive layout (`settings.KLINES_COLUMNS`, "open" /
+        "close" are the bar times and "openPrice" / "last" the prices), e.g.
+        as `load_past_data` returns them. Bars are sorted by open time and
+        a repeated open time keeps its last bar.
+        """
+        frames = {}
+        for symbol in symbols or list(klines_data):
+            klines = klines_data[symbol]
+            times = klines["open"].to_numpy(dtype=np.int64)
+            frame = klines.drop(columns=["open", "close", "openPrice", "last"]).assign(
+                open=klines["openPrice"].to_numpy(), close=klines["last"].to_numpy()
+            )
+            frame.index = pd.Index(times, name=TIME_INDEX)
+            if not frame.index.is_monotonic_increasing or frame.index.has_duplicates:
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            frames[symbol] = frame[
+                PRICE_COLUMNS
+                + [column for column in frame.columns if column not in PRICE_COLUMNS]
+            ]
+        return cls(frames)
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        return self.frames[symbol]
+
+    def times(self, symbol: str) -> np.ndarray:
+        return self.frames[symbol].index.to_numpy(dtype=np.int64)
+
+    def slice(self, start: Optional[int] = None, end: Optional[int] = None) -> "MarketData":
+        """Bars opening in [start, end) (epoch ms, either bound optional), without copies."""
+        frames = {}
+        for symbol, frame in self.frames.items():
+            times = frame.index.to_numpy(dtype=np.int64)
+            i = 0 if start is None else np.searchsorted(times, start, side="left")
+            j = len(times) if end is None else np.searchsorted(times, end, side="left")
+            frames[symbol] = frame.iloc[i:j]
+        return MarketData(frames)
+
+    def asof(self, symbol: str, times: Iterable) -> np.ndarray:
+        """
+        Row of the bar each time falls in (last bar opened at or before it),
+        -1 before the first bar.
+        """
+        return (
+            np.searchsorted(
+                self.times(symbol), np.asarray(times, dtype=np.int64), side="right"
+            )
+            - 1
+        )
+
+    def asof_join(
+        self,
+        symbol: str,
+        trades: pd.DataFrame,
+        columns: Iterable[str] = ("close",),
+        time_column: str = "time",
+    ) -> pd.DataFrame:
+        """
+        `trades` with the columns of the bar each trade falls in (NaN before
+        the first bar) and its open time as `TIME_INDEX`; like
+        `pd.merge_asof(direction="backward")` without sorting the trades.
+        """
+        rows = self.asof(symbol, trades[time_column].to_numpy())
+        valid = rows >= 0
+        rows = np.maximum(rows, 0)
+        frame = self.frames[symbol]
+        if not len(frame):
+            valid[:] = False
+            frame = frame.reindex([0])
+        times = frame.index.to_numpy(dtype=np.int64)
+        joined = {TIME_INDEX: np.where(valid, times[rows], -1)}
+        for column in columns:
+            values = frame[column].to_numpy(dtype=np.float64)[rows]
+            joined[column] = np.where(valid, values, np.nan)
+        return trades.assign(**joined)
+
+    def align(self, fill: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Every symbol's frame on the shared time axis.
+
+        Missing bars after a symbol's first bar are filled as bars without
+        trading: prices at the previous close, volumes and counts 0 (other
+        columns are NaN). Before the first bar every column is NaN. Without
+        `fill` missing bars are left NaN.
+        """
+        aligned = {}
+        for symbol, frame in self.frames.items():
+            out = frame.reindex(self.axis)
+            out.index.name = TIME_INDEX
+            if fill and len(out) != len(frame):
+                present = np.zeros(len(self.axis), dtype=bool)
+                present[np.searchsorted(self.axis, frame.index.to_numpy())] = True
+                missing = ~present & (np.cumsum(present) > 0)
+                close = out["close"].ffill().to_numpy()
+                for column in PRICE_COLUMNS:
+                    out.loc[missing, column] = close[missing]
+                for column in ZERO_COLUMNS:
+                    if column in out:
+                        out.loc[missing, column] = 0
+            aligned[symbol] = out
+        return aligned
+
+    def panel(self, dtype=np.float64) -> MarketPanel:
+        """(time x symbol) panel over the shared axis (see `align`)."""
+        return MarketPanel.from_klines(self.align(), self.symbols, dtype=dtype)
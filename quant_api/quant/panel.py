@@ -0,0 +1,206 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass
+class MarketPanel:
+    """
+    Aligned (time x symbol) OHLCV arrays, column-major so that every
+    symbol's history is contiguous for the scans along the time axis.
+
+    Symbols are aligned by row position, like `pd.DataFrame` does for frames
+    sharing a RangeIndex; shorter histories are NaN-padded at the end so that
+    every per-symbol result equals the one computed on the symbol alone.
+    """
+
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray
+
+    @classmethod
+    def from_klines(
+        cls,
+        klines_data: Dict[str, pd.DataFrame],
+        symbols: List[str] = None,
+        dtype=np.float64,
+    ) -> "MarketPanel":
+        symbols = list(symbols or klines_data)
+        lengths = np.array([len(klines_data[sym]) for sym in symbols], dtype=np.int64)
+        n_bars = int(lengths.max()) if len(lengths) else 0
+
+        fields = {}
+        for field in PANEL_FIELDS:
+            arr = np.full((n_bars, len(symbols)), np.nan, dtype=dtype, order="F")
+            for j, sym in enumerate(symbols):
+                arr[: lengths[j], j] = klines_data[sym][field].to_numpy(dtype=dtype)
+            fields[field] = arr
+
+        return cls(symbols=symbols, lengths=lengths, **fields)
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def to_frames(
+        self, metrics: Dict[str, np.ndarray], index: Dict[str, pd.Index] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Split (time x symbol) metric arrays back into one DataFrame per symbol."""
+        frames = {}
+        for j, sym in enumerate(self.symbols):
+            n = self.lengths[j]
+            frames[sym] = pd.DataFrame(
+                {name: values[:n, j] for name, values in metrics.items()},
+                index=None if index is None else index[sym],
+            )
+        return frames
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.empty_like(x)
+    out[:periods] = np.nan
+    out[periods:] = x[:-periods]
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int):
+    """
+    Rolling sum and count of non-NaN values along the time axis.
+
+    Accumulates in float64 whatever the input precision.
+    """
+    valid = ~np.isnan(x)
+    rows = np.arange(len(x))[:, None]
+    if valid.all():
+        cs = np.cumsum(x, axis=0, dtype=np.float64)
+        count = np.broadcast_to(np.minimum(rows + 1, window), x.shape)
+    else:
+        cs = np.cumsum(np.where(valid, x, 0.0), axis=0, dtype=np.float64)
+        first = valid.argmax(axis=0)
+        if (valid.sum(axis=0) == len(x) - first).all():
+            # NaNs only lead each column (shifted / differenced series):
+            # the counts follow from the first valid row, no second scan
+            # (in x's memory layout: mixed layouts slow every later step)
+            count = np.empty_like(x, dtype=np.int64)
+            np.subtract(rows + 1, first, out=count)
+            np.clip(count, 0, window, out=count)
+        else:
+            cn = np.cumsum(valid, axis=0)
+            count = cn.copy()
+            count[window:] -= cn[:-window]
+    total = np.empty_like(cs)
+    total[:window] = cs[:window]
+    np.subtract(cs[window:], cs[:-window], out=total[window:])
+    return total, count
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """`rolling(window).mean()` applied to every column in one pass."""
+    total, count = rolling_sum(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    mean[count < window] = np.nan
+    return mean.astype(x.dtype, copy=False)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """`rolling(window).std()` (ddof=1) applied to every column in one pass."""
+    # de-mean first to limit cancellation in the sum of squares
+    centered = x - np.nanmean(x, axis=0, dtype=np.float64)
+    total, count = rolling_sum(centered, window)
+    total_sq, _ = rolling_sum(centered**2, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (total_sq - total**2 / count) / (count - 1)
+    var[(count < window) | (count < 2)] = np.nan
+    return np.sqrt(np.maximum(var, 0.0)).astype(x.dtype, copy=False)
+
+
+def ewm_mean(x: np.ndarray, span: int) -> np.ndarray:
+    """`ewm(span, adjust=False).mean()` applied to every column in one pass."""
+    return (
+        pd.DataFrame(x, copy=False)
+        .ewm(span=span, adjust=False)
+        .mean()
+        .to_numpy(dtype=x.dtype)
+    )
+
+
+def volatility_metrics(panel: MarketPanel, vol_window: int) -> Dict[str, np.ndarray]:
+    # python float constants keep float32 panels in float32
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_returns = np.log(panel.close / shift(panel.close))
+        log_hl = np.log(panel.high / panel.low)
+        log_co = np.log(panel.close / panel.open)
+        hist_vol = rolling_std(log_returns, vol_window) * math.sqrt(24)
+        parkinsons_vol = rolling_mean(
+            np.sqrt(log_hl**2 / (4 * math.log(2))), vol_window
+        ) * math.sqrt(24)
+        gk_vol = rolling_mean(
+            np.sqrt(0.5 * log_hl**2 - (2 * math.log(2) - 1) * log_co**2), vol_window
+        ) * math.sqrt(24)
+
+    return {
+        "hist_vol": hist_vol,
+        "parkinsons_vol": parkinsons_vol,
+        "gk_vol": gk_vol,
+        "composite_vol": (hist_vol + parkinsons_vol + gk_vol) / 3,
+    }
+
+
+def momentum_signals(
+    panel: MarketPanel, rsi_period: int, momentum_period: int, return_ema: bool = False
+):
+    """
+    RSI, MACD and momentum score for every symbol.
+
+    With `return_ema` the MACD EWM arrays (ema_fast, ema_slow, macd_signal) are
+    returned as well, for callers that continue them incrementally.
+    """
+    close = panel.close
+    delta = close - shift(close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), rsi_period)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), rsi_period)
+        rsi = 100 - (100 / (1 + gain / loss))
+
+        ema_fast = ewm_mean(close, 12)
+        ema_slow = ewm_mean(close, 26)
+        macd = ema_fast - ema_slow
+        macd_signal = ewm_mean(macd, 9)
+        macd_hist = macd - macd_signal
+
+        momentum_score = (
+            0.4 * (rsi / 100)
+            + 0.3 * (macd_hist / close)
+            + 0.3 * (close / shift(close, momentum_period) - 1)
+        )
+
+    signals = {
+        "rsi": rsi,
+        "macd": macd,
+        "macd_hist": macd_hist,
+        "momentum_score": momentum_score,
+    }
+    if return_ema:
+        return signals, {
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+            "macd_signal": macd_signal,
+        }
+    return signals
+
+
+def volume_momentum(panel: MarketPanel, volume_window: int) -> Dict[str, np.ndarray]:
+    volume_sma = rolling_mean(panel.volume, volume_window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        momentum = panel.volume / volume_sma
+    return {"volume_momentum": momentum, "volume_sma": volume_sma}
@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class RangeMax:
+    """
+    Maximum over any range of an append-only series (NaN ignored): an
+    iterative segment tree in 2 * capacity floats, O(log n) per query and
+    O(m + log n) to append m values. Capacity doubles as values are appended.
+    """
+
+    def __init__(self, values=None, capacity: int = 1024):
+        self._capacity = 1 << max(int(capacity) - 1, 1).bit_length()
+        self._tree = np.full(2 * self._capacity, np.nan)
+        self._n = 0
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self, size: int):
+        capacity = 1 << (size - 1).bit_length()
+        tree = np.full(2 * capacity, np.nan)
+        tree[capacity : capacity + self._n] = self._tree[
+            self._capacity : self._capacity + self._n
+        ]
+        self._tree, self._capacity = tree, capacity
+        self._update(capacity, capacity + self._n)
+
+    def _update(self, lo: int, hi: int):
+        """Recompute the parents of the leaves [lo, hi)."""
+        tree = self._tree
+        lo, hi = lo // 2, (hi - 1) // 2
+        while lo >= 1:
+            tree[lo : hi + 1] = np.fmax(
+                tree[2 * lo : 2 * hi + 2 : 2], tree[2 * lo + 1 : 2 * hi + 2 : 2]
+            )
+            lo, hi = lo // 2, hi // 2
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        if self._n + len(values) > self._capacity:
+            self._grow(self._n + len(values))
+        start = self._capacity + self._n
+        self._tree[start : start + len(values)] = values
+        self._n += len(values)
+        self._update(start, start + len(values))
+
+    def query(self, left: int, right: int = None) -> float:
+        """max(values[left:right]); NaN for an empty range."""
+        right = self._n if right is None else min(right, self._n)
+        left = max(left, 0)
+        tree = self._tree
+        result = math.nan
+        left += self._capacity
+        right += self._capacity
+        while left < right:
+            if left & 1:
+                result = np.fmax(result, tree[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                result = np.fmax(result, tree[right])
+            left //= 2
+            right //= 2
+        return float(result)
+
+    def query_many(self, lefts, rights=None) -> np.ndarray:
+        """`query` for arrays of ranges at once (log n vectorized steps)."""
+        lefts = np.maximum(np.asarray(lefts, dtype=np.int64), 0)
+        rights = (
+            np.full(len(lefts), self._n, dtype=np.int64)
+            if rights is None
+            else np.minimum(np.asarray(rights, dtype=np.int64), self._n)
+        )
+        tree = self._tree
+        result = np.full(len(lefts), np.nan)
+        left, right = lefts + self._capacity, rights + self._capacity
+        while True:
+            active = left < right
+            if not active.any():
+                return result
+            take = active & (left & 1 == 1)
+            result[take] = np.fmax(result[take], tree[left[take]])
+            left = left + take
+            take = active & (right & 1 == 1)
+            right = right - take
+            result[take] = np.fmax(result[take], tree[right[take]])
+            left //= 2
+            right //= 2
+
+
+class RunningMoments:
+    """
+    Count, mean and sample variance of an append-only series (NaN skipped),
+    so appending is O(1) per value and reading the moments O(1): `update`
+    adds one value (Welford), `extend` merges a chunk (Chan et al.).
+
+    Matches ``Series.mean()`` / ``Series.std()`` over the full history.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, values=None):
+        self.count = 0
+        self.mean = math.nan
+        self.m2 = 0.0
+        if values is not None:
+            self.extend(values)
+
+    def update(self, x: float):
+        if x != x:
+            return
+        self.count += 1
+        if self.count == 1:
+            self.mean = x
+            return
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        if not self.count:
+            self.count, self.mean, self.m2 = n, mean, m2
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def var(self, ddof: int = 1) -> float:
+        if self.count <= ddof:
+            return math.nan
+        return max(self.m2 / (self.count - ddof), 0.0)
+
+    def std(self, ddof: int = 1) -> float:
+        return math.sqrt(self.var(ddof))
+
+
+class RiskIndex:
+    """
+    Per-symbol risk structures over an append-only klines frame: range max of
+    the highs (drawdown since any entry bar) and running moments of the
+    close-to-close simple returns (`close.pct_change().std()`, missing
+    closes padded as pandas does).
+    """
+
+    def __init__(self, klines: pd.DataFrame = None):
+        self.highs = RangeMax()
+        self.returns = RunningMoments()
+        self.last_close = math.nan
+        if klines is not None:
+            self.extend(klines)
+
+    def __len__(self):
+        return len(self.highs)
+
+    def extend(self, klines: pd.DataFrame) -> "RiskIndex":
+        """Append the rows of `klines` (the rows following the indexed ones)."""
+        if not len(klines):
+            return self
+        self.highs.extend(klines["high"].to_numpy(dtype=np.float64))
+        closes = np.concatenate(
+            [[self.last_close], klines["close"].to_numpy(dtype=np.float64)]
+        )
+        if np.isnan(closes[1:]).any():
+            closes = pd.Series(closes).ffill().to_numpy()
+        self.returns.extend(closes[1:] / closes[:-1] - 1)
+        self.last_close = closes[-1]
+        return self
+
+    def high_since(self, row: int) -> float:
+        return self.highs.query(row)
+
+    def return_std(self) -> float:
+        return self.returns.std()
@@ -0,0 +1,162 @@
+"""
+Execution schedules: parent orders spread over a horizon of equal time
+slices, as timestamped child orders.
+
+- 'twap': equal child sizes in every slice.
+- 'vwap': child sizes proportional to the volume each slice is expected to
+  trade, read from the symbol's intraday (UTC hour of day) volume curve.
+- 'pov': each child takes `participation` of the expected slice volume
+  until the parent is filled; what the horizon cannot absorb is left
+  unscheduled, or with `carry_remainder` goes in a last child at the end
+  of the horizon.
+
+All parents are scheduled at once as (parent x slice) arrays, so thousands
+of parents cost a few vectorized operations.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant.liquidity import HOUR_MS
+
+MODES = ("twap", "vwap", "pov")
+CHILD_COLUMNS = ["parent", "symbol", "side", "size", "price", "time"]
+
+
+@dataclass
+class ExecutionSchedule:
+    # one row per child order: parent (index in the parent orders), symbol,
+    # side, size, price (LIMIT) and time, sorted by time then parent
+    children: pd.DataFrame
+    # per parent, the size the horizon could not absorb (pov only; carried
+    # in a last child with `carry_remainder`)
+    unscheduled: np.ndarray
+
+    def __len__(self):
+        return len(self.children)
+
+
+class ExecutionScheduler:
+    """
+    Schedules parent orders over `slices` slices of `slice_ms` starting at
+    `start` (epoch ms), in `mode`.
+
+    Limit prices step away from the reference price by up to the average
+    spread over the horizon, like the chunks of `optimize_order_execution`.
+    """
+
+    def __init__(
+        self,
+        mode: str = "vwap",
+        slices: int = 12,
+        slice_ms: int = 5 * 60_000,
+        participation: float = 0.1,
+        carry_remainder: bool = False,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"unknown schedule mode : {mode}")
+        if slices < 1:
+            raise ValueError("slices must be positive")
+        if not 0 < participation <= 1:
+            raise ValueError("participation must be in (0, 1]")
+        self.mode = mode
+        self.slices = int(slices)
+        self.slice_ms = int(slice_ms)
+        self.participation = participation
+        self.carry_remainder = carry_remainder
+
+    def slice_times(self, start: int) -> np.ndarray:
+        """Start of each slice, epoch ms."""
+        return start + self.slice_ms * np.arange(self.slices, dtype=np.int64)
+
+    def expected_volumes(self, curves: np.ndarray, start: int) -> np.ndarray:
+        """
+        (curve x slice) volume expected in each slice from hourly volume
+        curves (curve x 24, NaN for unseen hours, which take the curve's
+        mean; all NaN stays NaN).
+        """
+        curves = np.asarray(curves, dtype=np.float64).reshape(-1, 24)
+        seen = ~np.isnan(curves)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fill = np.where(seen, curves, 0.0).sum(axis=1, keepdims=True) / seen.sum(
+                axis=1, keepdims=True
+            )
+        curves = np.where(seen, curves, fill)
+        hours = (self.slice_times(start) // HOUR_MS) % 24
+        return curves[:, hours] * (self.slice_ms / HOUR_MS)
+
+    def schedule(
+        self,
+        symbols: Sequence[str],
+        sides: Sequence[str],
+        sizes: Sequence[float],
+        start: int,
+        curves: Dict[str, np.ndarray],
+        prices: Dict[str, float],
+        spreads: Optional[Dict[str, float]] = None,
+    ) -> ExecutionSchedule:
+        """
+        Child orders of the parents (`symbols[i]`, `sides[i]`, `sizes[i]`),
+        from the hourly volume curve and reference price (and average
+        relative spread) of each symbol.
+        """
+        symbols = np.asarray(symbols, dtype=object)
+        sides = np.asarray(sides, dtype=object)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        n_parents = len(sizes)
+        if not n_parents:
+            return ExecutionSchedule(pd.DataFrame(columns=CHILD_COLUMNS), np.zeros(0))
+        names, codes = np.unique(symbols, return_inverse=True)
+        names = names.tolist()
+
+        if self.mode == "twap":
+            weights = np.full((n_parents, self.slices), 1.0 / self.slices)
+            child_sizes = sizes[:, None] * weights
+            unscheduled = np.zeros(n_parents)
+        else:
+            expected = self.expected_volumes(
+                np.stack([curves[name] for name in names]), start
+            )[codes]
+            if self.mode == "vwap":
+                totals = expected.sum(axis=1, keepdims=True)
+                # no volume information: fall back to equal slices
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    weights = np.where(totals > 0, expected / totals, 1.0 / self.slices)
+                child_sizes = sizes[:, None] * weights
+                unscheduled = np.zeros(n_parents)
+            else:
+                capacity = np.nan_to_num(self.participation * expected)
+                filled = np.minimum(np.cumsum(capacity, axis=1), sizes[:, None])
+                child_sizes = np.diff(filled, axis=1, prepend=0.0)
+                unscheduled = sizes - filled[:, -1]
+                if self.carry_remainder:
+                    # one more slot, at the end of the horizon
+                    child_sizes = np.hstack([child_sizes, unscheduled[:, None]])
+
+        parent, slot = np.nonzero(child_sizes > 0)
+        parent_codes = codes[parent]
+        reference = np.array([prices[name] for name in names], dtype=np.float64)
+        spread = np.array(
+            [(spreads or {}).get(name, 0.0) for name in names], dtype=np.float64
+        )
+        times = start + self.slice_ms * np.arange(child_sizes.shape[1], dtype=np.int64)
+        direction = np.where(sides[parent] == "BUY", 1.0, -1.0)
+        adjustment = slot / self.slices * spread[parent_codes]
+        price = reference[parent_codes] * (1 + direction * adjustment)
+
+        children = pd.DataFrame(
+            {
+                "parent": parent,
+                "symbol": symbols[parent],
+                "side": sides[parent],
+                "size": child_sizes[parent, slot],
+                "price": price,
+                "time": pd.to_datetime(times[slot], unit="ms"),
+            }
+        )
+        # np.nonzero walks parent by parent: reorder to firing order
+        order = np.lexsort((parent, slot))
+        children = children.iloc[order].reset_index(drop=True)
+        return ExecutionSchedule(children, unscheduled)
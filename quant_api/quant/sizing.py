@@ -0,0 +1,245 @@
+"""
+Portfolio weights from the joint covariance of the symbols' returns: risk
+parity (equal risk contributions) or long-only minimum variance, on a
+Ledoit-Wolf shrunk covariance, with per-symbol caps and a total weight.
+
+Both solvers are vectorized iterations over the N x N covariance (Newton
+steps for risk parity, accelerated projected gradient for minimum
+variance) and start from the previous solution when one is given, so
+re-solving after a bar moves the covariance a little takes a few steps.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+MODES = ("risk_parity", "min_variance")
+
+
+def shrunk_covariance(returns: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf covariance of (time x N) returns, shrunk towards the scaled
+    identity, and the shrinkage intensity. Missing returns count as the
+    symbol's mean.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    x = returns - np.nanmean(returns, axis=0)
+    x = np.where(np.isnan(x), 0.0, x)
+    n_obs, n = x.shape
+    sample = x.T @ x / n_obs
+    mu = np.trace(sample) / n
+    delta = ((sample - mu * np.eye(n)) ** 2).sum() / n
+    # mean squared distance of the one-observation estimates to the sample
+    beta = (((x**2).sum(axis=1) ** 2).sum() / n_obs - (sample**2).sum()) / (n * n_obs)
+    shrinkage = min(beta, delta) / delta if delta > 0 else 1.0
+    return shrinkage * mu * np.eye(n) + (1 - shrinkage) * sample, shrinkage
+
+
+def project_capped_simplex(
+    v: np.ndarray, upper: np.ndarray, total: float
+) -> np.ndarray:
+    """
+    Euclidean projection of `v` onto {0 <= w <= upper, sum(w) = total}, exact
+    in O(N log N): sum(clip(v - tau, 0, upper)) is piecewise linear and
+    decreasing in tau, so tau is read off its sorted breakpoints. When the
+    caps sum below `total` the caps are returned.
+    """
+    if upper.sum() <= total:
+        return upper.copy()
+    if total <= 0:
+        return np.zeros_like(v)
+    # the slope drops by one where a weight leaves its cap, rises back where it hits 0
+    points = np.concatenate([v - upper, v])
+    steps = np.concatenate([-np.ones(len(v)), np.ones(len(v))])
+    order = np.argsort(points, kind="stable")
+    points, slopes = points[order], np.cumsum(steps[order])
+    sums = upper.sum() + np.concatenate([[0.0], np.cumsum(slopes[:-1] * np.diff(points))])
+    k = int(np.argmax(sums <= total))
+    tau = points[k - 1] + (total - sums[k - 1]) / slopes[k - 1]
+    return np.clip(v - tau, 0.0, upper)
+
+
+def _degenerate(cov: np.ndarray) -> bool:
+    """Whether a symbol has no variance (a flat or halted one): the solvers'
+    steps divide by it, so the weights are equal instead."""
+    return not (np.diag(cov) > 0).all()
+
+
+def risk_parity(
+    cov: np.ndarray,
+    x0: Optional[np.ndarray] = None,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> Tuple[np.ndarray, int]:
+    """
+    Weights (summing to 1) with equal risk contributions w_i * (cov @ w)_i,
+    and the number of Newton steps taken.
+
+    Minimizes y' cov y / 2 - sum(log y) / N, whose minimizer is the risk
+    parity portfolio up to scale; damped Newton steps keep y > 0. Equal
+    weights when a symbol has no variance.
+    """
+    n = len(cov)
+    budget = 1.0 / n
+    if _degenerate(cov):
+        return np.full(n, budget), 0
+    y = np.asarray(x0, dtype=np.float64) if x0 is not None else 1 / np.sqrt(np.diag(cov))
+    y = np.where(y > 0, y, budget)
+    y /= np.sqrt(y @ cov @ y)  # the minimizer has y' cov y = sum(budgets) = 1
+    for iteration in range(1, max_iter + 1):
+        marginal = cov @ y
+        if np.abs(y * marginal - budget).max() < tol:
+            return y / y.sum(), iteration - 1
+        gradient = marginal - budget / y
+        step = np.linalg.solve(cov + np.diag(budget / y**2), gradient)
+        shrinking = step > 0
+        alpha = min(1.0, 0.95 * (y[shrinking] / step[shrinking]).min(initial=np.inf))
+        y = y - alpha * step
+    return y / y.sum(), max_iter
+
+
+def _polish(
+    cov: np.ndarray, w: np.ndarray, upper: np.ndarray, total: float, tol: float
+) -> Optional[np.ndarray]:
+    """
+    Exact minimum variance weights if the bounds active at `w` are the
+    optimal ones: the equality-constrained solution on the free weights
+    (KKT system), or None when it is infeasible or not optimal.
+    """
+    eps = 1e-9 * total
+    at_upper = w >= upper - eps
+    free = (w > eps) & ~at_upper
+    if not free.any():
+        return None
+    fixed = np.where(at_upper, upper, 0.0)
+    rhs = np.column_stack([np.ones(free.sum()), cov[free] @ fixed])
+    ones, pushed = np.linalg.solve(cov[np.ix_(free, free)], rhs).T
+    # cov_ff w_f + cov_fx w_x = lam * 1 with sum(w_f) = total - sum(w_x)
+    lam = (total - fixed.sum() + pushed.sum()) / ones.sum()
+    polished = fixed.copy()
+    polished[free] = lam * ones - pushed
+    if (polished[free] < -eps).any() or (polished[free] > upper[free] + eps).any():
+        return None
+    gradient = cov @ polished - lam
+    scale = tol * max(np.abs(lam), 1e-300)
+    lower = ~free & ~at_upper
+    if (gradient[lower] < -scale).any() or (gradient[at_upper] > scale).any():
+        return None
+    return np.clip(polished, 0.0, upper)
+
+
+def min_variance(
+    cov: np.ndarray,
+    upper: np.ndarray,
+    total: float = 1.0,
+    x0: Optional[np.ndarray] = None,
+    tol: float = 1e-10,
+    max_iter: int = 1000,
+    polish_every: int = 10,
+) -> Tuple[np.ndarray, int]:
+    """
+    Long-only minimum variance weights under `upper` caps summing to
+    `total`, and the number of iterations taken.
+
+    Accelerated projected gradient (FISTA with restarts) finds the active
+    bounds; every `polish_every` iterations the KKT system on the free
+    weights is tried, which ends the search exactly once the bounds are
+    right (from a warm start, usually at the first try). Equal weights
+    (within the caps) when a symbol has no variance.
+    """
+    n = len(cov)
+    if _degenerate(cov):
+        return project_capped_simplex(np.full(n, total / n), upper, total), 0
+    # step 1 / L with L bounding the largest eigenvalue (power iteration, padded)
+    vector = np.ones(n) / np.sqrt(n)
+    for _ in range(30):
+        vector = cov @ vector
+        vector /= np.linalg.norm(vector)
+    lipschitz = 1.1 * (vector @ cov @ vector)
+
+    start = np.full(n, total / n) if x0 is None else np.asarray(x0, dtype=np.float64)
+    w = project_capped_simplex(start, upper, total)
+    if x0 is not None:
+        polished = _polish(cov, w, upper, total, 1e-8)
+        if polished is not None:
+            return polished, 0
+    z, momentum = w, 1.0
+    for iteration in range(1, max_iter + 1):
+        w_next = project_capped_simplex(z - cov @ z / lipschitz, upper, total)
+        if np.abs(w_next - w).max() < tol * max(total, 1.0):
+            return w_next, iteration
+        if iteration % polish_every == 0:
+            polished = _polish(cov, w_next, upper, total, 1e-8)
+            if polished is not None:
+                return polished, iteration
+        if (z - w_next) @ (w_next - w) > 0:  # objective went up: restart momentum
+            momentum = 1.0
+        momentum_next = (1 + np.sqrt(1 + 4 * momentum**2)) / 2
+        z = w_next + (momentum - 1) / momentum_next * (w_next - w)
+        w, momentum = w_next, momentum_next
+    return w, max_iter
+
+
+class PortfolioSizer:
+    """
+    Weights of `symbols` from a window of their returns, solved in `mode`
+    with the total weight `leverage` and per-symbol caps `upper` (fractions
+    of the leverage). Keeps the last solution to warm-start the next one.
+
+    Symbols without returns in the window get no weight; when one of the
+    others has no variance, they share the weight equally.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        mode: str = "risk_parity",
+        leverage: float = 1.0,
+        upper: Optional[np.ndarray] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"unknown sizing mode : {mode}")
+        self.symbols = list(symbols)
+        self.mode = mode
+        self.leverage = leverage
+        self.upper = (
+            np.ones(len(symbols)) if upper is None else np.asarray(upper, dtype=float)
+        )
+        self.weights: Optional[np.ndarray] = None
+        self.iterations = 0
+        self.shrinkage = float("nan")
+
+    def solve(self, returns: np.ndarray) -> Dict[str, float]:
+        returns = np.asarray(returns, dtype=np.float64)
+        observed = (~np.isnan(returns)).sum(axis=0) > 1
+        weights = np.zeros(len(self.symbols))
+        if not observed.any():
+            self.weights = None
+            return dict(zip(self.symbols, weights.tolist()))
+
+        upper = self.upper[observed] * self.leverage
+        if not (np.nanvar(returns[:, observed], axis=0) > 0).all():
+            # a flat symbol: shrinkage would hide it and the solvers pile onto it
+            k = int(observed.sum())
+            weights[observed] = project_capped_simplex(
+                np.full(k, self.leverage / k), upper, self.leverage
+            )
+            self.weights, self.iterations = weights, 0
+            return dict(zip(self.symbols, weights.tolist()))
+
+        cov, self.shrinkage = shrunk_covariance(returns[:, observed])
+        previous = None if self.weights is None else self.weights[observed]
+
+        if self.mode == "risk_parity":
+            solved, self.iterations = risk_parity(cov, x0=previous)
+            solved *= self.leverage
+            if (solved > upper).any():
+                # capped: the nearest allocation within the caps
+                solved = project_capped_simplex(solved, upper, self.leverage)
+        else:
+            solved, self.iterations = min_variance(
+                cov, upper, self.leverage, x0=previous
+            )
+
+        weights[observed] = solved
+        self.weights = weights
+        return dict(zip(self.symbols, weights.tolist()))
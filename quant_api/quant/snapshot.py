@@ -0,0 +1,204 @@
+"""
+Binary snapshots of the computational state of a `MultiAssetCryptoStrategy`:
+the incremental indicator state (rolling buffers, EWM values, correlation
+window), positions, pending orders, the sizer's last weights and, optionally,
+the metric cache.
+
+A snapshot is `MAGIC`, a format version byte and the zlib-compressed pickle
+of the state. Restoring it against the latest klines checks that the bar the
+snapshot ended on is still in them, with the same close, and replays the
+bars that closed since, so a restarted strategy signals again after a few
+updates instead of a full warm-up.
+
+Snapshots are pickles: only load the ones this service wrote.
+"""
+import math
+import os
+import pickle
+import zlib
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant.market_data import TIME_INDEX, bar_times
+from quant_api.utils.frames import taker_volumes
+
+MAGIC = b"QSNP"
+# 2: orders carry a release time; 3: one RunningMoments class
+VERSION = 3
+# float32 (compact) frames round closes to about 1e-7
+CLOSE_TOLERANCE = 1e-6
+
+
+class SnapshotError(ValueError):
+    """The snapshot is unreadable or does not fit the strategy / the bars."""
+
+
+def _layout(strategy) -> Dict:
+    # parameters the shape of the state depends on
+    return {
+        "symbols": list(strategy.symbols),
+        "vol_window": strategy.vol_window,
+        "rsi_period": strategy.rsi_period,
+        "lookback_periods": dict(strategy.lookback_periods),
+        "sizing_mode": strategy.sizing_mode,
+    }
+
+
+def dump_snapshot(strategy, include_cache: bool = True, level: int = 1) -> bytes:
+    """Snapshot of `strategy` (zlib `level`, 1 favours speed)."""
+    state = {
+        "layout": _layout(strategy),
+        "indicator_engine": strategy.indicator_engine,
+        "positions": strategy.positions,
+        "historical_positions": strategy.historical_positions,
+        "pending_orders": strategy.pending_orders,
+        "entry_highs": strategy._entry_highs,
+        "sizer": strategy._sizer,
+        "metric_cache": strategy._metric_cache if include_cache else None,
+    }
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    return MAGIC + bytes([VERSION]) + zlib.compress(payload, level)
+
+
+STATE_KEYS = {
+    "layout",
+    "indicator_engine",
+    "positions",
+    "historical_positions",
+    "pending_orders",
+    "entry_highs",
+    "sizer",
+    "metric_cache",
+}
+
+
+def _parse(data: bytes) -> Dict:
+    if len(data) <= len(MAGIC) or data[: len(MAGIC)] != MAGIC:
+        raise SnapshotError("not a strategy snapshot")
+    version = data[len(MAGIC)]
+    if version != VERSION:
+        raise SnapshotError(f"unsupported snapshot version : {version}")
+    try:
+        state = pickle.loads(zlib.decompress(data[len(MAGIC) + 1 :]))
+    except Exception as e:
+        # unpickling also fails on classes renamed or moved since the dump
+        raise SnapshotError(f"corrupt snapshot : {type(e).__name__}: {e}") from None
+    if not isinstance(state, dict) or not STATE_KEYS <= state.keys():
+        raise SnapshotError("corrupt snapshot : missing state")
+    return state
+
+
+def _missed_bars(
+    engine, klines_data: Dict[str, pd.DataFrame]
+) -> Dict[str, pd.DataFrame]:
+    """Per symbol, the bars after the snapshot's last one (validated)."""
+    missed = {}
+    for symbol, last_time in engine.last_times.items():
+        if last_time is None:
+            raise SnapshotError(f"no bar time in the snapshot for {symbol}")
+        if symbol not in klines_data:
+            raise SnapshotError(f"no klines for {symbol}")
+        klines = klines_data[symbol]
+        times = bar_times(klines)
+        if times is None:
+            raise SnapshotError(f"klines of {symbol} have no bar times")
+        row = int(np.searchsorted(times, last_time))
+        if row == len(times) or times[row] != last_time:
+            raise SnapshotError(f"last snapshot bar of {symbol} is not in the klines")
+        close = float(klines["close"].iloc[row])
+        if not math.isclose(
+            close, engine.latest(symbol)["close"], rel_tol=CLOSE_TOLERANCE
+        ):
+            raise SnapshotError(f"last snapshot bar of {symbol} has changed")
+        missed[symbol] = klines.iloc[row + 1 :]
+    return missed
+
+
+def load_snapshot(
+    strategy,
+    data: bytes,
+    klines_data: Optional[Dict[str, pd.DataFrame]] = None,
+) -> int:
+    """
+    Restore a snapshot into `strategy` (built with the same symbols and
+    windows). With `klines_data` (strategy layout with bar times) the
+    snapshot is first validated against them, then the bars it missed are
+    replayed through `update_bars`. Nothing is changed when validation
+    fails (`SnapshotError`).
+
+    Returns:
+        the number of bar steps replayed.
+    """
+    state = _parse(data)
+    if state["layout"] != _layout(strategy):
+        raise SnapshotError("snapshot of a strategy with other parameters")
+    engine = state["indicator_engine"]
+    try:
+        missed = _missed_bars(engine, klines_data) if klines_data is not None else {}
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(
+            f"snapshot does not fit the klines : {type(e).__name__}: {e}"
+        ) from None
+
+    strategy.indicator_engine = engine
+    strategy.positions = state["positions"]
+    strategy.historical_positions = state["historical_positions"]
+    strategy.pending_orders = state["pending_orders"]
+    strategy._entry_highs = state["entry_highs"]
+    strategy._sizer = state["sizer"]
+    if state["metric_cache"] is not None:
+        state["metric_cache"].max_entries = strategy._metric_cache.max_entries
+        strategy._metric_cache = state["metric_cache"]
+    return _replay(strategy, missed)
+
+
+def _replay(strategy, missed: Dict[str, pd.DataFrame]) -> int:
+    # bar steps on the union of the missed times, like the live loop
+    columns = ["open", "high", "low", "close", "volume"]
+    rows, takers = {}, {}
+    for symbol, klines in missed.items():
+        if not len(klines):
+            continue
+        times = bar_times(klines).tolist()
+        values = klines[columns].to_numpy(dtype=np.float64).tolist()
+        rows[symbol] = dict(zip(times, values))
+        if strategy.volume_source == "klines" and "takerBaseVolume" in klines:
+            buy, sell = taker_volumes(klines)
+            takers[symbol] = dict(zip(times, zip(buy.tolist(), sell.tolist())))
+
+    steps = sorted(set().union(*rows.values())) if rows else []
+    for time in steps:
+        bars = {
+            symbol: {TIME_INDEX: time, **dict(zip(columns, by_time[time]))}
+            for symbol, by_time in rows.items()
+            if time in by_time
+        }
+        strategy.update_bars(bars)
+        for symbol in bars.keys() & takers.keys():
+            strategy.indicator_engine.add_trades(symbol, *takers[symbol][time])
+    return len(steps)
+
+
+def atomic_write(path: str, data: bytes) -> int:
+    """Write a temporary file then rename it: a crash never leaves a torn file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def write_snapshot(path: str, strategy, include_cache: bool = True) -> int:
+    """Write a snapshot of `strategy` to `path`; returns its size."""
+    return atomic_write(path, dump_snapshot(strategy, include_cache))
+
+
+def read_snapshot(
+    path: str, strategy, klines_data: Optional[Dict[str, pd.DataFrame]] = None
+) -> int:
+    with open(path, "rb") as f:
+        return load_snapshot(strategy, f.read(), klines_data)
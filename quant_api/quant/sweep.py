@@ -0,0 +1,402 @@
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.backtest import Backtester, ms_timestamps, trade_feed
+from quant_api.quant.panel import PANEL_FIELDS, MarketPanel
+from quant_api.utils.frames import buy_mask
+
+TRADE_FIELDS = ("time", "quantity", "is_buy")
+
+
+class SharedMarketData:
+    """
+    Klines panel and trades of every symbol, stored once in shared memory.
+
+    With trade times and bar timestamps, the trades are reduced once, in the
+    creating process, to the cumulative buy/sell volume at the end of every
+    bar (the backtester's trade feed, a (2, bars, symbols) block) and the
+    mean trade size per symbol: workers then read those instead of
+    rebuilding trades frames.
+
+    Instances pickle to a small descriptor (block names and shapes), so worker
+    processes map the same pages instead of receiving a copy of the data.
+    The creating process owns the blocks and must `unlink` them when done
+    (or use the instance as a context manager).
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        lengths: np.ndarray,
+        n_bars: int,
+        klines_block: str,
+        trade_offsets: Optional[np.ndarray] = None,
+        trades_block: Optional[str] = None,
+        has_trade_time: bool = False,
+        timestamps: Optional[np.ndarray] = None,
+        feed_block: Optional[str] = None,
+        avg_trade_sizes: Optional[Dict[str, float]] = None,
+    ):
+        self.symbols = symbols
+        self.lengths = lengths
+        self.n_bars = n_bars
+        self.klines_block = klines_block
+        self.trade_offsets = trade_offsets
+        self.trades_block = trades_block
+        self.has_trade_time = has_trade_time
+        self.timestamps = timestamps
+        self.feed_block = feed_block
+        self.avg_trade_sizes = avg_trade_sizes
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+
+    @classmethod
+    def create(
+        cls,
+        klines_data: Dict[str, pd.DataFrame],
+        trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+        symbols: Optional[List[str]] = None,
+        timestamps=None,
+    ) -> "SharedMarketData":
+        symbols = list(symbols or klines_data)
+        panel = MarketPanel.from_klines(klines_data, symbols)
+        n_bars = panel.shape[0]
+
+        klines = shared_memory.SharedMemory(
+            create=True,
+            size=max(len(PANEL_FIELDS) * n_bars * len(symbols) * 8, 1),
+        )
+        view = np.ndarray(
+            (len(PANEL_FIELDS), n_bars, len(symbols)), dtype=np.float64, buffer=klines.buf
+        )
+        for i, field_name in enumerate(PANEL_FIELDS):
+            view[i] = getattr(panel, field_name)
+
+        trades, offsets, has_trade_time = None, None, False
+        feed, avg_trade_sizes = None, None
+        if trades_data is not None and timestamps is not None:
+            cumulative = trade_feed(trades_data, symbols, ms_timestamps(timestamps))
+            if cumulative is not None:
+                feed = shared_memory.SharedMemory(
+                    create=True, size=max(2 * n_bars * len(symbols) * 8, 1)
+                )
+                view = np.ndarray(
+                    (2, n_bars, len(symbols)), dtype=np.float64, buffer=feed.buf
+                )
+                for j, symbol in enumerate(symbols):
+                    view[0, :, j], view[1, :, j] = cumulative[symbol]
+                avg_trade_sizes = {
+                    symbol: float(trades_data[symbol]["quantity"].mean())
+                    if len(trades_data[symbol])
+                    else float("nan")
+                    for symbol in symbols
+                }
+        if trades_data is not None and feed is None:
+            sizes = [len(trades_data[symbol]) for symbol in symbols]
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+            has_trade_time = all("time" in trades_data[s].columns for s in symbols)
+            trades = shared_memory.SharedMemory(
+                create=True, size=max(len(TRADE_FIELDS) * int(offsets[-1]) * 8, 1)
+            )
+            view = np.ndarray(
+                (len(TRADE_FIELDS), int(offsets[-1])), dtype=np.float64, buffer=trades.buf
+            )
+            for j, symbol in enumerate(symbols):
+                frame = trades_data[symbol]
+                if has_trade_time:
+                    frame = frame.sort_values("time")
+                block = slice(offsets[j], offsets[j + 1])
+                view[0, block] = frame["time"] if has_trade_time else np.nan
+                view[1, block] = frame["quantity"].to_numpy(dtype=np.float64)
+                view[2, block] = buy_mask(frame)
+
+        shared = cls(
+            symbols=symbols,
+            lengths=panel.lengths,
+            n_bars=n_bars,
+            klines_block=klines.name,
+            trade_offsets=offsets,
+            trades_block=trades.name if trades is not None else None,
+            has_trade_time=has_trade_time,
+            timestamps=None if timestamps is None else np.asarray(timestamps),
+            feed_block=feed.name if feed is not None else None,
+            avg_trade_sizes=avg_trade_sizes,
+        )
+        for block in (klines, trades, feed):
+            if block is not None:
+                shared._blocks[block.name] = block
+        return shared
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_blocks"] = {}
+        return state
+
+    def _attach(self, name: str) -> shared_memory.SharedMemory:
+        if name not in self._blocks:
+            self._blocks[name] = shared_memory.SharedMemory(name=name)
+        return self._blocks[name]
+
+    def panel(self) -> MarketPanel:
+        """(time x symbol) arrays viewing the shared block, no copy."""
+        view = np.ndarray(
+            (len(PANEL_FIELDS), self.n_bars, len(self.symbols)),
+            dtype=np.float64,
+            buffer=self._attach(self.klines_block).buf,
+        )
+        view.flags.writeable = False
+        return MarketPanel(
+            symbols=list(self.symbols),
+            lengths=self.lengths,
+            **{name: view[i] for i, name in enumerate(PANEL_FIELDS)},
+        )
+
+    def trade_feed(self) -> Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Per-symbol (cumulative buy, cumulative sell) views of the feed block."""
+        if self.feed_block is None:
+            return None
+        view = np.ndarray(
+            (2, self.n_bars, len(self.symbols)),
+            dtype=np.float64,
+            buffer=self._attach(self.feed_block).buf,
+        )
+        view.flags.writeable = False
+        return {
+            symbol: (view[0, :, j], view[1, :, j])
+            for j, symbol in enumerate(self.symbols)
+        }
+
+    def trades(self) -> Optional[Dict[str, pd.DataFrame]]:
+        """Per-symbol trades frames in the strategy's layout (quantity, side[, time])."""
+        if self.trades_block is None:
+            return None
+        offsets = self.trade_offsets
+        view = np.ndarray(
+            (len(TRADE_FIELDS), int(offsets[-1])),
+            dtype=np.float64,
+            buffer=self._attach(self.trades_block).buf,
+        )
+        frames = {}
+        for j, symbol in enumerate(self.symbols):
+            block = slice(offsets[j], offsets[j + 1])
+            columns = {
+                "quantity": view[1, block],
+                "side": np.where(view[2, block] > 0, "BUY", "SELL"),
+            }
+            if self.has_trade_time:
+                columns["time"] = view[0, block]
+            frames[symbol] = pd.DataFrame(columns)
+        return frames
+
+    def close(self):
+        for block in self._blocks.values():
+            block.close()
+        self._blocks = {}
+
+    def unlink(self):
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+@dataclass
+class SweepResult:
+    index: int
+    params: Dict[str, Any]
+    score: float
+    stats: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def set_param(params: Dict[str, Any], key: str, value: Any) -> Dict[str, Any]:
+    """
+    Return a copy of `params` with `key` set; dotted keys reach into nested
+    dicts (e.g. "lookback_periods.correlation").
+    """
+    params = dict(params)
+    head, _, rest = key.partition(".")
+    if rest:
+        params[head] = set_param(params.get(head) or {}, rest, value)
+    else:
+        params[head] = value
+    return params
+
+
+def grid_candidates(grid: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+    """Every combination of the grid values, in row-major order."""
+    keys = list(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def random_candidates(
+    space: Dict[str, Any], n_samples: int, seed: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Random search over `space`. A list is sampled uniformly as choices; a dict
+    {"low", "high", "log"=False} is a uniform (or log-uniform) range, integer
+    valued when both bounds are integers.
+    """
+    rng = random.Random(seed)
+    for _ in range(n_samples):
+        candidate = {}
+        for key, spec in space.items():
+            if isinstance(spec, dict):
+                low, high = spec["low"], spec["high"]
+                if spec.get("log"):
+                    value = math.exp(rng.uniform(math.log(low), math.log(high)))
+                else:
+                    value = rng.uniform(low, high)
+                if isinstance(low, int) and isinstance(high, int):
+                    value = min(max(int(round(value)), low), high)
+                candidate[key] = value
+            else:
+                candidate[key] = rng.choice(list(spec))
+        yield candidate
+
+
+# Per worker process state, set once by `_init_worker`
+_worker = {}
+
+
+def _init_worker(market: SharedMarketData, backtest_params: Dict[str, Any]):
+    _worker["market"] = market
+    _worker["panel"] = market.panel()
+    _worker["trade_feed"] = market.trade_feed()
+    # frames only when the trades could not be reduced to a feed
+    _worker["trades"] = market.trades() if _worker["trade_feed"] is None else None
+    _worker["backtest_params"] = backtest_params
+
+
+def _evaluate(index: int, params: Dict[str, Any], metric: str) -> SweepResult:
+    start = time.perf_counter()
+    market = _worker["market"]
+    try:
+        strategy = MultiAssetCryptoStrategy(**params)
+        stats = Backtester(
+            strategy,
+            _worker["panel"],
+            _worker["trades"],
+            timestamps=market.timestamps,
+            avg_trade_sizes=(
+                market.avg_trade_sizes if strategy.volume_source == "trades" else None
+            ),
+            trade_feed=_worker["trade_feed"],
+            **_worker["backtest_params"],
+        ).run().stats
+    except Exception as e:
+        return SweepResult(
+            index=index,
+            params=params,
+            score=float("nan"),
+            error=f"{type(e).__name__}: {e}",
+            elapsed=time.perf_counter() - start,
+        )
+    return SweepResult(
+        index=index,
+        params=params,
+        score=float(stats.get(metric, float("nan"))),
+        stats=stats,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+class ParameterSweep:
+    """
+    Evaluate strategy parameter combinations by backtest, in parallel.
+
+    The market data is shared once with every worker (`SharedMarketData`);
+    each combination only ships its parameters. Results are yielded as they
+    complete. With `patience`, the sweep stops after that many consecutive
+    results without improving the best `metric`.
+    """
+
+    def __init__(
+        self,
+        market: SharedMarketData,
+        base_params: Dict[str, Any],
+        backtest_params: Optional[Dict[str, Any]] = None,
+        metric: str = "sharpe",
+        maximize: bool = True,
+        patience: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.market = market
+        self.base_params = dict(base_params, symbols=list(market.symbols))
+        self.backtest_params = backtest_params or {}
+        self.metric = metric
+        self.maximize = maximize
+        self.patience = patience
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.best: Optional[SweepResult] = None
+
+    def _improves(self, result: SweepResult) -> bool:
+        if result.error is not None or math.isnan(result.score):
+            return False
+        if self.best is None:
+            return True
+        if self.maximize:
+            return result.score > self.best.score
+        return result.score < self.best.score
+
+    def run(self, candidates: Iterable[Dict[str, Any]]) -> Iterator[SweepResult]:
+        candidates = iter(enumerate(candidates))
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # sweeps start from a server thread: do not fork its event loop
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.market, self.backtest_params),
+        )
+        pending = set()
+        since_best = 0
+
+        def submit():
+            # bounded in-flight work, so early stopping does not leave a backlog
+            while len(pending) < 2 * self.max_workers:
+                try:
+                    index, overrides = next(candidates)
+                except StopIteration:
+                    return
+                params = self.base_params
+                for key, value in overrides.items():
+                    params = set_param(params, key, value)
+                pending.add(pool.submit(_evaluate, index, params, self.metric))
+
+        try:
+            submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    result = future.result()
+                    if self._improves(result):
+                        self.best = result
+                        since_best = 0
+                    else:
+                        since_best += 1
+                    yield result
+                    if self.patience is not None and since_best >= self.patience:
+                        return
+                submit()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,35 @@
+"""
+Module-level entry points for strategy work, so they can be shipped to a
+worker process (everything here takes and returns picklable values).
+"""
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.quant.backtest import Backtester, BacktestResult
+
+
+def run_iteration(
+    params: Dict[str, Any],
+    klines_data: Dict[str, pd.DataFrame],
+    trades_data: Dict[str, pd.DataFrame],
+) -> List[Order]:
+    strategy = MultiAssetCryptoStrategy(**params)
+    return strategy.run_iteration(klines_data=klines_data, trades_data=trades_data)
+
+
+def run_backtest(
+    params: Dict[str, Any],
+    klines_data: Dict[str, pd.DataFrame],
+    trades_data: Optional[Dict[str, pd.DataFrame]] = None,
+    timestamps=None,
+    backtest_params: Optional[Dict[str, Any]] = None,
+) -> BacktestResult:
+    return Backtester(
+        MultiAssetCryptoStrategy(**params),
+        klines_data,
+        trades_data,
+        timestamps=timestamps,
+        **(backtest_params or {}),
+    ).run()
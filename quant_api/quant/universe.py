@@ -0,0 +1,83 @@
+"""
+Universe selection: keep the symbols whose 24h volume in USD reaches the
+strategy's `min_trade_volume`, from 24h ticker rows (Binance
+/api/v3/ticker/24hr, FULL or MINI) before any per-symbol data is loaded.
+
+Symbols may be fnmatch patterns ("*USDT" is every listed USDT pair), expanded
+against the ticker symbols.
+"""
+import fnmatch
+from typing import Dict, Iterable, List, Optional
+
+# quoted in USD (or pegged to it), the quote volume is the USD volume
+USD_QUOTES = ("USDT", "USDC", "FDUSD", "TUSD", "BUSD", "DAI")
+# other quotes are converted through their <quote>USDT ticker (longest suffix wins)
+QUOTES = sorted(
+    USD_QUOTES + ("BTC", "ETH", "BNB", "SOL", "XRP", "TRX", "DOGE", "EUR", "TRY", "BRL"),
+    key=len,
+    reverse=True,
+)
+
+
+def is_pattern(symbol: str) -> bool:
+    return any(char in symbol for char in "*?[")
+
+
+def quote_asset(symbol: str) -> Optional[str]:
+    for quote in QUOTES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return quote
+    return None
+
+
+def conversion_symbols(symbols: Iterable[str]) -> List[str]:
+    """<quote>USDT tickers needed to price the quote volume of `symbols` in USD."""
+    needed = []
+    for symbol in symbols:
+        quote = quote_asset(symbol)
+        if quote is not None and quote not in USD_QUOTES:
+            pair = f"{quote}USDT"
+            if pair not in needed and pair not in symbols:
+                needed.append(pair)
+    return needed
+
+
+def usd_volumes(tickers: List[dict]) -> Dict[str, float]:
+    """
+    24h volume in USD per ticker symbol; symbols whose quote cannot be priced
+    in USD are left out.
+    """
+    rows = {row["symbol"]: row for row in tickers}
+    volumes = {}
+    for symbol, row in rows.items():
+        quote = quote_asset(symbol)
+        if quote in USD_QUOTES:
+            volumes[symbol] = float(row["quoteVolume"])
+        elif quote is not None and f"{quote}USDT" in rows:
+            price = float(rows[f"{quote}USDT"]["lastPrice"])
+            volumes[symbol] = float(row["quoteVolume"]) * price
+    return volumes
+
+
+def expand(symbols: List[str], listed: Iterable[str]) -> List[str]:
+    """Requested symbols with the patterns replaced by the matching listed symbols."""
+    listed = sorted(listed)
+    expanded = []
+    for symbol in symbols:
+        matches = fnmatch.filter(listed, symbol) if is_pattern(symbol) else [symbol]
+        expanded.extend(match for match in matches if match not in expanded)
+    return expanded
+
+
+def select(
+    symbols: List[str], volumes: Dict[str, float], min_trade_volume: float
+) -> List[str]:
+    """
+    `symbols` (patterns expanded) whose USD volume reaches `min_trade_volume`,
+    in the requested order. Symbols without a volume are dropped.
+    """
+    return [
+        symbol
+        for symbol in expand(symbols, volumes)
+        if symbol in volumes and volumes[symbol] >= min_trade_volume
+    ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional, Literal, Union
 import uuid
 import datetime
 
@@ -20,3 +20,41 @@ class MultiAssetCryptoStrategy(BaseModel):
     max_correlation: float = 0.7
     rsi_period: int = 14
     rsi_thresholds: Tuple[float, float] = (30, 70)
+    panel_mode: bool = False
+    correlation_mode: Literal["rolling", "latest"] = "rolling"
+    # float32 frames for large histories; float32 indicators with panel_mode only
+    compact: bool = False
+    # buy/sell pressure from the trades or the klines taker volume (no trades download)
+    volume_source: Literal["trades", "klines"] = "trades"
+    # per-symbol heuristic, or weights solved on the shrunk returns covariance
+    sizing_mode: Literal["heuristic", "risk_parity", "min_variance"] = "heuristic"
+    # market impact (and order splitting) model, see quant_api.quant.liquidity
+    impact_model: Literal["linear", "sqrt"] = "linear"
+    impact_coefficient: float = 1.0
+    # Monte Carlo paths of the positions' VaR / CVaR (0: not computed)
+    tail_risk_paths: int = 0
+    # split orders released over time slices (None: all children at once)
+    execution_schedule: Optional[Literal["twap", "vwap", "pov"]] = None
+    # max share of a slice's expected volume for "pov"
+    participation: float = 0.1
+
+
+class BacktestParams(BaseModel):
+    initial_cash: float = 100000.0
+    fee_rate: float = 0.001  # Taker fee per fill
+    slippage: float = 0.0  # Fraction of the open applied to MARKET fills
+    limit_ttl: int = 1  # Bars a LIMIT order stays working
+    warmup_bars: Optional[int] = None  # Defaults to the longest indicator window
+
+
+class SweepParams(BaseModel):
+    # Either a grid (every combination) or a random search space; dotted keys
+    # such as "lookback_periods.correlation" set nested values
+    grid: Dict[str, List[Any]] = {}
+    random: Dict[str, Union[List[Any], Dict[str, Any]]] = {}
+    n_samples: int = 20  # Random search draws
+    seed: Optional[int] = None
+    metric: str = "sharpe"  # Backtest stat to optimize
+    maximize: bool = True
+    patience: Optional[int] = None  # Stop after this many results without improvement
+    max_workers: Optional[int] = None  # Defaults to the number of cores
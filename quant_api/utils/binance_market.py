@@ -7,6 +7,7 @@ import pandas as pd
 import asyncio
 from typing import Dict, Union, Optional
 from quant_api.configs import settings
+from quant_api.utils.metrics import metrics
 import logging
 
 logger = logging.getLogger("uvicorn")
@@ -16,13 +17,16 @@ def extract_zip_content(
     zip_content, return_type="df"
 ) -> Dict[str, Union[pd.DataFrame, str, bytes]]:
     with ZipFile(BytesIO(zip_content)) as zf:
-        if return_type == "df":
-            result = {
-                file_name: pd.read_csv(zf.open(file_name), header=None)
-                for file_name in zf.namelist()
-            }
-        else:
-            result = {file_name: zf.read(file_name) for file_name in zf.namelist()}
+        result = {}
+        for file_name in zf.namelist():
+            with metrics.stage("unzip"):
+                content = zf.read(file_name)
+            metrics.count_bytes("unzip", len(content))
+            if return_type == "df":
+                with metrics.stage("csv_parse"):
+                    content = pd.read_csv(BytesIO(content), header=None)
+                metrics.count_rows("csv_parse", len(content))
+            result[file_name] = content
         return result
 
 
@@ -111,9 +115,11 @@ class BinanceMarket:
 
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.get(url)
-            except:
+                with metrics.stage("download"):
+                    response = await client.get(url)
+            except Exception:  # let cancellation through
                 raise Exception(f"cannot find url : {url}")
+            metrics.count_bytes("download", len(response.content))
             result = await asyncio.to_thread(
                 extract_zip_content, response.content, return_type
             )
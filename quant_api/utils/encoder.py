@@ -1,5 +1,6 @@
 import json
 import dataclasses
+import datetime
 import numpy as np
 
 class EnhancedJSONEncoder(json.JSONEncoder):
@@ -13,4 +14,6 @@ class EnhancedJSONEncoder(json.JSONEncoder):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
+        elif isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
         return json.JSONEncoder.default(self, obj)
@@ -0,0 +1,223 @@
+import bisect
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from quant_api.configs import settings
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# (stage, seconds) recorded in the current request / job, for Server-Timing
+_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "server_timings", default=None
+)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label: str):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for value, total in sorted(self._values.items()):
+                lines.append(f'{self.name}{{{self.label}="{value}"}} {total:g}')
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        # label value -> [per bucket counts (+inf last), sum, count]
+        self._series: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for value, (counts, total, count) in sorted(self._series.items()):
+                label = f'{self.label}="{value}"'
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{self.name}_sum{{{label}}} {total:g}")
+                lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("histogram", "name", "start")
+
+    def __init__(self, histogram: Histogram, name: str):
+        self.histogram = histogram
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.histogram.observe(self.name, elapsed)
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((self.name, elapsed))
+        return False
+
+
+class Metrics:
+    """
+    Process-wide timing histograms and throughput counters for the quant
+    pipeline, rendered in the Prometheus text format.
+
+    When disabled every hook returns immediately (timers are a shared no-op
+    context manager), so the instrumentation can stay in hot paths.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stage_seconds = Histogram(
+            "quant_stage_seconds", "Time spent in each quant pipeline stage.", "stage"
+        )
+        self.upstream_seconds = Histogram(
+            "quant_upstream_seconds", "Latency of upstream Binance requests.", "target"
+        )
+        self.bytes_total = Counter(
+            "quant_bytes_total", "Bytes processed by each stage.", "stage"
+        )
+        self.rows_total = Counter(
+            "quant_rows_total", "Rows processed by each stage.", "stage"
+        )
+        self.ws_frames_total = Counter(
+            "quant_ws_frames_total", "WebSocket frames relayed by direction.", "direction"
+        )
+
+    def stage(self, name: str):
+        """Context manager timing one pipeline stage."""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self.stage_seconds, name)
+
+    def timed(self, name: str):
+        """Decorator timing every call of a function as stage `name`."""
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self.stage_seconds, name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def upstream(self, target: str):
+        """Context manager timing one upstream request."""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self.upstream_seconds, target)
+
+    def record_stages(self, timings: Sequence[Tuple[str, float]], observe: bool = True):
+        """
+        Merge stage timings measured elsewhere into the current request; with
+        `observe` (timings from another process) into the histograms as well.
+        """
+        if not self.enabled:
+            return
+        current = _timings.get()
+        for name, seconds in timings:
+            if observe:
+                self.stage_seconds.observe(name, seconds)
+            if current is not None:
+                current.append((name, seconds))
+
+    def count_bytes(self, stage: str, n: int):
+        if self.enabled:
+            self.bytes_total.inc(stage, n)
+
+    def count_rows(self, stage: str, n: int):
+        if self.enabled:
+            self.rows_total.inc(stage, n)
+
+    def count_frame(self, direction: str):
+        if self.enabled:
+            self.ws_frames_total.inc(direction)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (
+            self.stage_seconds,
+            self.upstream_seconds,
+            self.bytes_total,
+            self.rows_total,
+            self.ws_frames_total,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def collect_timings():
+    """Start collecting stage timings in the current context; returns the list."""
+    timings: List[Tuple[str, float]] = []
+    _timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: Sequence[Tuple[str, float]]) -> str:
+    """Server-Timing value, summing repeated stages (durations in ms)."""
+    totals: Dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items())
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,130 @@
+"""
+Deterministic synthetic market data in the Binance archive layout
+(`settings.KLINES_COLUMNS` / `settings.TRADES_COLUMNS`), for benchmarks and
+offline runs. The same (symbol, seed) always produces the same data,
+whatever other symbols are generated alongside it.
+"""
+import zipfile
+import zlib
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quant_api.configs import settings
+
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00:00 UTC
+
+
+def symbol_rng(symbol: str, seed: int, stream: str) -> np.random.Generator:
+    return np.random.default_rng([seed, zlib.crc32(f"{symbol}:{stream}".encode())])
+
+
+def synthetic_klines(
+    symbol: str,
+    n_bars: int,
+    seed: int = 0,
+    interval_ms: int = 60_000,
+    start_ms: int = START_MS,
+) -> pd.DataFrame:
+    """
+    Geometric random walk bars with the archive columns ("open" / "close" are
+    the bar open / close times, "openPrice" / "last" the prices).
+    """
+    rng = symbol_rng(symbol, seed, "klines")
+    base_price = float(np.exp(rng.uniform(np.log(0.1), np.log(50_000))))
+    close = base_price * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    open_ = np.concatenate([[base_price], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n_bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n_bars))
+    volume = rng.lognormal(3, 0.7, n_bars)
+    count = rng.integers(1, 2_000, n_bars)
+    taker_base = volume * rng.uniform(0.3, 0.7, n_bars)
+    open_time = start_ms + interval_ms * np.arange(n_bars, dtype=np.int64)
+    vwap = (open_ + high + low + close) / 4
+
+    frame = pd.DataFrame(
+        {
+            "open": open_time,
+            "openPrice": open_,
+            "high": high,
+            "low": low,
+            "last": close,
+            "volume": volume,
+            "close": open_time + interval_ms - 1,
+            "quoteVolume": volume * vwap,
+            "count": count,
+            "takerBaseVolume": taker_base,
+            "takerQuoteVolume": taker_base * vwap,
+            "unused": 0,
+        }
+    )
+    return frame[settings.KLINES_COLUMNS]
+
+
+def synthetic_trades(
+    symbol: str,
+    n_trades: int,
+    seed: int = 0,
+    start_ms: int = START_MS,
+    end_ms: int = None,
+    klines: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """
+    Trades spread over [start_ms, end_ms), priced around `klines` when given,
+    with the archive columns plus the "side" the API derives from isBuyerMaker.
+    """
+    rng = symbol_rng(symbol, seed, "trades")
+    if klines is not None:
+        start_ms = int(klines["open"].iloc[0])
+        end_ms = int(klines["close"].iloc[-1]) + 1
+    end_ms = end_ms if end_ms is not None else start_ms + 86_400_000
+    time = np.sort(rng.integers(start_ms, end_ms, n_trades))
+
+    if klines is not None:
+        bar = np.searchsorted(klines["open"].to_numpy(), time, side="right") - 1
+        price = klines["last"].to_numpy()[bar] * (1 + rng.normal(0, 0.0005, n_trades))
+    else:
+        price = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, n_trades)))
+    quantity = rng.lognormal(-2, 1.2, n_trades)
+    is_buyer_maker = rng.random(n_trades) < 0.5
+
+    frame = pd.DataFrame(
+        {
+            "id": np.arange(n_trades, dtype=np.int64),
+            "price": price,
+            "quantity": quantity,
+            "quoteQty": price * quantity,
+            "time": time,
+            "isBuyerMaker": is_buyer_maker,
+            "isBestMatch": True,
+        }
+    )
+    frame["side"] = np.where(is_buyer_maker, "BUY", "SELL")
+    return frame
+
+
+def synthetic_market(
+    symbols: List[str],
+    n_bars: int,
+    n_trades: int,
+    seed: int = 0,
+    interval_ms: int = 60_000,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+    """Klines and trades per symbol, in the layout `load_past_data` returns."""
+    klines_data, trades_data = {}, {}
+    for symbol in symbols:
+        klines = synthetic_klines(symbol, n_bars, seed, interval_ms)
+        klines_data[symbol] = klines
+        trades_data[symbol] = synthetic_trades(symbol, n_trades, seed, klines=klines)
+    return klines_data, trades_data
+
+
+def archive_zip(frame: pd.DataFrame, file_name: str) -> bytes:
+    """Zip `frame` as a header-less CSV, like the data.binance.vision archives."""
+    columns = [c for c in frame.columns if c != "side"]
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(file_name, frame[columns].to_csv(header=False, index=False))
+    return buffer.getvalue()
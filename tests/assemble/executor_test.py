@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from quant_api.assemble import exception
+from quant_api.assemble.executor import (
+    ExecutorOverloaded,
+    ExecutorTimeout,
+    StrategyExecutor,
+)
+from quant_api.quant import tasks
+from tests.quant.indicators_test import make_klines, make_trades
+
+
+@pytest.mark.asyncio
+async def test_overload_and_deadline() -> None:
+    executor = StrategyExecutor(kind="thread", max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.submit(release.wait))
+        queued = asyncio.ensure_future(executor.submit(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorOverloaded):
+            await executor.submit(release.wait)
+
+        release.set()
+        assert await running and await queued
+        await asyncio.sleep(0.05)
+        assert executor.in_flight == 0
+
+        # a missed deadline keeps the slot until the worker is done
+        release.clear()
+        with pytest.raises(ExecutorTimeout):
+            await executor.submit(release.wait, timeout=0.05)
+        assert executor.in_flight == 1
+        release.set()
+        await asyncio.sleep(0.05)
+        assert executor.in_flight == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_strategy() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(300, i) for i, sym in enumerate(symbols)}
+    trades_data = {sym: make_trades(500, 10 + i) for i, sym in enumerate(symbols)}
+    params = {"symbols": symbols}
+
+    executor = StrategyExecutor(kind="process", max_workers=1, timeout=60)
+    try:
+        result = await executor.submit(
+            tasks.run_iteration, params, klines_data, trades_data
+        )
+    finally:
+        executor.shutdown()
+    assert result == tasks.run_iteration(params, klines_data, trades_data)
+
+
+def test_overload_returns_503() -> None:
+    app = FastAPI()
+    app.add_exception_handler(
+        ExecutorOverloaded, exception.executor_overloaded_handler
+    )
+    executor = StrategyExecutor(kind="thread", max_workers=1, max_queue=0)
+    executor.in_flight = executor.capacity
+
+    @app.get("/work")
+    async def work():
+        return await executor.submit(lambda: "done")
+
+    response = TestClient(app).get("/work")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from quant_api import models
+from quant_api.assemble.jobs import JobManager
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_job_progress_and_result(session_factory) -> None:
+    manager = JobManager(session_factory)
+
+    @manager.runner("sum")
+    async def sum_job(params, progress):
+        for i, phase in enumerate(("download", "decode", "compute")):
+            await progress(phase, (i + 1) / 3)
+        return {"total": sum(params["values"])}
+
+    job = await manager.submit("sum", {"values": [1, 2, 3]})
+    states = [state async for state in manager.subscribe(job["job_id"])]
+
+    assert states[-1]["status"] == "succeeded"
+    assert "compute" in [state["phase"] for state in states]
+    stored = await manager.get(job["job_id"])
+    assert json.loads(stored.result) == {"total": 6}
+    assert stored.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_awaited_work(session_factory) -> None:
+    manager = JobManager(session_factory)
+    started, interrupted = asyncio.Event(), asyncio.Event()
+
+    @manager.runner("download")
+    async def download_job(params, progress):
+        await progress("download", 0.0)
+        started.set()
+        try:
+            await asyncio.sleep(60)  # stands in for an in-flight request
+        except asyncio.CancelledError:
+            interrupted.set()
+            raise
+
+    job = await manager.submit("download", {})
+    await started.wait()
+    state = await manager.cancel(job["job_id"])
+
+    assert interrupted.is_set()
+    assert state["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_jobs_resume_after_restart(session_factory) -> None:
+    blocked = asyncio.Event()
+    first = JobManager(session_factory)
+
+    @first.runner("slow")
+    async def slow_job(params, progress):
+        await progress("compute", 0.5)
+        blocked.set()
+        await asyncio.sleep(60)
+
+    job = await first.submit("slow", {"n": 1})
+    await blocked.wait()
+    await first.shutdown()
+    assert (await first.get(job["job_id"])).status == "running"
+
+    second = JobManager(session_factory)
+
+    @second.runner("slow")
+    async def resumed_job(params, progress):
+        return params
+
+    await second.recover()
+    states = [state async for state in second.subscribe(job["job_id"])]
+    assert states[-1]["status"] == "succeeded"
+    assert json.loads((await second.get(job["job_id"])).result) == {"n": 1}
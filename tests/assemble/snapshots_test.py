@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from quant_api.assemble.snapshots import SnapshotManager
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.market_data import MarketData
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+@pytest.mark.asyncio
+async def test_periodic_snapshots_restore_on_start(tmp_path) -> None:
+    klines_data, _ = synthetic_market(SYMBOLS, 300, 0, seed=2)
+    frames = MarketData.from_klines(klines_data).frames
+    strategy = MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    strategy.warm_up({symbol: klines.iloc[:290] for symbol, klines in frames.items()})
+
+    manager = SnapshotManager(str(tmp_path / "snapshots"), interval=0.01)
+    assert manager.restore("live", MultiAssetCryptoStrategy(symbols=SYMBOLS)) is None
+    manager.register("live", strategy)
+    manager.start()
+    while not (tmp_path / "snapshots" / "live.snap").exists():
+        await asyncio.sleep(0.01)
+    await manager.close()
+
+    restarted = MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    assert manager.restore("live", restarted, frames) == 10
+    assert restarted.indicator_engine.ready
+    # a snapshot that does not fit is skipped, not raised
+    other = MultiAssetCryptoStrategy(symbols=SYMBOLS, rsi_period=7)
+    assert manager.restore("live", other, frames) is None
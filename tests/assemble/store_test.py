@@ -0,0 +1,123 @@
+import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from quant_api import models
+from quant_api.assemble.store import StateStore
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+T0 = datetime.datetime(2024, 1, 1)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'state.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def fill(symbol, side, size, price, trade_id, hours):
+    return {
+        "symbol": symbol,
+        "side": side,
+        "size": size,
+        "price": price,
+        "trade_id": trade_id,
+        "time": T0 + datetime.timedelta(hours=hours),
+    }
+
+
+async def count(session_factory, model) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_state_round_trip(session_factory) -> None:
+    store = StateStore(session_factory)
+    strategy = MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    fills = [
+        fill("BTCUSDT", "BUY", 1.0, 100.0, 1, 0),
+        fill("ETHUSDT", "SELL", 2.0, 50.0, "ext-7", 1),
+        fill("BTCUSDT", "SELL", 1.0, 110.0, 2, 2),
+        fill("SOLUSDT", "BUY", 3.0, 20.0, 3, 3),
+    ]
+    strategy.update_positions(fills[:3])
+    store.record_fills("a", fills[:3])
+    store.save_state("a", strategy)
+    await store.flush()
+
+    # only the positions closed since the last save are appended
+    strategy.update_positions(fills[3:])
+    strategy.pending_orders = [
+        Order("SOLUSDT", "SELL", 1.5, "LIMIT", 21.0),
+        Order("SOLUSDT", "SELL", 0.5, "LIMIT", 21.0, T0 + datetime.timedelta(hours=9)),
+    ]
+    store.record_fills("a", fills[3:])
+    store.save_state("a", strategy)
+    store.save_state("b", MultiAssetCryptoStrategy(symbols=SYMBOLS))
+    await store.flush()
+    assert store.queued == 0
+    assert await count(session_factory, models.ClosedPositionRow) == 1
+    assert await count(session_factory, models.StrategyFillRow) == 4
+
+    restored = await StateStore(session_factory).restore(
+        "a", MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    )
+    assert restored.positions == strategy.positions
+    assert restored.pending_orders == strategy.pending_orders
+    assert restored.historical_positions.to_frame().equals(
+        strategy.historical_positions.to_frame()
+    )
+    empty = await store.restore("b", MultiAssetCryptoStrategy(symbols=SYMBOLS))
+    assert empty.positions == {} and empty.pending_orders == []
+
+
+@pytest.mark.asyncio
+async def test_writes_are_queued_and_flushed_in_batches(session_factory) -> None:
+    store = StateStore(session_factory, flush_interval=60, batch_size=1000)
+    store.start()
+    orders = [Order("BTCUSDT", "BUY", 1.0 + i, "MARKET") for i in range(400)]
+    for _ in range(2):
+        store.record_orders("a", orders)
+    store.record_run("a", "iteration", {"orders": orders[:2]})
+    # below the batch size: nothing written until the interval
+    assert store.queued == 801
+    assert await count(session_factory, models.StrategyOrderRow) == 0
+
+    store.record_orders("a", orders)
+    await store.flush()
+    await store.close()
+    assert await count(session_factory, models.StrategyOrderRow) == 1200
+    assert await count(session_factory, models.StrategyRunRow) == 1
+    assert store.rows_written == 1201
+
+
+@pytest.mark.asyncio
+async def test_failed_flushes_are_retried_then_dropped(session_factory) -> None:
+    store = StateStore(session_factory, max_retries=1)
+    write = store._write
+
+    async def failing(rows, states):
+        raise RuntimeError("database down")
+
+    store._write = failing
+    store.record_orders("a", [Order("BTCUSDT", "BUY", 1.0, "MARKET")])
+    with pytest.raises(RuntimeError):
+        await store.flush()
+    # kept for one retry, then dropped
+    assert store.queued == 1
+    with pytest.raises(RuntimeError):
+        await store.flush()
+    assert store.queued == 0 and store.rows_dropped == 1
+
+    store._write = write
+    store.record_orders("a", [Order("BTCUSDT", "SELL", 1.0, "MARKET")])
+    await store.flush()
+    assert await count(session_factory, models.StrategyOrderRow) == 1
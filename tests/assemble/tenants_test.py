@@ -0,0 +1,66 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from quant_api import models
+from quant_api.assemble.snapshots import SnapshotManager
+from quant_api.assemble.store import StateStore
+from quant_api.assemble.tenants import TenantManager
+from quant_api.quant import Order
+from quant_api.quant.host import StrategyHost
+from quant_api.quant.market_data import MarketData
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+MARKET = ("1h", 300)
+PARAMS = {
+    "symbols": SYMBOLS,
+    "lookback_periods": {
+        "volume": 24,
+        "volatility": 48,
+        "correlation": 48,
+        "momentum": 12,
+    },
+    "volume_source": "klines",
+}
+
+
+@pytest_asyncio.fixture
+async def store(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'state.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    yield StateStore(async_sessionmaker(engine, expire_on_commit=False))
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_saved_and_recovered(store, tmp_path) -> None:
+    klines_data, _ = synthetic_market(SYMBOLS, 300, 0, seed=4)
+    frames = MarketData.from_klines(klines_data).frames
+    snapshots = SnapshotManager(str(tmp_path / "snapshots"), interval=0)
+    manager = TenantManager(StrategyHost(), store, snapshots)
+    strategy = await manager.register("a", PARAMS, *MARKET)
+    strategy.warm_up(frames)
+    manager.host.update(MARKET, frames)
+    results = manager.host.evaluate(MARKET)
+    strategy.pending_orders = [Order("BTCUSDT", "BUY", 0.5, "LIMIT", 100.0)]
+    manager.save(results)
+    await store.flush()
+    await snapshots.save_all()
+    assert store.rows_written == 1 + len(results["a"]["orders"])
+
+    # a restarted process registers the tenant again, with its state
+    snapshots = SnapshotManager(str(tmp_path / "snapshots"), interval=0)
+    restarted = TenantManager(StrategyHost(), store, snapshots)
+    await restarted.recover()
+    recovered = restarted.host.tenants["a"]
+    assert recovered.market == MARKET
+    assert recovered.strategy.pending_orders == strategy.pending_orders
+    # indicator state from the snapshot, registered for the next ones
+    assert recovered.strategy.indicator_engine.ready
+    assert snapshots._strategies == {"a": recovered.strategy}
+    assert recovered.strategy._metric_cache is restarted.host._cache(strategy, MARKET)
+
+    await restarted.unregister("a")
+    assert await store.tenants() == [] and snapshots._strategies == {}
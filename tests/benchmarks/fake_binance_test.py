@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fake_binance import create_app
+from quant_api.configs import settings
+from quant_api.utils.binance_market import extract_zip_content
+
+
+def test_rest_endpoints_follow_binance_layout() -> None:
+    client = TestClient(create_app())
+
+    klines = client.get(
+        "/api/v3/klines",
+        params={"symbol": "BTCUSDT", "interval": "1m", "startTime": 1_704_067_230_000, "limit": 3},
+    ).json()
+    assert len(klines) == 3 and len(klines[0]) == 12
+    assert [k[0] for k in klines] == [1_704_067_200_000 + 60_000 * i for i in range(3)]
+    assert klines[0][6] == klines[0][0] + 59_999
+    assert float(klines[0][2]) >= max(float(klines[0][1]), float(klines[0][4]))
+
+    trades = client.get("/api/v3/trades", params={"symbol": "BTCUSDT", "limit": 5}).json()
+    assert len(trades) == 5
+    assert set(trades[0]) == {"id", "price", "qty", "quoteQty", "time", "isBuyerMaker", "isBestMatch"}
+
+    assert client.get("/api/v3/klines", params={"symbol": "BTCUSDT", "interval": "7x"}).status_code == 400
+
+    tickers = client.get(
+        "/api/v3/ticker/24hr", params={"symbols": '["BTCUSDT","ETHBTC"]', "type": "MINI"}
+    ).json()
+    assert [t["symbol"] for t in tickers] == ["BTCUSDT", "ETHBTC"]
+    assert float(tickers[0]["quoteVolume"]) == pytest.approx(
+        float(tickers[0]["volume"]) * float(tickers[0]["lastPrice"]), rel=1e-6
+    )
+    listed = TestClient(create_app(listed=100)).get("/api/v3/ticker/24hr").json()
+    assert len(listed) == 100
+
+
+def test_archive_in_data_binance_vision_layout() -> None:
+    client = TestClient(create_app(archive_trades=1_000))
+
+    path = "/data/spot/daily/klines/BTCUSDT/1h/BTCUSDT-1h-2024-01-02.zip"
+    frame = extract_zip_content(client.get(path).content)["BTCUSDT-1h-2024-01-02.csv"]
+    frame.columns = settings.KLINES_COLUMNS
+    assert len(frame) == 24
+    assert frame["open"].iloc[0] == 1_704_153_600_000
+
+    path = "/data/spot/daily/trades/BTCUSDT/BTCUSDT-trades-2024-01-02.zip"
+    frame = extract_zip_content(client.get(path).content)["BTCUSDT-trades-2024-01-02.csv"]
+    frame.columns = settings.TRADES_COLUMNS
+    assert len(frame) == 1_000
+    assert frame["time"].between(1_704_153_600_000, 1_704_239_999_999).all()
+
+    assert client.get("/data/spot/daily/klines/BTCUSDT/1h/README.txt").status_code == 404
+
+
+def test_streams() -> None:
+    client = TestClient(create_app(kline_rate=1_000, trade_rate=1_000))
+
+    with client.websocket_connect("/ws/btcusdt@trade") as ws:
+        first, second = ws.receive_json(), ws.receive_json()
+    assert first["e"] == "trade" and first["s"] == "BTCUSDT"
+    assert second["t"] == first["t"] + 1
+
+    with client.websocket_connect("/ws/btcusdt@kline_1m") as ws:
+        event = ws.receive_json()
+    assert event["e"] == "kline"
+    assert event["k"]["i"] == "1m"
+    assert event["k"]["T"] - event["k"]["t"] == 59_999
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.quant.backtest import Backtester, ms_timestamps
+from quant_api.quant.market_data import MarketData
+from quant_api.utils.frames import taker_volumes
+from quant_api.utils.synthetic import synthetic_market
+from tests.quant.indicators_test import make_klines
+
+
+@pytest.fixture
+def replay():
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines_data = {sym: make_klines(600, i) for i, sym in enumerate(symbols)}
+    strategy = MultiAssetCryptoStrategy(
+        symbols=symbols,
+        lookback_periods={
+            "volume": 24,
+            "volatility": 48,
+            "correlation": 48,
+            "momentum": 12,
+        },
+    )
+    # bar open times and sell-heavy trades spread over them
+    timestamps = 1_700_000_000_000 + 60_000 * np.arange(600)
+    rng = np.random.default_rng(0)
+    trades_data = {
+        sym: pd.DataFrame(
+            {
+                "time": np.sort(rng.integers(timestamps[0], timestamps[-1], 3000)),
+                "quantity": rng.lognormal(0, 1, 3000),
+                "side": np.where(rng.random(3000) < 0.4, "BUY", "SELL"),
+            }
+        )
+        for sym in symbols
+    }
+    return strategy, klines_data, trades_data, timestamps
+
+
+def test_backtest_accounting(replay) -> None:
+    strategy, klines_data, trades_data, timestamps = replay
+    result = Backtester(
+        strategy, klines_data, trades_data, warmup_bars=100, timestamps=timestamps
+    ).run()
+
+    assert len(result.equity_curve) == 500
+    assert result.stats["orders"] >= result.stats["fills"] > 0
+
+    # cash + marked positions reconciles with the fills
+    cash = 100000.0
+    for fill in result.fills.itertuples():
+        sign = 1 if fill.side == "BUY" else -1
+        cash -= sign * fill.size * fill.price + fill.fee
+    sizes = result.fills.assign(
+        signed=np.where(result.fills.side == "BUY", 1, -1) * result.fills["size"]
+    ).groupby("symbol")["signed"].sum()
+    marked = sum(
+        size * klines_data[sym]["close"].iloc[-1] for sym, size in sizes.items()
+    )
+    assert result.stats["final_equity"] == pytest.approx(cash + marked)
+    assert result.stats["total_fees"] == pytest.approx(result.fills["fee"].sum())
+    assert result.stats["max_drawdown"] <= 0
+
+
+def test_limit_orders_fill_on_cross_or_expire(replay) -> None:
+    strategy, klines_data, _, _ = replay
+    backtester = Backtester(strategy, klines_data, warmup_bars=100, limit_ttl=2)
+    orders = iter(
+        [
+            [
+                Order("BTCUSDT", "BUY", 1.0, "LIMIT", price=1e9),
+                Order("ETHUSDT", "BUY", 1.0, "LIMIT", price=1e-9),
+                Order("SOLUSDT", "SELL", 1.0, "MARKET"),
+            ]
+        ]
+    )
+    strategy.run_iteration_incremental = lambda *args, **kwargs: next(orders, [])
+    result = backtester.run()
+
+    fills = result.fills.set_index("symbol")
+    assert set(fills.index) == {"BTCUSDT", "SOLUSDT"}
+    # a marketable limit fills at the open it gaps through
+    assert fills.loc["BTCUSDT", "price"] == klines_data["BTCUSDT"]["open"].iloc[101]
+    assert fills.loc["SOLUSDT", "price"] == klines_data["SOLUSDT"]["open"].iloc[101]
+    assert isinstance(result.equity_curve["time"].iloc[0], pd.Timestamp)
+
+
+def test_exits_are_merged_and_capped(replay) -> None:
+    strategy, klines_data, _, _ = replay
+    backtester = Backtester(strategy, klines_data, warmup_bars=100, limit_ttl=3)
+    orders = iter(
+        [
+            [Order("BTCUSDT", "BUY", 2.0, "MARKET")],
+            # chunked entry still working: the next entry does not stack
+            [Order("ETHUSDT", "BUY", 1.0, "LIMIT", price=1e-9)],
+            [Order("ETHUSDT", "BUY", 1.0, "MARKET")],
+            # signal, stop, drawdown and age exits, each at the full position
+            [Order("BTCUSDT", "SELL", 2.0, "MARKET") for _ in range(4)],
+        ]
+    )
+    strategy.run_iteration_incremental = lambda *args, **kwargs: next(orders, [])
+    result = backtester.run()
+
+    btc = result.fills[result.fills.symbol == "BTCUSDT"]
+    assert btc["size"].tolist() == [2.0, 2.0]
+    assert "BTCUSDT" not in strategy.positions
+    assert (result.fills.symbol == "ETHUSDT").sum() == 0
+
+
+def test_float_residue_closes_the_position() -> None:
+    strategy = MultiAssetCryptoStrategy(symbols=["BTCUSDT"])
+    fill = dict(symbol="BTCUSDT", price=100.0, trade_id=0)
+    strategy.update_positions([dict(fill, side="BUY", size=0.3)])
+    strategy.update_positions([dict(fill, side="SELL", size=0.1)] * 3)
+    assert strategy.positions == {}
+    assert len(strategy.historical_positions) == 1
+
+
+def test_incremental_iteration_matches_run_iteration() -> None:
+    # the backtester's incremental iteration against run_iteration on the
+    # same window, bar by bar, with the same fills applied to both
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines_data, _ = synthetic_market(symbols, 300, 0, seed=3)
+    frames = MarketData.from_klines(klines_data).frames
+    for symbol in symbols[1:]:  # sell-heavy: short entries fire
+        frames[symbol]["takerBaseVolume"] = 0.6 * frames[symbol]["volume"]
+    params = dict(
+        symbols=symbols,
+        lookback_periods={
+            "volume": 24,
+            "volatility": 48,
+            "correlation": 48,
+            "momentum": 12,
+        },
+        volume_source="klines",
+    )
+    incremental = MultiAssetCryptoStrategy(**params)
+    batch = MultiAssetCryptoStrategy(**params)
+    warmup = 150
+    incremental.warm_up({symbol: k.iloc[:warmup] for symbol, k in frames.items()})
+
+    times = ms_timestamps(frames["BTCUSDT"].index.to_numpy())
+    orders, n_orders = [], 0
+    for t in range(warmup, 300):
+        # the previous bar's orders fill on this bar's open
+        fills = [
+            {
+                "symbol": order.symbol,
+                "side": order.side,
+                "size": order.size,
+                "price": frames[order.symbol]["open"].iat[t],
+                "trade_id": n_orders + i,
+                "time": times[t],
+            }
+            for i, order in enumerate(orders)
+        ]
+        n_orders += len(orders)
+        incremental.update_positions(fills)
+        batch.update_positions(fills)
+
+        columns = ["open", "high", "low", "close", "volume"]
+        incremental.update_bars(
+            {symbol: k[columns].iloc[t].to_dict() for symbol, k in frames.items()}
+        )
+        for symbol, klines in frames.items():
+            buy, sell = taker_volumes(klines.iloc[t : t + 1])
+            incremental.indicator_engine.add_trades(symbol, buy.sum(), sell.sum())
+
+        window = {symbol: klines.iloc[: t + 1] for symbol, klines in frames.items()}
+        avg_trade_sizes = {
+            symbol: klines["volume"].sum() / klines["count"].sum()
+            for symbol, klines in window.items()
+        }
+        orders = batch.run_iteration(window, None, now=times[t])
+        replayed = incremental.run_iteration_incremental(avg_trade_sizes, now=times[t])
+        assert [(o.symbol, o.side, o.order_type) for o in replayed] == [
+            (o.symbol, o.side, o.order_type) for o in orders
+        ], f"bar {t}"
+        assert [o.size for o in replayed] == pytest.approx([o.size for o in orders])
+
+    # entries, risk exits and closes were all exercised
+    assert n_orders > 100
+    assert len(batch.historical_positions) > 10
+    assert incremental.positions.keys() == batch.positions.keys()
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.cache import frame_fingerprint
+from tests.quant.indicators_test import make_klines, make_trades
+
+
+@pytest.mark.parametrize("panel_mode", [False, True])
+def test_appended_bars_extend_cached_metrics(panel_mode: bool) -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(300, i) for i, sym in enumerate(symbols)}
+    trades_data = {sym: make_trades(500, 10 + i) for i, sym in enumerate(symbols)}
+    params = dict(symbols=symbols, panel_mode=panel_mode)
+    params["lookback_periods"] = {
+        "volume": 24,
+        "volatility": 48,
+        "correlation": 48,
+        "momentum": 12,
+    }
+
+    def calculate(strategy, klines, trades):
+        return [
+            strategy.calculate_volume_profile(trades, klines),
+            strategy.calculate_volatility_metrics(klines),
+            strategy.calculate_momentum_signals(klines),
+            {"corr": strategy.calculate_correlation_matrix(klines)},
+        ]
+
+    cached = MultiAssetCryptoStrategy(**params)
+    head = {sym: df.iloc[:250] for sym, df in klines_data.items()}
+    trades_head = {sym: df.iloc[:400] for sym, df in trades_data.items()}
+    calculate(cached, head, trades_head)
+    assert cached.cache_stats()["misses"] == 7
+
+    calculate(cached, head, trades_head)
+    assert cached.cache_stats()["hits"] == 7
+
+    result = calculate(cached, klines_data, trades_data)
+    assert cached.cache_stats()["extensions"] == 7
+
+    expected = calculate(MultiAssetCryptoStrategy(**params), klines_data, trades_data)
+    for result_frames, expected_frames in zip(result, expected):
+        for key in expected_frames:
+            pd.testing.assert_frame_equal(
+                result_frames[key], expected_frames[key], rtol=1e-9
+            )
+
+
+def test_cache_is_bounded_and_invalidated() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines_data = {sym: make_klines(100, i) for i, sym in enumerate(symbols)}
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, metric_cache_size=2)
+
+    strategy.calculate_volatility_metrics(klines_data)
+    stats = strategy.cache_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+    # a rewritten last bar is not an append
+    strategy = MultiAssetCryptoStrategy(symbols=symbols)
+    strategy.calculate_volatility_metrics(klines_data)
+    changed = dict(klines_data)
+    changed["BTCUSDT"] = klines_data["BTCUSDT"].copy()
+    changed["BTCUSDT"].iloc[-1, 3] *= 1.01
+    strategy.calculate_volatility_metrics(changed)
+    stats = strategy.cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 4
+
+
+def test_default_size_and_time_index_fingerprint() -> None:
+    symbols = [f"SYM{i}USDT" for i in range(100)]
+    strategy = MultiAssetCryptoStrategy(symbols=symbols)
+    assert strategy.cache_stats()["max_entries"] >= 5 * len(symbols)
+
+    # strategy layout: the bar time is the index, "open" a price
+    klines = make_klines(10, 0)
+    klines.index = pd.Index(range(0, 10 * 60_000, 60_000), name="open_time")
+    moved = klines.copy()
+    moved.index = moved.index + 60_000
+    assert frame_fingerprint(klines) != frame_fingerprint(moved)
+    assert frame_fingerprint(klines)[1] == 9 * 60_000
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.quant.graph import GraphContext, IndicatorGraph, default_graph
+from tests.quant.indicators_test import make_klines
+
+
+def test_intermediates_are_computed_once_per_iteration() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(200, i) for i, sym in enumerate(symbols)}
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, metric_cache_size=0)
+
+    calls = []
+    original = default_graph["log_return"].fn
+    strategy.indicator_graph = IndicatorGraph()
+    strategy.indicator_graph.register("log_return")(
+        lambda klines: calls.append(1) or original(klines)
+    )
+    for name in ("log_hl", "log_co", "hl_spread", "hl_spread_mean"):
+        node = default_graph[name]
+        strategy.indicator_graph.register(name, deps=node.deps)(node.fn)
+
+    with strategy.indicator_scope() as context:
+        strategy.calculate_volatility_metrics(klines_data)
+        strategy.calculate_correlation_matrix(klines_data)
+        for i in range(3):
+            strategy._calculate_limit_price(
+                Order("BTCUSDT", "BUY", 1.0, "LIMIT"), klines_data["BTCUSDT"], i, 3
+            )
+
+    assert len(calls) == len(symbols)
+    assert len(context) == 3 * len(symbols) + 2
+
+
+def test_register_new_indicator() -> None:
+    graph = IndicatorGraph()
+    graph.register("range")(lambda klines: klines["high"] - klines["low"])
+    graph.register("range_pct", deps=("range",))(
+        lambda klines, rng: rng / klines["close"]
+    )
+    with pytest.raises(ValueError):
+        graph.register("orphan", deps=("missing",))(lambda klines, missing: missing)
+
+    klines = make_klines(50, 0)
+    context = GraphContext(graph)
+    np.testing.assert_allclose(
+        context.get("range_pct", klines),
+        (klines["high"] - klines["low"]) / klines["close"],
+    )
+    context.get("range", klines)
+    assert context.evaluations == 2
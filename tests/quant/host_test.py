@@ -0,0 +1,94 @@
+import pytest
+
+from quant_api.assemble.executor import ExecutorTimeout, StrategyExecutor
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.host import StrategyHost
+from quant_api.quant.market_data import MarketData
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+LOOKBACKS = {"volume": 24, "volatility": 48, "correlation": 48, "momentum": 12}
+MARKET = ("1h", 300)
+
+
+@pytest.fixture
+def frames():
+    klines_data, _ = synthetic_market(SYMBOLS, 300, 0, seed=4)
+    return MarketData.from_klines(klines_data).frames
+
+
+def params(**overrides):
+    return {
+        "symbols": SYMBOLS,
+        "lookback_periods": LOOKBACKS,
+        "volume_source": "klines",
+        **overrides,
+    }
+
+
+def test_tenants_share_frames_and_metrics(frames) -> None:
+    host = StrategyHost()
+    tenants = {
+        "a": params(),
+        "b": params(vol_threshold=1.0),
+        "c": params(symbols=SYMBOLS[:2], rsi_thresholds=(40, 60)),
+    }
+    for tenant_id, tenant_params in tenants.items():
+        host.register(tenant_id, tenant_params, *MARKET)
+    assert host.symbols(MARKET) == sorted(SYMBOLS)
+    assert not host.needs_trades(MARKET)
+
+    host.update(MARKET, frames)
+    results = host.evaluate(MARKET)
+
+    # same orders as strategies run on their own
+    for tenant_id, tenant_params in tenants.items():
+        alone = MultiAssetCryptoStrategy(**tenant_params)
+        assert results[tenant_id]["orders"] == alone.run_iteration(frames, None)
+
+    # per-symbol metrics computed once for the three tenants
+    (cache,) = host._caches.values()
+    single = MultiAssetCryptoStrategy(**params())
+    single.run_iteration(frames, None)
+    assert cache.stats()["misses"] == single.cache_stats()["misses"] + 1  # correlation of c
+    assert cache.stats()["hits"] > 0
+    assert host.tenants["a"].strategy._metric_cache is cache
+    assert host.snapshots[MARKET].klines_data["BTCUSDT"] is frames["BTCUSDT"]
+
+
+def test_failing_tenant_does_not_stop_the_others(frames) -> None:
+    host = StrategyHost()
+    host.register("ok", params(), *MARKET)
+    host.register("broken", params(symbols=["BTCUSDT", "DOGEUSDT"]), *MARKET)
+    host.update(MARKET, frames)
+    results = host.evaluate(MARKET)
+    assert "orders" in results["ok"]
+    assert "DOGEUSDT" in results["broken"]["error"]
+
+    # markets run concurrently: each has its own (unlocked) cache
+    other = host.register("other", params(), "1h", 100)
+    assert other._metric_cache is not host.tenants["ok"].strategy._metric_cache
+
+    host.unregister("other")
+    host.unregister("broken")
+    host.unregister("ok")
+    assert host.markets() == [] and host._caches == {}
+
+
+@pytest.mark.asyncio
+async def test_runs_of_a_market_do_not_overlap(frames) -> None:
+    host = StrategyHost()
+    host.register("a", params(), *MARKET)
+    executor = StrategyExecutor(kind="thread", max_workers=1, timeout=60)
+    try:
+        # a run that missed its deadline holds the market until it is done
+        with host._locks[MARKET]:
+            with pytest.raises(ExecutorTimeout):
+                await executor.submit(host.run, MARKET, frames, timeout=0.05)
+            assert host.snapshots[MARKET].version == 0
+        results = await executor.submit(host.run, MARKET, frames)
+    finally:
+        executor.shutdown()
+    assert host.snapshots[MARKET].version == 2
+    alone = MultiAssetCryptoStrategy(**params())
+    assert results["a"]["orders"] == alone.run_iteration(frames, None)
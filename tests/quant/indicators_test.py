@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.utils.frames import compact_frames
+from quant_api.utils.synthetic import synthetic_market
+
+
+def make_klines(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, n))
+    volume = rng.lognormal(3, 0.5, n)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+    )
+
+
+def make_trades(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "quantity": rng.lognormal(0, 1, n),
+            "side": np.where(rng.random(n) < 0.5, "BUY", "SELL"),
+        }
+    )
+
+
+@pytest.fixture
+def market():
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(400, i) for i, sym in enumerate(symbols)}
+    trades_data = {sym: make_trades(1000, 10 + i) for i, sym in enumerate(symbols)}
+    return symbols, klines_data, trades_data
+
+
+def test_incremental_matches_pandas(market) -> None:
+    symbols, klines_data, trades_data = market
+    strategy = MultiAssetCryptoStrategy(symbols=symbols)
+
+    history = {sym: df.iloc[:300] for sym, df in klines_data.items()}
+    strategy.warm_up(history, trades_data)
+    for i in range(300, 400):
+        for sym in symbols:
+            latest = strategy.update_bar(sym, klines_data[sym].iloc[i])
+
+    momentum = strategy.calculate_momentum_signals(klines_data)
+    vol = strategy.calculate_volatility_metrics(klines_data)
+    volume = strategy.calculate_volume_profile(trades_data, klines_data)
+    for sym in symbols:
+        latest = strategy.indicator_engine.latest(sym)
+        expected = {
+            **momentum[sym].iloc[-1].to_dict(),
+            **vol[sym].iloc[-1].to_dict(),
+            **volume[sym].iloc[-1].to_dict(),
+        }
+        for key, value in expected.items():
+            assert latest[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+def test_incremental_signals_match_batch(market) -> None:
+    symbols, klines_data, trades_data = market
+    strategy = MultiAssetCryptoStrategy(symbols=symbols)
+    strategy.warm_up(klines_data, trades_data)
+
+    batch = strategy.generate_signals(klines_data, trades_data)
+    incremental = strategy.generate_signals_incremental(
+        corr_penalties={
+            sym: strategy.calculate_correlation_matrix(klines_data)[sym].abs().mean()
+            for sym in symbols
+        }
+    )
+    assert incremental == batch
+
+
+def test_panel_mode_matches_per_symbol(market) -> None:
+    symbols, klines_data, trades_data = market
+    # uneven histories are padded, not truncated
+    klines_data["ETHUSDT"] = klines_data["ETHUSDT"].iloc[:350]
+    loop = MultiAssetCryptoStrategy(symbols=symbols)
+    panel = MultiAssetCryptoStrategy(symbols=symbols, panel_mode=True)
+
+    for method, args in [
+        ("calculate_volatility_metrics", (klines_data,)),
+        ("calculate_momentum_signals", (klines_data,)),
+        ("calculate_volume_profile", (trades_data, klines_data)),
+    ]:
+        expected = getattr(loop, method)(*args)
+        result = getattr(panel, method)(*args)
+        for sym in symbols:
+            pd.testing.assert_frame_equal(result[sym], expected[sym], rtol=1e-7)
+
+
+def test_latest_and_incremental_correlation_match_rolling(market) -> None:
+    symbols, klines_data, trades_data = market
+    klines_data["SOLUSDT"] = make_klines(380, 7)
+    symbols = symbols + ["SOLUSDT"]
+    rolling = MultiAssetCryptoStrategy(symbols=symbols)
+    latest = MultiAssetCryptoStrategy(symbols=symbols, correlation_mode="latest")
+
+    expected = rolling.calculate_correlation_matrix(klines_data).loc[399]
+    result = latest.calculate_correlation_matrix(klines_data)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+
+    history = {sym: df.iloc[:200] for sym, df in klines_data.items()}
+    rolling.indicator_engine.warm(history)
+    for i in range(200, 400):
+        rolling.indicator_engine.update_all(
+            {sym: df.iloc[i] for sym, df in klines_data.items() if i < len(df)}
+        )
+    incremental = rolling.indicator_engine.correlation_matrix()
+    pd.testing.assert_frame_equal(incremental, expected, rtol=1e-7, check_names=False)
+
+
+def test_compact_mode_within_documented_tolerance() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines, trades = synthetic_market(symbols, 600, 2000)
+    compact_klines, compact_trades = compact_frames(klines, trades)
+
+    def prices(frames):
+        return {
+            sym: frame.assign(open=frame["openPrice"], close=frame["last"])
+            for sym, frame in frames.items()
+        }
+
+    standard = MultiAssetCryptoStrategy(symbols, panel_mode=True)
+    compact = MultiAssetCryptoStrategy(symbols, panel_mode=True, compact=True)
+    vol64 = standard.calculate_volatility_metrics(prices(klines))
+    vol32 = compact.calculate_volatility_metrics(prices(compact_klines))
+    mom64 = standard.calculate_momentum_signals(prices(klines))
+    mom32 = compact.calculate_momentum_signals(prices(compact_klines))
+
+    for sym in symbols:
+        close = klines[sym]["last"].to_numpy()
+        assert vol32[sym]["composite_vol"].dtype == np.float32
+        np.testing.assert_allclose(vol32[sym], vol64[sym], rtol=1e-4)
+        np.testing.assert_allclose(mom32[sym]["rsi"], mom64[sym]["rsi"], atol=0.01)
+        np.testing.assert_allclose(
+            mom32[sym]["macd_hist"] / close, mom64[sym]["macd_hist"] / close, atol=1e-6
+        )
+        np.testing.assert_allclose(
+            mom32[sym]["momentum_score"], mom64[sym]["momentum_score"], atol=1e-4
+        )
+    assert standard.calculate_volume_profile(trades, prices(klines))[symbols[0]][
+        "buy_sell_ratio"
+    ].iloc[-1] == pytest.approx(
+        compact.calculate_volume_profile(compact_trades, prices(compact_klines))[
+            symbols[0]
+        ]["buy_sell_ratio"].iloc[-1],
+        rel=1e-6,
+    )
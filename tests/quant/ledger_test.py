@@ -0,0 +1,147 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.ledger import FillLedger, PositionLedger
+
+START = datetime(2024, 1, 1)
+
+
+def random_fills(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    return [
+        {
+            "symbol": symbols[rng.integers(3)],
+            "side": "BUY" if rng.random() < 0.5 else "SELL",
+            "size": float(rng.uniform(0.1, 2)),
+            "price": float(rng.uniform(90, 110)),
+            "fee": float(rng.uniform(0, 0.1)),
+            "order_type": "MARKET",
+            "trade_id": i,
+            "time": START + timedelta(minutes=i),
+        }
+        for i in range(n)
+    ]
+
+
+def test_records_and_frame_round_trip() -> None:
+    fills = random_fills(50)
+    ledger = FillLedger(chunk_size=16)  # several chunks
+    for fill in fills:
+        ledger.append(**fill)
+
+    assert len(ledger) == 50
+    assert ledger[-1].trade_id == 49
+    record = ledger[20]
+    assert record.symbol == fills[20]["symbol"]
+    assert record.time == fills[20]["time"]
+    with pytest.raises(AttributeError):
+        record.unknown
+
+    frame = ledger.to_frame()
+    expected = pd.DataFrame(fills)
+    assert frame["symbol"].dtype == "category"
+    pd.testing.assert_frame_equal(
+        frame.astype({"symbol": str, "side": str, "order_type": str}),
+        expected.astype({"time": "datetime64[ns]"}),
+    )
+
+
+def test_extend_matches_append() -> None:
+    fills = random_fills(50)
+    fills[3]["trade_id"] = "ext-3"
+    fills[4]["time"] = None
+    appended, extended = FillLedger(chunk_size=16), FillLedger(chunk_size=16)
+    for fill in fills:
+        appended.append(**fill)
+    extended.extend(**{name: [fill[name] for fill in fills[:10]] for name in fills[0]})
+    extended.extend(**{name: [fill[name] for fill in fills[10:]] for name in fills[0]})
+
+    pd.testing.assert_frame_equal(extended.to_frame(), appended.to_frame())
+    pd.testing.assert_frame_equal(
+        extended.to_frame(40), appended.to_frame().iloc[40:].reset_index(drop=True)
+    )
+
+
+def test_string_ids_are_interned() -> None:
+    ledger = FillLedger()
+    ledger.append(symbol="BTCUSDT", side="BUY", size=1.0, trade_id="abc")
+    ledger.append(symbol="BTCUSDT", side="SELL", size=1.0, trade_id=7)
+
+    assert [record.trade_id for record in ledger] == ["abc", 7]
+    assert ledger.to_frame()["trade_id"].tolist() == ["abc", 7]
+    assert np.isnat(ledger.column("time")).all()
+
+
+def test_vectorized_pnl_matches_replay() -> None:
+    fills = random_fills(500, seed=1)
+    ledger = FillLedger()
+    for fill in fills:
+        ledger.append(**fill)
+    prices = {"BTCUSDT": 101.0, "ETHUSDT": 95.0, "SOLUSDT": 104.0}
+
+    net, cash = {}, {}
+    for fill in fills:
+        signed = fill["size"] if fill["side"] == "BUY" else -fill["size"]
+        net[fill["symbol"]] = net.get(fill["symbol"], 0.0) + signed
+        cash[fill["symbol"]] = (
+            cash.get(fill["symbol"], 0.0) - signed * fill["price"] - fill["fee"]
+        )
+
+    for symbol, price in prices.items():
+        assert ledger.net_sizes()[symbol] == pytest.approx(net[symbol])
+        assert ledger.exposure(prices)[symbol] == pytest.approx(abs(net[symbol] * price))
+        assert ledger.pnl(prices)[symbol] == pytest.approx(
+            cash[symbol] + net[symbol] * price
+        )
+
+
+def test_strategy_records_closed_positions() -> None:
+    strategy = MultiAssetCryptoStrategy(symbols=["BTCUSDT"])
+    fill = dict(symbol="BTCUSDT", size=2.0, trade_id=0)
+    strategy.update_positions([{**fill, "side": "BUY", "price": 100.0, "time": START}])
+    strategy.update_positions(
+        [{**fill, "side": "SELL", "price": 110.0, "time": START + timedelta(hours=1)}]
+    )
+
+    assert not strategy.positions
+    (closed,) = strategy.historical_positions
+    assert (closed.size, closed.entry_price, closed.exit_price) == (2.0, 100.0, 110.0)
+    assert closed.exit_time == START + timedelta(hours=1)
+    assert strategy.historical_positions.realized_pnl()["BTCUSDT"] == 20.0
+
+
+def test_record_memory() -> None:
+    @dataclass
+    class Fill:
+        symbol: str
+        side: str
+        size: float
+        price: float
+        fee: float
+        order_type: str
+        trade_id: str
+        time: datetime
+
+    fill = Fill(**{**random_fills(1)[0], "trade_id": "bt-123456"})
+    # object, attribute dict, the per-record float, id and datetime objects
+    # and the list slot (symbol / side / order type strings are shared)
+    per_object = (
+        sys.getsizeof(fill)
+        + sys.getsizeof(fill.__dict__)
+        + 3 * sys.getsizeof(1.0)
+        + sys.getsizeof(fill.trade_id)
+        + sys.getsizeof(fill.time)
+        + 8
+    )
+    ledger = FillLedger()
+    for fill in random_fills(1000):
+        ledger.append(**fill)
+
+    assert ledger.nbytes / len(ledger) * 5 <= per_object
@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.quant.liquidity import (
+    LiquidityStats,
+    RollSpread,
+    sqrt_chunks,
+    sqrt_impact,
+)
+from quant_api.quant.market_data import MarketData
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+@pytest.fixture
+def market():
+    klines_data, trades_data = synthetic_market(SYMBOLS, 600, 3000, seed=8)
+    return MarketData.from_klines(klines_data).frames, trades_data
+
+
+def test_stats_extend_like_a_full_build(market) -> None:
+    klines_data, trades_data = market
+    klines, trades = klines_data["BTCUSDT"], trades_data["BTCUSDT"]
+    stats = LiquidityStats(klines.iloc[:250], trades.iloc[:1000])
+    stats.extend(klines.iloc[250:400]).extend(klines.iloc[400:], trades.iloc[1000:])
+
+    assert stats.avg_trade_size == pytest.approx(trades["quantity"].mean())
+    assert stats.recent_volume == pytest.approx(klines["volume"].iloc[-24:].sum())
+    assert stats.size_histogram.sum() == len(trades)
+    assert stats.trade_size_quantile(0.5) == pytest.approx(
+        trades["quantity"].median(), rel=0.16  # within one 1/8 decade bin
+    )
+
+    returns = np.log(klines["close"]).diff()
+    bars_per_day = 86_400_000 / np.median(np.diff(klines.index))
+    assert stats.daily_volatility == pytest.approx(
+        returns.std() * math.sqrt(bars_per_day)
+    )
+    assert stats.half_spread == pytest.approx(
+        math.sqrt(max(-returns.cov(returns.shift()), 0.0))
+    )
+
+    hours = (klines.index // 3_600_000) % 24
+    per_hour = klines["volume"].groupby(hours).mean() * 3_600_000 / np.median(
+        np.diff(klines.index)
+    )
+    assert stats.volume_curve[per_hour.index] == pytest.approx(per_hour.to_numpy())
+    assert stats.daily_volume == pytest.approx(per_hour.mean() * 24)
+
+
+def test_roll_spread_recovers_bid_ask_bounce() -> None:
+    rng = np.random.default_rng(0)
+    mid = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, 200_000)))
+    spread = 0.002
+    price = mid * (1 + rng.choice([-1, 1], len(mid)) * spread / 2)
+    returns = np.diff(np.log(price))
+
+    batch = RollSpread()
+    batch.extend(returns)
+    assert batch.value == pytest.approx(spread, rel=0.05)
+
+    scalar = RollSpread()
+    for value in returns[:1000]:
+        scalar.update(value)
+    head = RollSpread()
+    head.extend(returns[:1000])
+    assert scalar.value == pytest.approx(head.value, rel=1e-9)
+
+
+def test_sqrt_chunks_keep_each_chunk_within_the_limit() -> None:
+    params = dict(daily_volume=5000.0, daily_volatility=0.04, half_spread=0.0005)
+    for size in (1.0, 50.0, 400.0, 3000.0):
+        n = sqrt_chunks(size, max_impact=0.005, **params)
+        assert sqrt_impact(size / n, **params) <= 0.005 + 1e-12
+        if n > 1:
+            assert sqrt_impact(size / (n - 1), **params) > 0.005
+    # square-root law: 4x the size, 2x the impact above the spread
+    assert sqrt_impact(400.0, **params) - 0.0005 == pytest.approx(
+        2 * (sqrt_impact(100.0, **params) - 0.0005)
+    )
+    assert sqrt_chunks(1.0, max_impact=0.0001, **params) == 100
+
+
+def test_strategy_impact_is_a_cached_lookup(market) -> None:
+    klines_data, trades_data = market
+    strategy = MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    order = Order("BTCUSDT", "BUY", 5.0, "MARKET")
+    head = {symbol: klines.iloc[:500] for symbol, klines in klines_data.items()}
+    strategy.calculate_market_impact(order, trades_data, head)
+    impact = strategy.calculate_market_impact(order, trades_data, klines_data)
+    assert strategy.cache_stats()["extensions"] == 1
+
+    klines = klines_data["BTCUSDT"]
+    avg_trade_size = trades_data["BTCUSDT"]["quantity"].mean()
+    recent_volume = klines["volume"].iloc[-24:].sum()
+    assert impact == pytest.approx(
+        (0.7 * 5.0 / avg_trade_size + 0.3 * 5.0 / recent_volume) * 0.01
+    )
+
+    # the square-root model splits a large order in fewer chunks
+    large = Order("BTCUSDT", "BUY", 30 * avg_trade_size, "MARKET")
+    linear = strategy.optimize_order_execution([large], trades_data, klines_data)
+    sqrt = MultiAssetCryptoStrategy(symbols=SYMBOLS, impact_model="sqrt")
+    split = sqrt.optimize_order_execution([large], trades_data, klines_data)
+    stats = sqrt.liquidity_stats(trades_data, klines_data)["BTCUSDT"]
+    assert len(split) == sqrt_chunks(
+        large.size, stats.daily_volume, stats.daily_volatility, 0.02, stats.half_spread
+    )
+    assert len(split) < len(linear)
+    assert sum(o.size for o in split) == pytest.approx(large.size)
+
+    # the linear model only builds what it reads
+    basic = strategy.liquidity_stats(trades_data, klines_data)["BTCUSDT"]
+    assert not basic.full and basic.size_histogram.sum() == 0
+    assert basic.avg_trade_size == pytest.approx(stats.avg_trade_size)
+    assert basic.recent_volume == pytest.approx(stats.recent_volume)
+
+
+def test_incremental_roll_spread_matches_stats(market) -> None:
+    klines_data, _ = market
+    strategy = MultiAssetCryptoStrategy(symbols=SYMBOLS)
+    strategy.warm_up(klines_data)
+    stats = LiquidityStats(klines_data["ETHUSDT"])
+    latest = strategy.indicator_engine.latest("ETHUSDT")
+    assert latest["roll_spread"] / 2 == pytest.approx(stats.half_spread, rel=1e-9)
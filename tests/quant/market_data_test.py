@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Position
+from quant_api.quant.market_data import TIME_INDEX, MarketData
+from quant_api.utils.synthetic import START_MS, synthetic_market
+
+MINUTE = 60_000
+
+
+@pytest.fixture
+def market():
+    klines_data, trades_data = synthetic_market(["BTCUSDT", "ETHUSDT"], 300, 2000, seed=1)
+    # ETH lists 10 bars late and misses two bars
+    eth = klines_data["ETHUSDT"]
+    klines_data["ETHUSDT"] = eth.iloc[10:].drop(index=[100, 101])
+    return MarketData.from_klines(klines_data), klines_data, trades_data
+
+
+def test_frames_are_time_indexed_and_aligned(market) -> None:
+    data, klines_data, _ = market
+    eth = data["ETHUSDT"]
+    assert eth.index.name == TIME_INDEX and eth.index.dtype == np.int64
+    assert eth["close"].to_numpy() == pytest.approx(klines_data["ETHUSDT"]["last"].to_numpy())
+    assert len(data.axis) == 300 and data.axis[0] == START_MS
+
+    aligned = data.align()["ETHUSDT"]
+    assert aligned.index.equals(pd.Index(data.axis))
+    assert aligned.iloc[:10].isna().all().all()
+    filled = aligned.loc[START_MS + 100 * MINUTE]
+    previous_close = eth.loc[START_MS + 99 * MINUTE, "close"]
+    assert (filled[["open", "high", "low", "close"]] == previous_close).all()
+    assert filled["volume"] == 0 and filled["count"] == 0
+
+    panel = data.panel()
+    assert panel.shape == (300, 2)
+    assert np.isnan(panel.close[:10, 1]).all()
+
+
+def test_slice_and_asof_join(market) -> None:
+    data, _, trades_data = market
+    part = data.slice(START_MS + 50 * MINUTE, START_MS + 150 * MINUTE)
+    assert len(part["BTCUSDT"]) == 100 and len(part["ETHUSDT"]) == 98
+    assert part["ETHUSDT"].index[0] == START_MS + 50 * MINUTE
+
+    trades = trades_data["ETHUSDT"].sample(frac=1, random_state=0)
+    joined = data.asof_join("ETHUSDT", trades, columns=["close", "volume"])
+    expected = pd.merge_asof(
+        trades.sort_values("time").astype({"time": np.int64}),
+        data["ETHUSDT"][["close", "volume"]].reset_index(),
+        left_on="time",
+        right_on=TIME_INDEX,
+    )
+    joined = joined.sort_values(["time", "id"])
+    expected = expected.sort_values(["time", "id"])
+    assert joined["close"].to_numpy() == pytest.approx(
+        expected["close"].to_numpy(), nan_ok=True
+    )
+    early = joined["time"] < START_MS + 10 * MINUTE
+    assert early.any() and joined.loc[early, "close"].isna().all()
+
+
+def test_correlation_and_risk_use_bar_times(market) -> None:
+    data, _, _ = market
+    params = dict(
+        symbols=["BTCUSDT", "ETHUSDT"],
+        lookback_periods={"volume": 24, "volatility": 48, "correlation": 48, "momentum": 12},
+    )
+    rolling = MultiAssetCryptoStrategy(**params).calculate_correlation_matrix(data.frames)
+    returns = pd.DataFrame(
+        {sym: np.log(df["close"] / df["close"].shift(1)) for sym, df in data.frames.items()}
+    )
+    pd.testing.assert_frame_equal(rolling, returns.rolling(48).corr())
+    positional = MultiAssetCryptoStrategy(**params).calculate_correlation_matrix(
+        {sym: df.reset_index(drop=True) for sym, df in data.frames.items()}
+    )
+    assert not np.allclose(
+        positional.iloc[-1].to_numpy(), rolling.iloc[-1].to_numpy(), equal_nan=True
+    )
+
+    latest = MultiAssetCryptoStrategy(
+        **params, correlation_mode="latest"
+    ).calculate_correlation_matrix(data.frames)
+    pd.testing.assert_frame_equal(
+        latest, rolling.xs(data.axis[-1], level=0), check_names=False
+    )
+
+    strategy = MultiAssetCryptoStrategy(**params)
+    entry = datetime.utcfromtimestamp((START_MS + 250 * MINUTE) / 1000)
+    strategy.positions["ETHUSDT"] = Position("ETHUSDT", 1.0, 100.0, entry, "t")
+    risk = strategy.calculate_risk_metrics(data.frames)["ETHUSDT"]
+    high = data["ETHUSDT"]["high"].iloc[-50:].max()
+    close = data["ETHUSDT"]["close"].iloc[-1]
+    assert risk["drawdown"] == pytest.approx((close - high) / high * 100)
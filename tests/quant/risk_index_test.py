@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Position
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.risk_index import RangeMax, RiskIndex, RunningMoments
+from quant_api.utils.synthetic import START_MS, synthetic_market
+
+
+def test_range_max_matches_slices_while_growing() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=5000)
+    values[rng.random(5000) < 0.05] = np.nan
+    tree = RangeMax(capacity=4)
+    for chunk in np.array_split(values, 37):
+        tree.extend(chunk)
+    assert len(tree) == 5000
+
+    lefts = rng.integers(0, 5000, 500)
+    rights = rng.integers(0, 5001, 500)
+    expected = [
+        np.nanmax(values[l:r]) if r > l and not np.isnan(values[l:r]).all() else np.nan
+        for l, r in zip(lefts, rights)
+    ]
+    assert tree.query_many(lefts, rights) == pytest.approx(expected, nan_ok=True)
+    assert [tree.query(l, r) for l, r in zip(lefts, rights)] == pytest.approx(
+        expected, nan_ok=True
+    )
+    assert tree.query(4990) == pytest.approx(np.nanmax(values[4990:]))
+
+
+def test_running_moments_match_pandas() -> None:
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 5, 10_000)
+    moments = RunningMoments()
+    for chunk in np.array_split(values, 13):
+        moments.extend(chunk)
+    assert moments.mean == pytest.approx(values.mean())
+    assert moments.std() == pytest.approx(pd.Series(values).std(), rel=1e-12)
+
+    # value by value (the indicator engine) and chunks mixed, NaN skipped
+    mixed = RunningMoments()
+    for value in [*values[:100], np.nan]:
+        mixed.update(value)
+    mixed.extend(values[100:])
+    assert mixed.count == len(values)
+    assert mixed.std() == pytest.approx(moments.std(), rel=1e-12)
+    assert np.isnan(RunningMoments().mean) and np.isnan(RunningMoments([1.0]).std())
+
+
+def test_risk_metrics_extend_with_appended_bars() -> None:
+    klines_data, _ = synthetic_market(["BTCUSDT"], 1000, 0, seed=2)
+    frame = MarketData.from_klines(klines_data)["BTCUSDT"]
+    index = RiskIndex(frame.iloc[:600]).extend(frame.iloc[600:])
+    assert index.return_std() == pytest.approx(frame["close"].pct_change().std(), rel=1e-10)
+    assert index.high_since(700) == frame["high"].iloc[700:].max()
+
+    strategy = MultiAssetCryptoStrategy(symbols=["BTCUSDT"])
+    entry = pd.Timestamp(START_MS + 900 * 60_000, unit="ms").to_pydatetime()
+    strategy.positions["BTCUSDT"] = Position("BTCUSDT", 1.0, 100.0, entry, "t")
+    strategy.calculate_risk_metrics({"BTCUSDT": frame.iloc[:950]})
+    risk = strategy.calculate_risk_metrics({"BTCUSDT": frame})["BTCUSDT"]
+    assert strategy.cache_stats()["extensions"] == 1
+
+    high = frame["high"].iloc[900:].max()
+    close = frame["close"].iloc[-1]
+    vol = frame["close"].pct_change().std() * np.sqrt(24)
+    assert risk["drawdown"] == pytest.approx((close - high) / high * 100)
+    assert risk["dynamic_stop"] == pytest.approx(100.0 * (1 - vol * 2))
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Order
+from quant_api.quant.backtest import Backtester
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.schedule import ExecutionScheduler
+from quant_api.utils.synthetic import synthetic_market
+
+HOUR = 3_600_000
+# volume 1..24 in hours 0..23, one unseen hour
+CURVE = np.arange(1.0, 25.0)
+CURVE[5] = np.nan
+
+
+def test_vwap_follows_the_curve_and_twap_is_flat() -> None:
+    # 6 half-hour slices from 02:00: hours 2, 2, 3, 3, 4, 4
+    start = 10 * 24 * HOUR + 2 * HOUR
+    args = (["A", "B"], ["BUY", "SELL"], [120.0, 30.0], start)
+    markets = dict(
+        curves={"A": CURVE, "B": np.full(24, np.nan)},
+        prices={"A": 100.0, "B": 10.0},
+        spreads={"A": 0.01},
+    )
+
+    vwap = ExecutionScheduler("vwap", slices=6, slice_ms=HOUR // 2)
+    children = vwap.schedule(*args, **markets).children
+    a = children[children["parent"] == 0]
+    assert a["size"].to_numpy() == pytest.approx(120 * np.array([3, 3, 4, 4, 5, 5]) / 24)
+    assert (a["time"].diff().dropna() >= pd.Timedelta(0)).all()
+    assert a["price"].to_numpy() == pytest.approx(100 * (1 + 0.01 * np.arange(6) / 6))
+    # no curve: equal slices, selling below the reference without a spread
+    b = children[children["parent"] == 1]
+    assert b["size"].to_numpy() == pytest.approx(np.full(6, 5.0))
+    assert (b["price"] == 10.0).all()
+
+    twap = ExecutionScheduler("twap", slices=6, slice_ms=HOUR // 2)
+    flat = twap.schedule(*args, **markets).children
+    assert flat.groupby("parent")["size"].sum().to_numpy() == pytest.approx([120, 30])
+    assert flat["time"].is_monotonic_increasing
+    assert flat["time"].iloc[0] == pd.Timestamp(start, unit="ms")
+
+
+def test_pov_caps_children_and_reports_the_rest() -> None:
+    # hour 5 is unseen: the mean of the other hours fills it
+    start = 5 * HOUR
+    pov = ExecutionScheduler("pov", slices=4, slice_ms=HOUR, participation=0.5)
+    schedule = pov.schedule(
+        ["A", "A"], ["BUY", "BUY"], [8.0, 100.0], start, {"A": CURVE}, {"A": 1.0}
+    )
+    expected = 0.5 * np.array([np.nanmean(CURVE), 7.0, 8.0, 9.0])
+    small = schedule.children[schedule.children["parent"] == 0]
+    large = schedule.children[schedule.children["parent"] == 1]
+    assert small["size"].to_numpy() == pytest.approx([expected[0], 8 - expected[0]])
+    assert large["size"].to_numpy() == pytest.approx(expected)
+    assert schedule.unscheduled == pytest.approx([0.0, 100 - expected.sum()])
+
+    # carried: the rest in a last child at the end of the horizon
+    carry = ExecutionScheduler(
+        "pov", slices=4, slice_ms=HOUR, participation=0.5, carry_remainder=True
+    )
+    carried = carry.schedule(
+        ["A", "A"], ["SELL", "SELL"], [8.0, 100.0], start, {"A": CURVE}, {"A": 1.0}
+    )
+    sizes = carried.children.groupby("parent")["size"].sum()
+    assert sizes.to_numpy() == pytest.approx([8.0, 100.0])
+    last = carried.children.iloc[-1]
+    assert last["parent"] == 1 and last["size"] == pytest.approx(100 - expected.sum())
+    assert last["time"] == pd.Timestamp(start + 4 * HOUR, unit="ms")
+    assert carried.unscheduled == pytest.approx(schedule.unscheduled)
+
+    with pytest.raises(ValueError):
+        ExecutionScheduler("implementation_shortfall")
+
+
+def test_strategy_schedules_from_the_next_bar() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data, trades_data = synthetic_market(symbols, 600, 2000, seed=4)
+    frames = MarketData.from_klines(klines_data).frames
+    strategy = MultiAssetCryptoStrategy(symbols=symbols)
+    orders = [
+        Order(symbols[i % 2], "BUY" if i % 3 else "SELL", 1.0 + i, "MARKET")
+        for i in range(1000)
+    ]
+    schedule = strategy.schedule_order_execution(orders, trades_data, frames)
+
+    sizes = schedule.children.groupby("parent")["size"].sum()
+    assert sizes.to_numpy() == pytest.approx([order.size for order in orders])
+    stats = strategy.liquidity_stats(trades_data, frames, full=True)
+    next_bar = max(s.next_bar_time for s in stats.values())
+    assert schedule.children["time"].min() == pd.Timestamp(next_bar, unit="ms")
+    first = schedule.children.iloc[0]
+    assert first["price"] == frames[first["symbol"]]["close"].iloc[-1]
+    assert len(strategy.schedule_order_execution([], trades_data, frames)) == 0
+
+
+def test_split_orders_are_released_bar_by_bar() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data, trades_data = synthetic_market(symbols, 600, 2000, seed=4)
+    frames = MarketData.from_klines(klines_data).frames
+    size = 200 * trades_data["BTCUSDT"]["quantity"].mean()
+    large = Order("BTCUSDT", "BUY", size, "MARKET")
+    small = Order("ETHUSDT", "SELL", 1e-6, "MARKET")
+
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, execution_schedule="twap")
+    orders = strategy.optimize_order_execution([large, small], trades_data, frames)
+    assert orders[0] == small  # below the impact limit: at once
+    children = orders[1:]
+    assert len(children) > 1
+    assert sum(child.size for child in children) == pytest.approx(large.size)
+    bar = pd.Timedelta(int(np.diff(frames["BTCUSDT"].index[-2:])[0]), unit="ms")
+    times = [child.time for child in children]
+    assert times[0] == pd.Timestamp(int(frames["BTCUSDT"].index[-1]), unit="ms") + bar
+    assert all(b - a == bar for a, b in zip(times, times[1:]))
+
+    # pov: the volume the bars cannot absorb is not dropped
+    pov = MultiAssetCryptoStrategy(
+        symbols=symbols, execution_schedule="pov", participation=0.01
+    )
+    carried = pov.optimize_order_execution([large], trades_data, frames)
+    assert sum(child.size for child in carried) == pytest.approx(large.size)
+
+    # not scheduled by default
+    unscheduled = MultiAssetCryptoStrategy(symbols=symbols)
+    chunks = unscheduled.optimize_order_execution([large], trades_data, frames)
+    assert len(chunks) == len(children)
+    assert all(chunk.time is None for chunk in chunks)
+
+
+def test_backtester_releases_children_at_their_time() -> None:
+    symbols = ["BTCUSDT"]
+    klines_data, _ = synthetic_market(symbols, 200, 0, seed=2)
+    timestamps = 1_700_000_000_000 + HOUR * np.arange(200)
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, volume_source="klines")
+    backtester = Backtester(
+        strategy, klines_data, warmup_bars=100, timestamps=timestamps
+    )
+    assert backtester.bar_ms == HOUR
+    release = [
+        pd.Timestamp(timestamps[t], unit="ms").to_pydatetime() for t in (101, 104, 106)
+    ]
+    orders = iter(
+        [[Order("BTCUSDT", "BUY", 1.0, "MARKET", time=time) for time in release]]
+    )
+    strategy.run_iteration_incremental = lambda *args, **kwargs: next(orders, [])
+    fills = backtester.run().fills
+    assert fills["time"].tolist() == release
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.backtest import Backtester
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.sizing import (
+    PortfolioSizer,
+    min_variance,
+    project_capped_simplex,
+    risk_parity,
+    shrunk_covariance,
+)
+from quant_api.utils.synthetic import synthetic_market
+
+
+def factor_returns(n_bars: int, n_symbols: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, (n_bars, 1))
+    loadings = rng.uniform(0.5, 2, n_symbols)
+    noise = rng.normal(0, 0.01, (n_bars, n_symbols)) * rng.uniform(0.5, 3, n_symbols)
+    return factor * loadings + noise
+
+
+def test_ledoit_wolf_matches_definition() -> None:
+    returns = factor_returns(60, 8)
+    cov, shrinkage = shrunk_covariance(returns)
+
+    x = returns - returns.mean(axis=0)
+    sample = x.T @ x / len(x)
+    mu = np.trace(sample) / 8
+    delta = np.sum((sample - mu * np.eye(8)) ** 2) / 8
+    beta = sum(np.sum((np.outer(row, row) - sample) ** 2) for row in x) / 8 / len(x) ** 2
+    expected = min(beta, delta) / delta
+    assert shrinkage == pytest.approx(expected)
+    assert 0 < shrinkage < 1
+    assert cov == pytest.approx(expected * mu * np.eye(8) + (1 - expected) * sample)
+
+
+def test_projection_onto_capped_simplex() -> None:
+    rng = np.random.default_rng(1)
+    v = rng.normal(size=50)
+    upper = rng.uniform(0.01, 0.1, 50)
+    w = project_capped_simplex(v, upper, 1.0)
+    assert w.sum() == pytest.approx(1.0)
+    assert (w >= 0).all() and (w <= upper).all()
+
+    # tau by bisection on the same piecewise linear function
+    lo, hi = v.min() - upper.max(), v.max()
+    for _ in range(200):
+        tau = (lo + hi) / 2
+        lo, hi = (tau, hi) if np.clip(v - tau, 0, upper).sum() > 1 else (lo, tau)
+    assert w == pytest.approx(np.clip(v - lo, 0, upper), abs=1e-12)
+    assert (project_capped_simplex(v, upper, 10.0) == upper).all()
+
+
+def test_risk_parity_equalizes_risk_contributions() -> None:
+    cov, _ = shrunk_covariance(factor_returns(168, 30))
+    w, iterations = risk_parity(cov)
+    contributions = w * (cov @ w)
+    assert w.sum() == pytest.approx(1.0)
+    assert contributions == pytest.approx(np.full(30, contributions.mean()), rel=1e-6)
+
+    # from the previous solution on a slightly moved covariance
+    moved, _ = shrunk_covariance(factor_returns(168, 30)[1:])
+    _, cold = risk_parity(moved)
+    _, warm = risk_parity(moved, x0=w)
+    assert warm < cold
+
+
+def test_min_variance_satisfies_kkt() -> None:
+    cov, _ = shrunk_covariance(factor_returns(168, 40, seed=2))
+    upper = np.full(40, 0.1)
+    w, _ = min_variance(cov, upper, total=2.0)
+    assert w.sum() == pytest.approx(2.0)
+    assert (w >= 0).all() and (w <= upper + 1e-12).all()
+
+    # optimality: no feasible pairwise transfer lowers the variance
+    gradient = cov @ w
+    can_grow = w < upper - 1e-9
+    can_shrink = w > 1e-9
+    assert gradient[can_grow].min() >= gradient[can_shrink].max() - 1e-10
+
+    long_run, _ = min_variance(cov, upper, 2.0, tol=1e-14, polish_every=10**9)
+    assert w @ cov @ w == pytest.approx(long_run @ cov @ long_run, rel=1e-9)
+
+
+def test_sizer_respects_caps_and_leverage() -> None:
+    returns = factor_returns(168, 5, seed=3)
+    returns[:, 4] = np.nan  # no data: no weight
+    upper = np.array([1.0, 1.0, 0.05, 1.0, 1.0])
+    for mode in ("risk_parity", "min_variance"):
+        sizer = PortfolioSizer(list("ABCDE"), mode, leverage=2.0, upper=upper)
+        weights = sizer.solve(returns)
+        assert sum(weights.values()) == pytest.approx(2.0)
+        assert weights["C"] <= 0.1 + 1e-12
+        assert weights["E"] == 0.0
+
+
+def test_sizer_falls_back_to_equal_weights_without_variance() -> None:
+    rng = np.random.default_rng(4)
+    flat = np.zeros((50, 3))
+    halted = rng.normal(0, 0.01, (50, 3))
+    halted[:, 1] = 0.0
+    for mode in ("risk_parity", "min_variance"):
+        for returns in (flat, halted):
+            sizer = PortfolioSizer(["a", "b", "c"], mode=mode, leverage=0.9)
+            weights = np.array(list(sizer.solve(returns).values()))
+            assert np.allclose(weights, 0.3)
+            assert sizer.iterations == 0
+    # the solvers alone, on a covariance without variance
+    assert np.allclose(risk_parity(np.zeros((3, 3)))[0], 1 / 3)
+    capped = min_variance(np.zeros((3, 3)), np.array([0.1, 1.0, 1.0]))[0]
+    assert np.allclose(capped, [0.1, 0.45, 0.45])
+
+
+def test_strategy_solves_weights_in_batch_and_incremental_modes() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines_data, _ = synthetic_market(symbols, 400, 0, seed=6)
+    frames = MarketData.from_klines(klines_data).frames
+    lookbacks = {"volume": 24, "volatility": 48, "correlation": 48, "momentum": 12}
+
+    strategy = MultiAssetCryptoStrategy(
+        symbols=symbols, lookback_periods=lookbacks, sizing_mode="risk_parity"
+    )
+    sizes = strategy.calculate_position_sizes(None, None, None, frames)
+    assert sum(sizes.values()) == pytest.approx(1.0)
+    returns = strategy._returns_window(frames, symbols).to_numpy()
+    cov, _ = shrunk_covariance(returns)
+    w = np.array([sizes[symbol] for symbol in symbols])
+    assert w * (cov @ w) == pytest.approx(np.full(3, (w * (cov @ w)).mean()), rel=1e-6)
+
+    with pytest.raises(ValueError):
+        MultiAssetCryptoStrategy(symbols=symbols, sizing_mode="kelly")
+
+    result = Backtester(
+        MultiAssetCryptoStrategy(
+            symbols=symbols, lookback_periods=lookbacks, sizing_mode="min_variance"
+        ),
+        frames,
+    ).run()
+    assert result.stats["bars"] > 0
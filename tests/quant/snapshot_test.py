@@ -0,0 +1,98 @@
+import pickle
+import zlib
+
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Position
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.snapshot import (
+    MAGIC,
+    VERSION,
+    SnapshotError,
+    dump_snapshot,
+    load_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+LOOKBACKS = {"volume": 24, "volatility": 48, "correlation": 48, "momentum": 12}
+
+
+@pytest.fixture
+def frames():
+    klines_data, _ = synthetic_market(SYMBOLS, 500, 0, seed=9)
+    return MarketData.from_klines(klines_data).frames
+
+
+def new_strategy(**params) -> MultiAssetCryptoStrategy:
+    return MultiAssetCryptoStrategy(
+        symbols=SYMBOLS, lookback_periods=LOOKBACKS, volume_source="klines", **params
+    )
+
+
+def test_restore_replays_the_missed_bars(frames) -> None:
+    head = {symbol: klines.iloc[:400] for symbol, klines in frames.items()}
+    live = new_strategy(sizing_mode="risk_parity")
+    live.warm_up(head)
+    live.positions["BTCUSDT"] = Position("BTCUSDT", 0.5, 100.0, None, 7)
+    live.calculate_volatility_metrics(head)
+    data = dump_snapshot(live)
+
+    restored = new_strategy(sizing_mode="risk_parity")
+    assert load_snapshot(restored, data, frames) == 100
+    assert restored.positions == live.positions
+    assert restored.cache_stats()["entries"] == live.cache_stats()["entries"]
+
+    # same state as a strategy that saw every bar live
+    reference = new_strategy(sizing_mode="risk_parity")
+    reference.warm_up(frames)
+    for symbol in SYMBOLS:
+        assert restored.indicator_engine.latest(symbol) == pytest.approx(
+            reference.indicator_engine.latest(symbol), nan_ok=True
+        )
+    assert restored.indicator_engine.correlation.value == pytest.approx(
+        reference.indicator_engine.correlation.value, nan_ok=True
+    )
+    assert restored.indicator_engine.last_times == {
+        symbol: int(klines.index[-1]) for symbol, klines in frames.items()
+    }
+    assert restored.generate_signals_incremental() == (
+        reference.generate_signals_incremental()
+    )
+
+
+def test_invalid_snapshots_leave_the_strategy_alone(frames, tmp_path) -> None:
+    strategy = new_strategy()
+    strategy.warm_up(frames)
+    path = str(tmp_path / "strategy.snap")
+    write_snapshot(path, strategy, include_cache=False)
+    assert read_snapshot(path, new_strategy(), frames) == 0
+
+    engine = strategy.indicator_engine
+    changed = {symbol: klines.copy() for symbol, klines in frames.items()}
+    changed["ETHUSDT"].iloc[-1, changed["ETHUSDT"].columns.get_loc("close")] *= 1.01
+    target = new_strategy()
+    untouched = target.indicator_engine
+    with pytest.raises(SnapshotError, match="changed"):
+        read_snapshot(path, target, changed)
+    with pytest.raises(SnapshotError, match="not in the klines"):
+        read_snapshot(path, target, {s: k.iloc[:-1] for s, k in frames.items()})
+    with pytest.raises(SnapshotError, match="other parameters"):
+        read_snapshot(path, new_strategy(rsi_period=7), frames)
+    with pytest.raises(SnapshotError):
+        load_snapshot(target, dump_snapshot(strategy)[:-10], frames)
+    with pytest.raises(SnapshotError, match="no klines for SOLUSDT"):
+        read_snapshot(path, target, {s: frames[s] for s in SYMBOLS[:2]})
+    # a class that no longer exists, a payload that is not a state
+    for payload in (b"cmissing_module\nState\n.", pickle.dumps(1)):
+        data = MAGIC + bytes([VERSION]) + zlib.compress(payload)
+        with pytest.raises(SnapshotError, match="corrupt"):
+            load_snapshot(target, data, frames)
+    with pytest.raises(SnapshotError):
+        load_snapshot(target, MAGIC, frames)
+    assert target.indicator_engine is untouched
+    assert np.isnan(untouched.latest("ETHUSDT").get("close", np.nan))
+    assert engine.last_times["ETHUSDT"] == int(frames["ETHUSDT"].index[-1])
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.backtest import Backtester
+from quant_api.quant.sweep import (
+    ParameterSweep,
+    SharedMarketData,
+    grid_candidates,
+    random_candidates,
+    set_param,
+)
+from tests.quant.indicators_test import make_klines, make_trades
+
+
+@pytest.fixture
+def market():
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(300, i) for i, sym in enumerate(symbols)}
+    trades_data = {sym: make_trades(500, 10 + i) for i, sym in enumerate(symbols)}
+    with SharedMarketData.create(klines_data, trades_data) as shared:
+        yield shared, klines_data, trades_data
+
+
+def test_sweep_matches_serial_backtests(market) -> None:
+    shared, klines_data, trades_data = market
+    base = {"lookback_periods": {"correlation": 48}}
+    grid = {"rsi_period": [7, 14], "lookback_periods.correlation": [24, 48]}
+
+    sweep = ParameterSweep(
+        shared, base, {"warmup_bars": 60}, metric="total_return", max_workers=2
+    )
+    results = sorted(sweep.run(grid_candidates(grid)), key=lambda r: r.index)
+
+    assert len(results) == 4
+    for result in results:
+        assert result.error is None
+        assert result.params["symbols"] == shared.symbols
+        expected = Backtester(
+            MultiAssetCryptoStrategy(**result.params),
+            klines_data,
+            trades_data,
+            warmup_bars=60,
+        ).run()
+        assert result.stats == pytest.approx(expected.stats, nan_ok=True)
+    assert sweep.best.score == max(r.score for r in results)
+
+
+def test_sweep_shares_the_trade_feed() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(300, i) for i, sym in enumerate(symbols)}
+    timestamps = 1_700_000_000_000 + 60_000 * np.arange(300)
+    rng = np.random.default_rng(1)
+    trades_data = {
+        sym: make_trades(800, 10 + i).assign(
+            time=rng.integers(timestamps[0], timestamps[-1], 800)
+        )
+        for i, sym in enumerate(symbols)
+    }
+    with SharedMarketData.create(
+        klines_data, trades_data, symbols, timestamps
+    ) as shared:
+        assert shared.trades_block is None
+        sweep = ParameterSweep(
+            shared, {}, {"warmup_bars": 60}, metric="total_return", max_workers=1
+        )
+        (result,) = sweep.run([{"rsi_period": 7}])
+
+    expected = Backtester(
+        MultiAssetCryptoStrategy(**result.params),
+        klines_data,
+        trades_data,
+        warmup_bars=60,
+        timestamps=timestamps,
+    ).run()
+    assert result.error is None
+    assert result.stats == pytest.approx(expected.stats, nan_ok=True)
+
+
+def test_sweep_early_stopping(market) -> None:
+    shared, _, _ = market
+    sweep = ParameterSweep(
+        shared, {}, {"warmup_bars": 60}, patience=2, max_workers=1
+    )
+    candidates = random_candidates(
+        {"rsi_period": {"low": 5, "high": 30}, "vol_threshold": [1.5, 2.0]},
+        n_samples=50,
+        seed=0,
+    )
+    results = list(sweep.run(candidates))
+    assert len(results) < 50
+    for result in results:
+        assert 5 <= result.params["rsi_period"] <= 30
+        assert isinstance(result.params["rsi_period"], int)
+
+
+def test_set_param_reaches_nested_dicts() -> None:
+    params = {"lookback_periods": {"volume": 24, "correlation": 168}}
+    updated = set_param(params, "lookback_periods.correlation", 48)
+    assert updated["lookback_periods"] == {"volume": 24, "correlation": 48}
+    assert params["lookback_periods"]["correlation"] == 168
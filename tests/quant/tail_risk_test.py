@@ -0,0 +1,118 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from quant_api.quant import MultiAssetCryptoStrategy, Position
+from quant_api.quant.market_data import MarketData
+from quant_api.quant.tail_risk import TailRiskEngine, matrix_root
+from quant_api.utils.synthetic import synthetic_market
+
+
+def correlated_returns(n_bars: int, n_symbols: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, (n_bars, 1))
+    return 0.6 * factor + rng.normal(0, 0.008, (n_bars, n_symbols))
+
+
+def test_normal_var_matches_closed_form() -> None:
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.0005, 0.02, (50_000, 1))
+    engine = TailRiskEngine(n_paths=200_000, confidence=0.99, seed=0)
+    result = engine.run(returns, [1000.0], ["BTCUSDT"])
+
+    mu, sigma = returns.mean(), returns.std(ddof=1)
+    z = NormalDist().inv_cdf(0.01)
+    assert result["portfolio"]["var"] == pytest.approx(
+        -1000 * np.expm1(mu + z * sigma), rel=0.02
+    )
+    # mean of the normal tail beyond the quantile
+    tail_mean = mu - sigma * NormalDist().pdf(z) / 0.01
+    assert result["portfolio"]["cvar"] == pytest.approx(
+        -1000 * np.expm1(tail_mean), rel=0.02
+    )
+
+
+@pytest.mark.parametrize("method", ["cholesky", "bootstrap"])
+def test_streamed_tail_matches_full_sort(method: str) -> None:
+    returns = correlated_returns(500, 5)
+    exposures = np.array([1000.0, -500.0, 2000.0, 0.0, -1500.0])
+    symbols = [f"S{j}" for j in range(5)]
+    params = dict(n_paths=5000, confidence=0.95, horizon=4, method=method, seed=7)
+
+    # one path per batch against everything in one batch
+    streamed = TailRiskEngine(**params, memory_budget=1).run(returns, exposures, symbols)
+    engine = TailRiskEngine(**params, memory_budget=1 << 30)
+    result = engine.run(returns, exposures, symbols)
+    assert streamed["portfolio"] == pytest.approx(result["portfolio"])
+    for symbol in symbols:
+        assert streamed["symbols"][symbol] == pytest.approx(result["symbols"][symbol])
+
+    (simulated,) = engine._batches(returns, None)
+    losses = -np.expm1(simulated) * exposures
+    portfolio = np.sort(losses.sum(axis=1))[::-1]
+    k = engine.tail_size
+    assert k == 250
+    assert result["portfolio"]["var"] == pytest.approx(portfolio[k - 1])
+    assert result["portfolio"]["cvar"] == pytest.approx(portfolio[:k].mean())
+    worst = np.sort(losses, axis=0)[::-1][:k]
+    for j, symbol in enumerate(symbols):
+        assert result["symbols"][symbol]["var"] == pytest.approx(worst[-1, j])
+        assert result["symbols"][symbol]["cvar"] == pytest.approx(worst[:, j].mean())
+    components = sum(metrics["component_cvar"] for metrics in result["symbols"].values())
+    assert components == pytest.approx(result["portfolio"]["cvar"])
+
+
+def test_matrix_root_of_indefinite_correlation() -> None:
+    # pairwise estimates need not be positive semi-definite
+    corr = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+    root = matrix_root(corr)
+    assert np.linalg.eigvalsh(root @ root.T).min() >= -1e-12
+    assert np.abs(root @ root.T - corr).max() < 0.7
+
+
+def test_strategy_portfolio_risk() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    klines_data, _ = synthetic_market(symbols, 400, 0, seed=4)
+    klines_data = MarketData.from_klines(klines_data).frames
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, correlation_mode="latest")
+    for symbol, size in (("BTCUSDT", 0.5), ("SOLUSDT", -20.0)):
+        strategy.positions[symbol] = Position(symbol, size, 1.0, None, 0)
+
+    result = strategy.calculate_portfolio_risk(klines_data, seed=0)
+    assert set(result["symbols"]) == {"BTCUSDT", "SOLUSDT"}
+    portfolio = result["portfolio"]
+    assert 0 < portfolio["var"] <= portfolio["cvar"] <= portfolio["worst_loss"]
+    assert portfolio["stress_loss"] > portfolio["var"]
+
+    # the last window of the rolling correlation, without computing the rest
+    rolling = MultiAssetCryptoStrategy(symbols=symbols)
+    rolling.positions = dict(strategy.positions)
+    assert rolling.calculate_portfolio_risk(klines_data, seed=0) == result
+    assert rolling.cache_stats()["misses"] == 0
+
+    bootstrap = strategy.calculate_portfolio_risk(klines_data, method="bootstrap", seed=0)
+    assert bootstrap["portfolio"]["var"] == pytest.approx(portfolio["var"], rel=0.3)
+
+
+def test_risk_metrics_report_tail_risk() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data, _ = synthetic_market(symbols, 400, 0, seed=5)
+    klines_data = MarketData.from_klines(klines_data).frames
+    position = Position("ETHUSDT", 2.0, 1.0, None, 0)
+    # opt-in
+    default = MultiAssetCryptoStrategy(symbols=symbols)
+    default.positions["ETHUSDT"] = position
+    assert "var" not in default.calculate_risk_metrics(klines_data)["ETHUSDT"]
+    assert default.portfolio_risk == {}
+
+    strategy = MultiAssetCryptoStrategy(symbols=symbols, tail_risk_paths=2000)
+    assert strategy.calculate_risk_metrics(klines_data) == {}
+    assert strategy.portfolio_risk == {}
+
+    strategy.positions["ETHUSDT"] = position
+    risk = strategy.calculate_risk_metrics(klines_data)["ETHUSDT"]
+    assert 0 < risk["var"] <= risk["cvar"]
+    assert strategy.portfolio_risk["cvar"] == pytest.approx(risk["component_cvar"])
+    # reproducible
+    assert strategy.calculate_risk_metrics(klines_data)["ETHUSDT"] == risk
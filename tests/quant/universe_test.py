@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from benchmarks.fake_binance import LISTED, ticker_rows
+from quant_api.apis.v1 import quant as quant_api
+from quant_api.quant import universe
+
+
+def ticker(symbol: str, quote_volume: float, last: float = 1.0) -> dict:
+    return {"symbol": symbol, "quoteVolume": str(quote_volume), "lastPrice": str(last)}
+
+
+def test_usd_volumes_convert_non_usd_quotes() -> None:
+    tickers = [
+        ticker("BTCUSDT", 5e9, last=40_000),
+        ticker("ETHBTC", 100.0),
+        ticker("BTCFDUSD", 2e6),
+        ticker("FOOXYZ", 1e9),
+        ticker("ETHBNB", 1e3),  # no BNBUSDT to price it
+    ]
+    assert universe.usd_volumes(tickers) == {
+        "BTCUSDT": 5e9,
+        "ETHBTC": 4e6,
+        "BTCFDUSD": 2e6,
+    }
+    assert universe.conversion_symbols(["ETHBTC", "SOLBTC"]) == ["BTCUSDT"]
+    assert universe.conversion_symbols(["ETHBTC", "BTCUSDT"]) == []
+    assert universe.conversion_symbols(["ETHBTC", "ETHBNB"]) == ["BTCUSDT", "BNBUSDT"]
+
+
+def test_select_expands_patterns_and_keeps_order() -> None:
+    volumes = {"BTCUSDT": 5e9, "ETHUSDT": 2e9, "DOGEUSDT": 5e5, "ETHBTC": 4e6}
+    assert universe.select(["ETHUSDT", "BTCUSDT"], volumes, 1e6) == ["ETHUSDT", "BTCUSDT"]
+    assert universe.select(["*USDT"], volumes, 1e6) == ["BTCUSDT", "ETHUSDT"]
+    assert universe.select(["*USDT", "ETHBTC"], volumes, 0) == [
+        "BTCUSDT", "DOGEUSDT", "ETHUSDT", "ETHBTC"
+    ]
+    # unknown symbols have no volume
+    assert universe.select(["XYZUSDT"], volumes, 0) == []
+
+
+def test_select_symbols_uses_one_ticker_call(monkeypatch) -> None:
+    calls = []
+
+    async def get_ticker_24hr(symbols=None):
+        calls.append(symbols)
+        return ticker_rows(symbols or LISTED, seed=0, now=0)
+
+    monkeypatch.setattr(quant_api, "get_ticker_24hr", get_ticker_24hr)
+    volumes = universe.usd_volumes(ticker_rows(LISTED, seed=0, now=0))
+    threshold = sorted(volumes.values())[len(volumes) // 2]
+
+    selected = asyncio.run(quant_api.select_symbols(["*usdt"], threshold))
+    assert calls == [None]
+    assert selected == [
+        sb for sb in sorted(LISTED) if sb.endswith("USDT") and volumes[sb] >= threshold
+    ]
+
+    calls.clear()
+    asyncio.run(quant_api.select_symbols(["ethbtc", "btcusdt"], threshold))
+    assert calls == [["ETHBTC", "BTCUSDT"]]
+
+    calls.clear()
+    assert asyncio.run(quant_api.select_symbols(["ethbtc"], 0)) == ["ETHBTC"]
+    assert calls == []
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(quant_api.select_symbols(["btcusdt"], float("inf")))
+    assert excinfo.value.status_code == 422
@@ -0,0 +1,98 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from quant_api.apis.v1 import quant as quant_api
+from quant_api.quant import MultiAssetCryptoStrategy
+from quant_api.quant.backtest import Backtester
+from quant_api.schemas.market import MarketDataForQuant
+from quant_api.utils.frames import taker_trades
+from quant_api.utils.synthetic import synthetic_market
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+LOOKBACKS = {"volume": 24, "volatility": 48, "correlation": 48, "momentum": 12}
+
+
+@pytest.fixture
+def market():
+    klines_data, _ = synthetic_market(SYMBOLS, 400, 0, seed=5)
+    klines_data, timestamps = quant_api.replay_klines(klines_data, SYMBOLS)
+    # one-sided flow, so the ratio drives orders
+    for symbol, share in zip(SYMBOLS, (0.4, 0.6)):
+        klines = klines_data[symbol]
+        klines["takerBaseVolume"] = klines["volume"] * share
+    trades_data = {
+        symbol: taker_trades(klines, timestamps) for symbol, klines in klines_data.items()
+    }
+    return klines_data, trades_data, timestamps
+
+
+@pytest.mark.parametrize("panel_mode", [False, True])
+def test_klines_ratio_matches_taker_trades(market, panel_mode: bool) -> None:
+    klines_data, trades_data, _ = market
+    params = dict(symbols=SYMBOLS, lookback_periods=LOOKBACKS, panel_mode=panel_mode)
+    from_trades = MultiAssetCryptoStrategy(**params).calculate_volume_profile(
+        trades_data, klines_data
+    )
+    strategy = MultiAssetCryptoStrategy(**params, volume_source="klines")
+    head = {symbol: klines.iloc[:300] for symbol, klines in klines_data.items()}
+    strategy.calculate_volume_profile(None, head)
+    from_klines = strategy.calculate_volume_profile(None, klines_data)
+    assert strategy.cache_stats()["extensions"] == len(SYMBOLS)
+
+    for symbol, klines in klines_data.items():
+        profile = from_klines[symbol]
+        pd.testing.assert_frame_equal(
+            profile.drop(columns="buy_sell_ratio_rolling"), from_trades[symbol]
+        )
+        sell = klines["takerBaseVolume"]
+        expected = (klines["volume"] - sell).rolling(24).sum() / sell.rolling(24).sum()
+        assert profile["buy_sell_ratio_rolling"].to_numpy() == pytest.approx(
+            expected.to_numpy(), nan_ok=True
+        )
+
+
+def test_backtest_feeds_klines_taker_volume(market) -> None:
+    klines_data, trades_data, timestamps = market
+    params = dict(symbols=SYMBOLS, lookback_periods=LOOKBACKS)
+    avg_trade_sizes = {
+        symbol: klines["volume"].sum() / klines["count"].sum()
+        for symbol, klines in klines_data.items()
+    }
+
+    expected = Backtester(
+        MultiAssetCryptoStrategy(**params),
+        klines_data,
+        trades_data,
+        timestamps=timestamps,
+        avg_trade_sizes=avg_trade_sizes,
+    ).run()
+    result = Backtester(
+        MultiAssetCryptoStrategy(**params, volume_source="klines"),
+        klines_data,
+        timestamps=timestamps,
+    ).run()
+
+    assert result.stats["fills"] > 0
+    assert result.stats == pytest.approx(expected.stats, nan_ok=True)
+    pd.testing.assert_frame_equal(result.fills, expected.fills)
+
+
+def test_klines_only_load_skips_trades(monkeypatch) -> None:
+    klines_data, _ = synthetic_market(["BTCUSDT"], 24, 0)
+    requested = []
+
+    async def aget_data(market_data_type, **kwargs):
+        requested.append(market_data_type)
+        return {"BTCUSDT-1h.csv": klines_data["BTCUSDT"]}
+
+    monkeypatch.setattr(quant_api.BinanceMarket, "aget_data", aget_data)
+    target = MarketDataForQuant(start_date="2024-01-01", end_date="2024-01-01")
+    klines, trades = asyncio.run(
+        quant_api.load_past_data(target, ["BTCUSDT"], trades=False)
+    )
+
+    assert requested == ["klines"]
+    assert trades is None
+    assert len(klines["BTCUSDT"]) == 24
@@ -0,0 +1,40 @@
+import numpy as np
+
+from quant_api.utils.binance_market import extract_zip_content
+from quant_api.utils.frames import SIDE_BUY, buy_mask, klines_frame, trades_frame
+from quant_api.utils.synthetic import archive_zip, synthetic_market
+
+
+def archive_parts(frame, days: int):
+    content = extract_zip_content(archive_zip(frame, "part.csv"))
+    return [content["part.csv"]] * days
+
+
+def test_archive_parts_to_standard_and_compact_frames() -> None:
+    klines, trades = synthetic_market(["BTCUSDT"], 1440, 20_000)
+    klines_parts = archive_parts(klines["BTCUSDT"], 2)
+    trades_parts = archive_parts(trades["BTCUSDT"], 2)
+
+    standard = klines_frame(klines_parts)
+    assert standard.shape == (2880, 12)
+    assert standard["last"].iloc[0] == klines["BTCUSDT"]["last"].iloc[0]
+    compact = klines_frame(klines_parts, compact=True)
+    assert compact["open"].dtype == np.int64 and compact["last"].dtype == np.float32
+    assert compact.memory_usage().sum() < 0.6 * standard.memory_usage().sum()
+
+    standard = trades_frame(trades_parts)
+    compact = trades_frame(trades_parts, compact=True)
+    assert list(standard["side"].iloc[:5]) == list(trades["BTCUSDT"]["side"].iloc[:5])
+    assert compact["side"].dtype == np.int8
+    assert (buy_mask(compact) == buy_mask(standard)).all()
+    assert (compact["side"][buy_mask(compact)] == SIDE_BUY).all()
+    assert compact.memory_usage(deep=True).sum() < 0.4 * standard.memory_usage(deep=True).sum()
+
+
+def test_header_row_is_dropped() -> None:
+    klines, _ = synthetic_market(["BTCUSDT"], 10, 1)
+    part = klines["BTCUSDT"].astype(str)
+    part = part.T.reset_index().T.reset_index(drop=True)  # header as first row
+    frame = klines_frame([part], compact=True)
+    assert len(frame) == 10
+    assert frame["close"].iloc[-1] == klines["BTCUSDT"]["close"].iloc[-1]
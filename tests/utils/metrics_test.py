@@ -0,0 +1,70 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from quant_api import apis
+from quant_api.assemble.executor import StrategyExecutor
+from quant_api.assemble.middleware import ServerTimingMiddleware
+from quant_api.quant import tasks
+from quant_api.utils.metrics import Metrics, metrics
+from tests.quant.indicators_test import make_klines, make_trades
+
+
+def test_render_prometheus_text() -> None:
+    registry = Metrics()
+    with registry.stage("csv_parse"):
+        pass
+    registry.stage_seconds.observe("csv_parse", 2.0)
+    registry.count_rows("csv_parse", 1440)
+
+    text = registry.render()
+    assert "# TYPE quant_stage_seconds histogram" in text
+    assert 'quant_stage_seconds_bucket{stage="csv_parse",le="+Inf"} 2' in text
+    assert 'quant_stage_seconds_bucket{stage="1",le="1"}' not in text
+    assert 'quant_stage_seconds_count{stage="csv_parse"} 2' in text
+    assert 'quant_rows_total{stage="csv_parse"} 1440' in text
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    registry = Metrics(enabled=False)
+    with registry.stage("download"):
+        pass
+    registry.timed("compute")(lambda: None)()
+    registry.count_bytes("download", 10)
+    assert "quant_stage_seconds_bucket" not in registry.render()
+    assert "quant_bytes_total{" not in registry.render()
+
+
+def test_server_timing_covers_executor_stages() -> None:
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines_data = {sym: make_klines(200, i) for i, sym in enumerate(symbols)}
+    trades_data = {sym: make_trades(300, 10 + i) for i, sym in enumerate(symbols)}
+    executor = StrategyExecutor(kind="thread", max_workers=1)
+
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(apis.router)
+
+    @app.get("/run")
+    async def run():
+        orders = await executor.submit(
+            tasks.run_iteration, {"symbols": symbols}, klines_data, trades_data
+        )
+        with metrics.stage("serialize"):
+            return len(orders)
+
+    client = TestClient(app)
+    try:
+        assert "Server-Timing" not in client.get("/run").headers
+        timing = client.get("/run", headers={"X-Server-Timing": "1"}).headers[
+            "Server-Timing"
+        ]
+    finally:
+        executor.shutdown()
+
+    stages = [entry.split(";")[0] for entry in timing.split(", ")]
+    assert "calculate_volatility_metrics" in stages
+    assert "optimize_orders" in stages
+    assert "serialize" in stages
+
+    text = client.get("/metrics").text
+    assert 'quant_stage_seconds_count{stage="calculate_position_sizes"}' in text
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from quant_api.configs import settings
+from quant_api.utils.binance_market import extract_zip_content
+from quant_api.utils.synthetic import archive_zip, synthetic_market
+
+
+def test_synthetic_market_is_deterministic_per_symbol() -> None:
+    klines, trades = synthetic_market(["BTCUSDT", "ETHUSDT"], 100, 500, seed=3)
+    alone, _ = synthetic_market(["ETHUSDT"], 100, 500, seed=3)
+    other, _ = synthetic_market(["ETHUSDT"], 100, 500, seed=4)
+
+    pd.testing.assert_frame_equal(klines["ETHUSDT"], alone["ETHUSDT"])
+    assert not klines["ETHUSDT"].equals(other["ETHUSDT"])
+    assert list(klines["BTCUSDT"].columns) == settings.KLINES_COLUMNS
+    assert list(trades["BTCUSDT"].columns) == settings.TRADES_COLUMNS + ["side"]
+
+    bars = klines["BTCUSDT"]
+    assert (bars["high"] >= bars[["openPrice", "last"]].max(axis=1)).all()
+    assert (bars["low"] <= bars[["openPrice", "last"]].min(axis=1)).all()
+    assert trades["BTCUSDT"]["time"].between(bars["open"].iloc[0], bars["close"].iloc[-1]).all()
+
+
+def test_archive_zip_round_trips_through_extract() -> None:
+    klines, _ = synthetic_market(["BTCUSDT"], 50, 10)
+    content = extract_zip_content(archive_zip(klines["BTCUSDT"], "BTCUSDT-1m.csv"))
+    frame = content["BTCUSDT-1m.csv"]
+    frame.columns = settings.KLINES_COLUMNS
+    assert len(frame) == 50
+    assert frame["last"].to_numpy() == pytest.approx(klines["BTCUSDT"]["last"].to_numpy())
+